@@ -0,0 +1,24 @@
+"""Ayudas para las pruebas de las apps que escriben por la API.
+
+Vive fuera de las apps para que no se instale con el código de producción.
+"""
+from unittest import mock
+
+from usuarios.models import Usuario
+
+
+def iniciar_sesion(cliente, rol='admin'):
+    """Autentica ``cliente`` (APIClient) como un usuario nuevo con ``rol``."""
+    usuario, _ = Usuario.objects.get_or_create(
+        uid_firebase=f'sesion-{rol}',
+        defaults={'nombre': rol.title(), 'email': f'{rol}@sesion.test', 'rol': rol},
+    )
+    cliente.force_authenticate(usuario)
+    return usuario
+
+
+def sesion_async(usuario):
+    """Parche para que las vistas async (``api_async``) vean a ``usuario`` autenticado."""
+    return mock.patch(
+        'ioticsemillero.asincrono.aautenticar', mock.AsyncMock(return_value=(usuario, {}))
+    )
@@ -0,0 +1,42 @@
+from django.contrib import admin
+
+from .models import (
+    TIPOS_PRODUCTIVIDAD,
+    EstadisticaProductividad,
+    Historia,
+    Mision,
+    Objetivo,
+    UltimaPublicacion,
+    Valor,
+    VersionRecurso,
+    Vision,
+)
+
+
+class ProductividadAdmin(admin.ModelAdmin):
+    list_display = ('id', 'titulo', 'anio', 'pais', 'usuario')
+    search_fields = ('titulo',)
+
+
+for modelo in TIPOS_PRODUCTIVIDAD.values():
+    admin.site.register(modelo, ProductividadAdmin)
+
+
+@admin.register(UltimaPublicacion)
+class UltimaPublicacionAdmin(admin.ModelAdmin):
+    list_display = ('tipo', 'publicacion_id', 'actualizado_en')
+
+
+for modelo in (Mision, Vision, Historia, Objetivo, Valor):
+    admin.site.register(modelo)
+
+
+@admin.register(VersionRecurso)
+class VersionRecursoAdmin(admin.ModelAdmin):
+    list_display = ('recurso', 'version', 'actualizado_en')
+
+
+@admin.register(EstadisticaProductividad)
+class EstadisticaProductividadAdmin(admin.ModelAdmin):
+    list_display = ('anio', 'tipo', 'pais', 'usuario_id', 'total')
+    list_filter = ('tipo', 'anio')
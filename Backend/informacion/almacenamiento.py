@@ -0,0 +1,317 @@
+"""Almacenamiento de imágenes y archivos subidos por el frontend.
+
+El frontend pide una URL firmada (``urlfirmada/images/`` o ``/files/``), sube
+el archivo directamente con un PUT y guarda ``file_path`` (la URL pública)
+en el registro. El backend solo firma: no hay llamadas de red al firmar.
+
+- AlmacenamientoS3: firma con AWS Signature V4 (query string) para cualquier
+  servicio compatible con S3, como Cloudflare R2. La llave de firma se deriva
+  una vez por día.
+- AlmacenamientoLocal: guarda en ``MEDIA_ROOT`` y firma con la SECRET_KEY una
+  URL de este mismo backend que acepta el PUT. Es para desarrollo y pruebas.
+
+Los dos permiten además leer y guardar objetos desde el backend
+(``leer``/``guardar``), que es lo que usan los derivados de imágenes, y
+listar por páginas y borrar por lotes (``listar``/``eliminar``), que usa
+el recolector de huérfanos.
+
+``INFORMACION_ALMACENAMIENTO`` (ruta a una clase) elige el backend; si no
+está definido se usa S3 cuando hay ``R2_BUCKET`` y el local si no.
+"""
+import base64
+import datetime
+import hashlib
+import hmac
+import urllib.request
+import uuid
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.module_loading import import_string
+
+# Segundos de validez de una URL de subida.
+EXPIRACION = 900
+# Segundos de espera al leer o escribir en el bucket desde el backend.
+TIMEOUT_RED = 30
+# Carpetas de la llave según el tipo de subida.
+CARPETAS = {'images': 'images', 'files': 'files'}
+# Objetos por página al listar y por petición al borrar (máximo de S3).
+TAMANO_PAGINA = 1000
+
+NS_S3 = '{http://s3.amazonaws.com/doc/2006-03-01/}'
+
+
+@dataclass(frozen=True)
+class Objeto:
+    """Objeto listado del almacenamiento."""
+
+    llave: str
+    tamano: int
+    modificado: datetime.datetime
+
+
+def nueva_llave(tipo, extension):
+    """Llave única del objeto, p. ej. ``images/2025/03/<uuid>.jpg``."""
+    hoy = timezone.now()
+    return f'{CARPETAS[tipo]}/{hoy:%Y/%m}/{uuid.uuid4().hex}.{extension.lower()}'
+
+
+class Almacenamiento:
+    """Interfaz común de los backends."""
+
+    def url_subida(self, llave, content_type, expira=EXPIRACION):
+        raise NotImplementedError
+
+    def url_publica(self, llave):
+        raise NotImplementedError
+
+    def leer(self, llave):
+        """Contenido del objeto (bytes)."""
+        raise NotImplementedError
+
+    def guardar(self, llave, trozos, content_type='application/octet-stream'):
+        """Crea o reemplaza el objeto con los trozos de bytes dados."""
+        raise NotImplementedError
+
+    def listar(self, prefijo='', tamano=TAMANO_PAGINA):
+        """Páginas (listas de Objeto) con las llaves que empiezan por ``prefijo``."""
+        raise NotImplementedError
+
+    def eliminar(self, llaves):
+        """Borra hasta ``TAMANO_PAGINA`` objetos; devuelve las llaves borradas."""
+        raise NotImplementedError
+
+    def llave_de(self, url):
+        """Llave del objeto a partir de su URL pública (None si no es de este almacenamiento)."""
+        base = self.url_publica('')
+        if url and url.startswith(base):
+            return url[len(base):] or None
+        return None
+
+
+def _firmar(llave, mensaje):
+    return hmac.new(llave, mensaje.encode(), hashlib.sha256).digest()
+
+
+@lru_cache(maxsize=8)
+def _llave_de_firma(secreto, fecha, region, servicio='s3'):
+    k_fecha = _firmar(f'AWS4{secreto}'.encode(), fecha)
+    return _firmar(_firmar(_firmar(k_fecha, region), servicio), 'aws4_request')
+
+
+class AlmacenamientoS3(Almacenamiento):
+    """Bucket compatible con S3 (R2) con URLs prefirmadas SigV4 de estilo ruta."""
+
+    def __init__(
+        self,
+        endpoint=None,
+        bucket=None,
+        access_key=None,
+        secret_key=None,
+        region=None,
+        url_publica=None,
+        reloj=None,
+    ):
+        self.endpoint = (endpoint or settings.R2_ENDPOINT).rstrip('/')
+        self.bucket = bucket or settings.R2_BUCKET
+        self.access_key = access_key or settings.R2_ACCESS_KEY_ID
+        self.secret_key = secret_key or settings.R2_SECRET_ACCESS_KEY
+        self.region = region or getattr(settings, 'R2_REGION', 'auto')
+        url_publica = url_publica or getattr(settings, 'R2_URL_PUBLICA', '')
+        self.base_publica = (url_publica or f'{self.endpoint}/{self.bucket}').rstrip('/') + '/'
+        self.host = urlsplit(self.endpoint).netloc
+        # Estilo ruta: el bucket va en la ruta y no en el host.
+        self.prefijo_ruta = f'/{self.bucket}'
+        self.reloj = reloj or (lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    def url_subida(self, llave, content_type, expira=EXPIRACION):
+        return self.firmar('PUT', llave, expira)
+
+    def url_publica(self, llave):
+        return self.base_publica + quote(llave)
+
+    def leer(self, llave):
+        with urllib.request.urlopen(self.firmar('GET', llave), timeout=TIMEOUT_RED) as respuesta:
+            return respuesta.read()
+
+    def guardar(self, llave, trozos, content_type='application/octet-stream'):
+        peticion = urllib.request.Request(
+            self.firmar('PUT', llave),
+            data=b''.join(trozos),
+            method='PUT',
+            headers={'Content-Type': content_type},
+        )
+        with urllib.request.urlopen(peticion, timeout=TIMEOUT_RED):
+            pass
+
+    def listar(self, prefijo='', tamano=TAMANO_PAGINA):
+        """ListObjectsV2 siguiendo el ``continuation-token`` página a página."""
+        token = None
+        while True:
+            parametros = {'list-type': '2', 'max-keys': str(tamano), 'prefix': prefijo}
+            if token:
+                parametros['continuation-token'] = token
+            with urllib.request.urlopen(
+                self.firmar('GET', '', parametros=parametros), timeout=TIMEOUT_RED
+            ) as respuesta:
+                raiz = ET.fromstring(respuesta.read())
+            yield [
+                Objeto(
+                    llave=contenido.findtext(f'{NS_S3}Key'),
+                    tamano=int(contenido.findtext(f'{NS_S3}Size', '0')),
+                    modificado=datetime.datetime.fromisoformat(
+                        contenido.findtext(f'{NS_S3}LastModified').replace('Z', '+00:00')
+                    ),
+                )
+                for contenido in raiz.iter(f'{NS_S3}Contents')
+            ]
+            token = raiz.findtext(f'{NS_S3}NextContinuationToken')
+            if raiz.findtext(f'{NS_S3}IsTruncated') != 'true' or not token:
+                return
+
+    def eliminar(self, llaves):
+        """DeleteObjects: un POST por lote de hasta 1000 llaves."""
+        llaves = list(llaves)
+        if not llaves:
+            return []
+        cuerpo = ET.Element('Delete')
+        ET.SubElement(cuerpo, 'Quiet').text = 'false'
+        for llave in llaves:
+            ET.SubElement(ET.SubElement(cuerpo, 'Object'), 'Key').text = llave
+        datos = ET.tostring(cuerpo, encoding='utf-8', xml_declaration=True)
+        peticion = urllib.request.Request(
+            self.firmar('POST', '', parametros={'delete': ''}),
+            data=datos,
+            method='POST',
+            headers={
+                'Content-Type': 'application/xml',
+                'Content-MD5': base64.b64encode(hashlib.md5(datos).digest()).decode(),
+            },
+        )
+        with urllib.request.urlopen(peticion, timeout=TIMEOUT_RED) as respuesta:
+            raiz = ET.fromstring(respuesta.read())
+        return [borrado.findtext(f'{NS_S3}Key') for borrado in raiz.iter(f'{NS_S3}Deleted')]
+
+    def firmar(self, metodo, llave, expira=EXPIRACION, parametros=None):
+        ahora = self.reloj()
+        fecha, marca = ahora.strftime('%Y%m%d'), ahora.strftime('%Y%m%dT%H%M%SZ')
+        alcance = f'{fecha}/{self.region}/s3/aws4_request'
+        ruta = f'{self.prefijo_ruta}/{quote(llave, safe="/-_.~")}'
+        parametros = {
+            'X-Amz-Algorithm': 'AWS4-HMAC-SHA256',
+            'X-Amz-Credential': f'{self.access_key}/{alcance}',
+            'X-Amz-Date': marca,
+            'X-Amz-Expires': str(expira),
+            'X-Amz-SignedHeaders': 'host',
+            **(parametros or {}),
+        }
+        consulta = '&'.join(
+            f'{quote(k, safe="-_.~")}={quote(v, safe="-_.~")}'
+            for k, v in sorted(parametros.items())
+        )
+        canonica = f'{metodo}\n{ruta}\n{consulta}\nhost:{self.host}\n\nhost\nUNSIGNED-PAYLOAD'
+        texto = '\n'.join(
+            ['AWS4-HMAC-SHA256', marca, alcance, hashlib.sha256(canonica.encode()).hexdigest()]
+        )
+        firma = hmac.new(
+            _llave_de_firma(self.secret_key, fecha, self.region), texto.encode(), hashlib.sha256
+        ).hexdigest()
+        return f'{self.endpoint}{ruta}?{consulta}&X-Amz-Signature={firma}'
+
+
+class AlmacenamientoLocal(Almacenamiento):
+    """Archivos en ``MEDIA_ROOT``; la subida es un PUT firmado a este backend."""
+
+    firmante = signing.Signer(salt='informacion.almacenamiento')
+
+    def __init__(self, raiz=None):
+        self.raiz = Path(raiz or settings.MEDIA_ROOT)
+
+    def url_subida(self, llave, content_type, expira=EXPIRACION):
+        vence = int(timezone.now().timestamp()) + expira
+        ruta = reverse('almacenamiento-local', args=[llave])
+        return f'{ruta}?expira={vence}&firma={self.firma(llave, vence)}'
+
+    def url_publica(self, llave):
+        return f'/{settings.MEDIA_URL.strip("/")}/{llave}'
+
+    def llave_de(self, url):
+        # La URL guardada es absoluta (la vista la completa con el host).
+        return super().llave_de(urlsplit(url or '').path)
+
+    def firma(self, llave, vence):
+        return self.firmante.signature(f'{llave}:{vence}')
+
+    def verificar(self, llave, vence, firma):
+        try:
+            vence = int(vence)
+        except (TypeError, ValueError):
+            return False
+        return vence >= timezone.now().timestamp() and constant_time_compare(
+            firma or '', self.firma(llave, vence)
+        )
+
+    def ruta(self, llave):
+        ruta = (self.raiz / llave).resolve()
+        if not ruta.is_relative_to(self.raiz.resolve()):
+            raise ValueError(f'Llave fuera del almacenamiento: {llave}')
+        return ruta
+
+    def leer(self, llave):
+        return self.ruta(llave).read_bytes()
+
+    def guardar(self, llave, trozos, content_type='application/octet-stream'):
+        ruta = self.ruta(llave)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, 'wb') as destino:
+            for trozo in trozos:
+                destino.write(trozo)
+
+    def listar(self, prefijo='', tamano=TAMANO_PAGINA):
+        pagina = []
+        for ruta in sorted(self.raiz.rglob('*')):
+            llave = ruta.relative_to(self.raiz).as_posix()
+            if not ruta.is_file() or not llave.startswith(prefijo):
+                continue
+            estado = ruta.stat()
+            pagina.append(
+                Objeto(
+                    llave=llave,
+                    tamano=estado.st_size,
+                    modificado=datetime.datetime.fromtimestamp(
+                        estado.st_mtime, tz=datetime.timezone.utc
+                    ),
+                )
+            )
+            if len(pagina) >= tamano:
+                yield pagina
+                pagina = []
+        if pagina:
+            yield pagina
+
+    def eliminar(self, llaves):
+        borradas = []
+        for llave in llaves:
+            ruta = self.ruta(llave)
+            if ruta.is_file():
+                ruta.unlink()
+                borradas.append(llave)
+        return borradas
+
+
+@lru_cache(maxsize=None)
+def obtener_almacenamiento():
+    ruta = getattr(settings, 'INFORMACION_ALMACENAMIENTO', None)
+    if ruta:
+        return import_string(ruta)()
+    if getattr(settings, 'R2_BUCKET', ''):
+        return AlmacenamientoS3()
+    return AlmacenamientoLocal()
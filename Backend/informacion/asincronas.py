@@ -0,0 +1,67 @@
+"""Vistas asíncronas de informacion para el modo ASGI (``IOTIC_ASGI=True``).
+
+Mismas respuestas que sus equivalentes de views.py: las lecturas agregadas
+de publicaciones (con validadores y cache de respuestas) y la firma de
+subidas.
+"""
+from django.http import Http404
+
+from ioticsemillero.asincrono import api_async, leer_json, respuesta_json
+from ioticsemillero.cache import cache_publica
+from usuarios.models import Usuario
+
+from .models import TIPOS_PRODUCTIVIDAD, Productividad, UltimaPublicacion
+from .serializers import CAMPOS_BASE, LoteSubidaSerializer, SolicitudSubidaSerializer
+from .versiones import get_condicional
+from .views import firmar_subida
+
+
+@cache_publica('publicaciones')
+@api_async('GET', 'HEAD')
+@get_condicional('publicaciones')
+async def ultimas_publicaciones(request):
+    ultimas = dict.fromkeys(TIPOS_PRODUCTIVIDAD)
+    async for fila in UltimaPublicacion.objects.only('tipo', 'datos'):
+        ultimas[fila.tipo] = fila.datos
+    return respuesta_json(ultimas)
+
+
+@cache_publica('publicaciones', 'usuarios')
+@api_async('GET', 'HEAD')
+@get_condicional('publicaciones')
+async def publicaciones_usuario(request, pk):
+    if not await Usuario.objects.filter(pk=pk).aexists():
+        raise Http404
+    respuesta = {'usuario_id': pk}
+    respuesta.update((modelo.CLAVE_PUBLICACIONES, []) for modelo in TIPOS_PRODUCTIVIDAD.values())
+    filas = Productividad.objects.de_usuario(pk).recientes().values('tipo', *CAMPOS_BASE)
+    async for fila in filas:
+        modelo = TIPOS_PRODUCTIVIDAD.get(fila.pop('tipo'))
+        if modelo is not None:
+            respuesta[modelo.CLAVE_PUBLICACIONES].append(fila)
+    return respuesta_json(respuesta)
+
+
+def url_firmada(tipo):
+    @api_async('POST', permiso='almacenamiento.subir')
+    async def vista(request):
+        serializer = SolicitudSubidaSerializer(data=leer_json(request), context={'tipo': tipo})
+        serializer.is_valid(raise_exception=True)
+        return respuesta_json(firmar_subida(request, tipo, **serializer.validated_data))
+
+    return vista
+
+
+def url_firmada_lote(tipo):
+    @api_async('POST', permiso='almacenamiento.subir')
+    async def vista(request):
+        serializer = LoteSubidaSerializer(data=leer_json(request), context={'tipo': tipo})
+        serializer.is_valid(raise_exception=True)
+        return respuesta_json(
+            [
+                firmar_subida(request, tipo, **archivo)
+                for archivo in serializer.validated_data['archivos']
+            ]
+        )
+
+    return vista
@@ -0,0 +1,149 @@
+"""Índice de búsqueda de texto sobre las publicaciones.
+
+Con SQLite se usa una tabla virtual FTS5 (creada en la migración 0003); con
+otros motores, un índice invertido en la tabla TerminoBusqueda. Se puede
+forzar uno u otro con ``INFORMACION_INDICE_BUSQUEDA`` (ruta a la clase).
+
+El índice se mantiene desde las señales de guardado/borrado y se reconstruye
+con ``manage.py rebuild_search``.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Sum
+from django.utils.module_loading import import_string
+
+from .models import TerminoBusqueda
+
+# Peso de cada columna al ordenar resultados.
+PESOS = {'titulo': 10, 'autores': 5, 'pais': 2, 'cuerpo': 1}
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes, para que 'tecnica' encuentre 'Técnica'."""
+    descompuesto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def terminos(texto):
+    return [t for t in re.findall(r'\w+', normalizar(texto)) if len(t) > 1]
+
+
+def documento(productividad):
+    """Texto indexable de una publicación, separado por columna."""
+    cuerpo = ' '.join(
+        str(getattr(productividad, campo, '') or '') for campo in productividad.CAMPOS_TEXTO
+    )
+    return {
+        'titulo': productividad.titulo,
+        'autores': ' '.join(productividad.autores or []),
+        'pais': productividad.pais,
+        'cuerpo': cuerpo,
+    }
+
+
+class IndiceFTS5:
+    tabla = 'informacion_busqueda'
+
+    def indexar(self, productividades):
+        filas = []
+        for productividad in productividades:
+            doc = documento(productividad)
+            filas.append((
+                productividad.pk,
+                productividad.tipo,
+                doc['titulo'],
+                doc['autores'],
+                doc['pais'],
+                doc['cuerpo'],
+            ))
+        if not filas:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.tabla} WHERE rowid = %s', [(f[0],) for f in filas]
+            )
+            cursor.executemany(
+                f'INSERT INTO {self.tabla} (rowid, tipo, titulo, autores, pais, cuerpo) '
+                'VALUES (%s, %s, %s, %s, %s, %s)',
+                filas,
+            )
+
+    def eliminar(self, ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.tabla} WHERE rowid = %s', [(i,) for i in ids])
+
+    def vaciar(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.tabla}')
+
+    def buscar(self, texto, tipo=None, limite=20):
+        consulta = ' '.join(f'"{t}"*' for t in terminos(texto))
+        if not consulta:
+            return []
+        pesos = ', '.join(str(PESOS[c]) for c in ('titulo', 'autores', 'pais', 'cuerpo'))
+        sql = f'SELECT rowid FROM {self.tabla} WHERE {self.tabla} MATCH %s'
+        parametros = [consulta]
+        if tipo:
+            sql += ' AND tipo = %s'
+            parametros.append(tipo)
+        sql += f' ORDER BY bm25({self.tabla}, 0, {pesos}) LIMIT %s'
+        parametros.append(limite)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros)
+            return [fila[0] for fila in cursor.fetchall()]
+
+
+class IndiceInvertido:
+    """Índice invertido portable: una fila por (término, publicación)."""
+
+    def indexar(self, productividades):
+        productividades = list(productividades)
+        if not productividades:
+            return
+        nuevos = []
+        for productividad in productividades:
+            pesos = {}
+            for columna, texto in documento(productividad).items():
+                for termino in terminos(texto):
+                    pesos[termino[:64]] = pesos.get(termino[:64], 0) + PESOS[columna]
+            nuevos.extend(
+                TerminoBusqueda(termino=t, productividad_id=productividad.pk, peso=p)
+                for t, p in pesos.items()
+            )
+        self.eliminar([p.pk for p in productividades])
+        TerminoBusqueda.objects.bulk_create(nuevos, batch_size=500)
+
+    def eliminar(self, ids):
+        TerminoBusqueda.objects.filter(productividad_id__in=ids).delete()
+
+    def vaciar(self):
+        TerminoBusqueda.objects.all().delete()
+
+    def buscar(self, texto, tipo=None, limite=20):
+        buscados = set(terminos(texto))
+        if not buscados:
+            return []
+        coincidencias = TerminoBusqueda.objects.filter(termino__in=buscados)
+        if tipo:
+            coincidencias = coincidencias.filter(productividad__tipo=tipo)
+        coincidencias = (
+            coincidencias.values('productividad_id')
+            .annotate(encontrados=Count('termino', distinct=True), puntaje=Sum('peso'))
+            .filter(encontrados=len(buscados))
+            .order_by('-puntaje', '-productividad_id')[:limite]
+        )
+        return [c['productividad_id'] for c in coincidencias]
+
+
+@lru_cache(maxsize=None)
+def obtener_indice():
+    ruta = getattr(settings, 'INFORMACION_INDICE_BUSQUEDA', None)
+    if ruta:
+        return import_string(ruta)()
+    if connection.vendor == 'sqlite':
+        return IndiceFTS5()
+    return IndiceInvertido()
@@ -0,0 +1,162 @@
+"""Miniaturas y versiones medianas en WebP de las imágenes subidas.
+
+Cuando se guarda un registro con ``image_r2`` nuevo (publicaciones e items
+del inventario), la generación de sus derivados se encola en la cola de
+trabajos (``generar``) y corre fuera de la petición: se lee el original del
+almacenamiento, se reduce con Pillow a cada tamaño de ``TAMANOS`` y se sube
+en WebP junto al original (``derivados/<llave>-thumb.webp``). Al terminar se
+guardan las URLs en ``image_thumb``/``image_medium`` con ``save()``, así las
+señales refrescan índices y caches como con cualquier otra edición.
+
+La URL de cada derivado se deduce de la del original, de modo que un registro
+ya está al día cuando sus campos coinciden con lo esperado; eso evita volver
+a generar en cada guardado. Con ``INFORMACION_DERIVADOS_EN_SEGUNDO_PLANO =
+False`` se generan en línea (pruebas).
+
+Cada app registra su receptor (``informacion.signals`` para publicaciones,
+``inventario.signals`` para items): un proceso con ``IOTIC_APPS=inventario``
+también genera los de sus items. Por eso este módulo no importa modelos de
+``informacion``.
+"""
+import io
+import logging
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+
+from trabajos.cola import tarea
+
+from .almacenamiento import obtener_almacenamiento
+
+logger = logging.getLogger(__name__)
+
+# Lado mayor en píxeles de cada derivado y campo del modelo donde queda su URL.
+TAMANOS = {'thumb': 320, 'medium': 1024}
+CAMPOS = {'thumb': 'image_thumb', 'medium': 'image_medium'}
+CALIDAD_WEBP = 80
+# Modelos con ``image_r2`` y campos de derivados, si su app está instalada.
+MODELOS = ('informacion.Productividad', 'inventario.Item')
+
+
+@lru_cache(maxsize=None)
+def modelos():
+    instalados = []
+    for etiqueta in MODELOS:
+        try:
+            instalados.append(apps.get_model(etiqueta))
+        except LookupError:
+            continue
+    return tuple(instalados)
+
+
+def modelos_concretos():
+    """Modelos cuyas filas se procesan: las hojas de la herencia de ``MODELOS``."""
+    candidatos = [m for m in apps.get_models() if issubclass(m, modelos())]
+    return [m for m in candidatos if not any(o is not m and issubclass(o, m) for o in candidatos)]
+
+
+def llave_derivado(llave, tamano):
+    return f'derivados/{llave.rsplit(".", 1)[0]}-{tamano}.webp'
+
+
+def urls_derivadas(url):
+    """``{campo: url}`` de los derivados de la imagen ``url``; None si no es del almacenamiento."""
+    llave = obtener_almacenamiento().llave_de(url)
+    if not llave or not url.endswith(llave):
+        return None
+    base = url[: -len(llave)]
+    return {CAMPOS[t]: base + llave_derivado(llave, t) for t in TAMANOS}
+
+
+def al_dia(instancia):
+    """True si los campos de derivados corresponden a la imagen actual."""
+    esperadas = urls_derivadas(instancia.image_r2) if instancia.image_r2 else None
+    if esperadas is None:
+        # Sin imagen (o una URL externa) no hay derivados.
+        return not any(getattr(instancia, campo) for campo in CAMPOS.values())
+    return all(getattr(instancia, campo) == url for campo, url in esperadas.items())
+
+
+def reducir(datos):
+    """``{tamano: bytes WebP}`` de la imagen ``datos``."""
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(datos)) as original:
+        imagen = ImageOps.exif_transpose(original)
+        if imagen.mode not in ('RGB', 'RGBA'):
+            imagen = imagen.convert('RGBA' if 'A' in imagen.getbands() else 'RGB')
+        resultado = {}
+        for tamano, lado in TAMANOS.items():
+            copia = imagen.copy()
+            copia.thumbnail((lado, lado), Image.Resampling.LANCZOS)
+            salida = io.BytesIO()
+            copia.save(salida, 'WEBP', quality=CALIDAD_WEBP, method=4)
+            resultado[tamano] = salida.getvalue()
+    return resultado
+
+
+def procesar(etiqueta, pk, forzar=False):
+    """Genera los derivados de un registro. Devuelve True si subió algo."""
+    modelo = apps.get_model(etiqueta)
+    instancia = modelo.objects.filter(pk=pk).first()
+    if instancia is None or not instancia.image_r2 or (al_dia(instancia) and not forzar):
+        return False
+    imagen = instancia.image_r2
+    esperadas = urls_derivadas(imagen)
+    if esperadas is None:
+        return False
+    almacenamiento = obtener_almacenamiento()
+    llave = almacenamiento.llave_de(imagen)
+    for tamano, datos in reducir(almacenamiento.leer(llave)).items():
+        almacenamiento.guardar(llave_derivado(llave, tamano), [datos], 'image/webp')
+
+    with transaction.atomic():
+        instancia = modelo.objects.select_for_update().filter(pk=pk).first()
+        # La imagen pudo cambiar mientras se generaban los derivados.
+        if instancia is None or instancia.image_r2 != imagen:
+            return False
+        for campo, url in esperadas.items():
+            setattr(instancia, campo, url)
+        instancia.save(update_fields=list(esperadas))
+    return True
+
+
+def limpiar(instancia):
+    """Vacía los campos de derivados de un registro sin imagen propia."""
+    type(instancia).objects.filter(pk=instancia.pk).update(**dict.fromkeys(CAMPOS.values(), ''))
+    for campo in CAMPOS.values():
+        setattr(instancia, campo, '')
+
+
+# Nombre anterior de la tarea, para los trabajos que ya estén en cola.
+@tarea(max_intentos=5, nombre='informacion.tareas.generar_derivados')
+def generar(etiqueta, pk):
+    # Los errores de lectura o subida se propagan para que la cola reintente.
+    return procesar(etiqueta, pk)
+
+
+def procesar_sin_fallar(etiqueta, pk, forzar=False):
+    try:
+        return procesar(etiqueta, pk, forzar)
+    except Exception:
+        logger.exception('No se pudieron generar los derivados de %s %s', etiqueta, pk)
+        return False
+
+
+def programar(instancia):
+    """Encola (o ejecuta en línea) la generación de derivados de ``instancia``."""
+    if al_dia(instancia):
+        return
+    if not instancia.image_r2 or urls_derivadas(instancia.image_r2) is None:
+        limpiar(instancia)
+        return
+    etiqueta = instancia._meta.label
+    if getattr(settings, 'INFORMACION_DERIVADOS_EN_SEGUNDO_PLANO', True):
+        # Se guarda en la misma transacción que el registro; repetidos se funden.
+        generar.encolar(
+            etiqueta, instancia.pk, llave=f'derivados:{etiqueta}:{instancia.pk}'
+        )
+    else:
+        procesar_sin_fallar(etiqueta, instancia.pk)
@@ -0,0 +1,134 @@
+"""Conteos de publicaciones por año, tipo, país y usuario para los reportes.
+
+EstadisticaProductividad guarda un total por combinación de esas cuatro
+dimensiones. Las señales lo ajustan en cada alta, edición y borrado (una
+edición que cambia el año, el país o el autor resta en la combinación vieja
+y suma en la nueva) y ``reconstruir()`` lo rehace desde Productividad con un
+solo GROUP BY (``manage.py rebuild_stats``; lo que no pasa por ``save()``,
+como ``bulk_create``, solo queda contado así).
+
+``agrupar()`` responde cualquier combinación de dimensiones sumando filas de
+esta tabla, sin leer las publicaciones.
+"""
+from django.apps import apps as apps_globales
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from ioticsemillero.cache import invalidar
+
+from .models import TIPOS_PRODUCTIVIDAD, EstadisticaProductividad, Productividad
+from .versiones import incrementar
+
+# Parámetro de la API -> columna de EstadisticaProductividad.
+DIMENSIONES = {'anio': 'anio', 'tipo': 'tipo', 'pais': 'pais', 'usuario': 'usuario_id'}
+COLUMNAS = tuple(DIMENSIONES.values())
+# Campos de Productividad que cambian la combinación de una publicación.
+CAMPOS_ORIGEN = {'anio', 'tipo', 'pais', 'usuario', 'usuario_id'}
+
+
+def llave(anio, tipo, pais, usuario_id):
+    return (anio or '', tipo, (pais or '').strip(), usuario_id or 0)
+
+
+def llave_de(instancia):
+    return llave(instancia.anio, instancia.tipo, instancia.pais, instancia.usuario_id)
+
+
+def sumar(combinacion, cantidad):
+    """Suma ``cantidad`` (negativa para restar) al total de una combinación."""
+    filas = EstadisticaProductividad.objects.filter(**dict(zip(COLUMNAS, combinacion)))
+    if filas.update(total=F('total') + cantidad) or cantidad < 0:
+        return
+    EstadisticaProductividad.objects.bulk_create(
+        [EstadisticaProductividad(**dict(zip(COLUMNAS, combinacion)))], ignore_conflicts=True
+    )
+    filas.update(total=F('total') + cantidad)
+
+
+def recordar(instancia, update_fields=None):
+    """Antes de guardar una edición: anota la combinación que tenía en la BD."""
+    if instancia._state.adding or instancia.pk is None:
+        return
+    if update_fields is not None and not CAMPOS_ORIGEN & set(update_fields):
+        return
+    fila = (
+        Productividad.objects.filter(pk=instancia.pk)
+        .values_list('anio', 'tipo', 'pais', 'usuario_id')
+        .first()
+    )
+    if fila is not None:
+        instancia._estadistica_anterior = llave(*fila)
+
+
+def registrar(instancia, creado):
+    nueva = llave_de(instancia)
+    if creado:
+        sumar(nueva, 1)
+        return
+    anterior = instancia.__dict__.pop('_estadistica_anterior', None)
+    if anterior is not None and anterior != nueva:
+        sumar(anterior, -1)
+        sumar(nueva, 1)
+
+
+def descontar(instancia):
+    sumar(llave_de(instancia), -1)
+
+
+def reasignar_usuario(usuario_id):
+    """Pasa los totales de un usuario borrado a "sin usuario" (como hace SET_NULL)."""
+    filas = EstadisticaProductividad.objects.filter(usuario_id=usuario_id)
+    with transaction.atomic():
+        for anio, tipo, pais, total in filas.values_list('anio', 'tipo', 'pais', 'total'):
+            sumar((anio, tipo, pais, 0), total)
+        filas.delete()
+        # SET_NULL cambió el autor sin pasar por save(): sin una versión nueva
+        # las listas, el perfil y los reportes seguirían respondiendo 304.
+        recursos = ('publicaciones', *TIPOS_PRODUCTIVIDAD)
+        incrementar(*recursos)
+        invalidar(*recursos)
+
+
+def reconstruir(registro=apps_globales):
+    """Rehace la tabla desde las publicaciones. Devuelve el número de combinaciones."""
+    Estadistica = registro.get_model('informacion', 'EstadisticaProductividad')
+    Publicacion = registro.get_model('informacion', 'Productividad')
+    totales = {}
+    conteo = (
+        Publicacion.objects.order_by()
+        .values_list('anio', 'tipo', 'pais', 'usuario_id')
+        .annotate(total=Count('id'))
+    )
+    for *combinacion, total in conteo:
+        # Países que solo difieren en espacios caen en la misma fila.
+        clave = llave(*combinacion)
+        totales[clave] = totales.get(clave, 0) + total
+    with transaction.atomic():
+        Estadistica.objects.all().delete()
+        Estadistica.objects.bulk_create(
+            [Estadistica(**dict(zip(COLUMNAS, c)), total=t) for c, t in totales.items()],
+            batch_size=500,
+        )
+    return len(totales)
+
+
+def agrupar(filas, dimensiones):
+    """``[{dimension: valor, ..., 'total': n}]`` de ``filas`` agrupadas por ``dimensiones``."""
+    if not dimensiones:
+        return [{'total': filas.aggregate(suma=Sum('total'))['suma'] or 0}]
+    columnas = [DIMENSIONES[d] for d in dimensiones]
+    grupos = (
+        filas.order_by()
+        .values(*columnas)
+        .annotate(suma=Sum('total'))
+        .filter(suma__gt=0)
+        .order_by(*columnas)
+    )
+    resultado = []
+    for grupo in grupos:
+        fila = {d: grupo[DIMENSIONES[d]] for d in dimensiones}
+        if 'usuario' in fila:
+            fila['usuario'] = fila['usuario'] or None
+        fila['total'] = grupo['suma']
+        resultado.append(fila)
+    return resultado
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from informacion.derivados import CAMPOS, al_dia, modelos_concretos, procesar_sin_fallar
+
+
+def _en_hilo(etiqueta, pk, forzar):
+    # Cada hilo del pool abre su propia conexión; se cierra al terminar.
+    close_old_connections()
+    try:
+        return procesar_sin_fallar(etiqueta, pk, forzar)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera las miniaturas y versiones medianas WebP de las imágenes ya subidas '
+        '(publicaciones e items) que aún no las tienen.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=4, help='Imágenes procesadas a la vez.')
+        parser.add_argument(
+            '--todos',
+            action='store_true',
+            help='Vuelve a generar también las que ya tienen derivados.',
+        )
+
+    def handle(self, *args, **options):
+        forzar = options['todos']
+        pendientes = []
+        for modelo in modelos_concretos():
+            filas = modelo.objects.exclude(image_r2='').only('pk', 'image_r2', *CAMPOS.values())
+            for instancia in filas.iterator(chunk_size=2000):
+                if forzar or not al_dia(instancia):
+                    pendientes.append((modelo._meta.label, instancia.pk))
+
+        if options['hilos'] > 1:
+            with ThreadPoolExecutor(max_workers=options['hilos']) as ejecutor:
+                resultados = list(
+                    ejecutor.map(lambda p: _en_hilo(*p, forzar=forzar), pendientes)
+                )
+        else:
+            resultados = [procesar_sin_fallar(*p, forzar=forzar) for p in pendientes]
+
+        generados = sum(resultados)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{generados} de {len(pendientes)} imágenes con derivados nuevos; '
+                f'{len(pendientes) - generados} sin cambios o con error.'
+            )
+        )
@@ -0,0 +1,55 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from informacion.almacenamiento import obtener_almacenamiento
+from informacion.recoleccion import recolectar
+from informacion.referencias import faltantes, reconstruir
+
+
+class Command(BaseCommand):
+    help = (
+        'Borra del almacenamiento las imágenes y archivos que ningún registro usa '
+        '(adjuntos eliminados y subidas firmadas que nunca se guardaron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--gracia',
+            type=float,
+            default=24,
+            help='Horas que se conserva un objeto sin referencia antes de borrarlo.',
+        )
+        parser.add_argument('--lote', type=int, default=1000, help='Objetos por borrado.')
+        parser.add_argument(
+            '--simular', action='store_true', help='Solo reporta; no borra nada.'
+        )
+        parser.add_argument(
+            '--sin-reconstruir',
+            action='store_true',
+            help='No rehace antes la tabla de referencias desde los registros.',
+        )
+
+    def handle(self, *args, **options):
+        faltan = faltantes()
+        if faltan:
+            raise CommandError(
+                f'Faltan {", ".join(faltan)} en INSTALLED_APPS (IOTIC_APPS): '
+                'sus archivos se tomarían por huérfanos. Corra gc_storage con todas las apps.'
+            )
+        if not options['sin_reconstruir']:
+            total = reconstruir()
+            self.stdout.write(f'{total} referencias registradas.')
+        resultado = recolectar(
+            obtener_almacenamiento(),
+            gracia=datetime.timedelta(hours=options['gracia']),
+            lote=options['lote'],
+            simular=options['simular'],
+        )
+        accion = 'se borrarían' if options['simular'] else f'{resultado.eliminados} borrados'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{resultado.revisados} objetos revisados; {resultado.huerfanos} huérfanos '
+                f'({resultado.bytes_huerfanos} bytes), {accion}.'
+            )
+        )
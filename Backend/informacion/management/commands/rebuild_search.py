@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from informacion.busqueda import obtener_indice
+from informacion.models import TIPOS_PRODUCTIVIDAD
+from informacion.versiones import incrementar
+from ioticsemillero.cache import invalidar
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye desde cero el índice de búsqueda de publicaciones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=500, help='Publicaciones por lote.')
+
+    def handle(self, *args, **options):
+        indice = obtener_indice()
+        lote_maximo = options['lote']
+        total = 0
+        with transaction.atomic():
+            indice.vaciar()
+            for modelo in TIPOS_PRODUCTIVIDAD.values():
+                lote = []
+                for productividad in modelo.objects.order_by().iterator(chunk_size=lote_maximo):
+                    lote.append(productividad)
+                    if len(lote) >= lote_maximo:
+                        indice.indexar(lote)
+                        total += len(lote)
+                        lote = []
+                indice.indexar(lote)
+                total += len(lote)
+            # Las búsquedas cacheadas pueden venir del índice anterior.
+            incrementar('publicaciones')
+            invalidar('publicaciones')
+        self.stdout.write(
+            self.style.SUCCESS(f'{total} publicaciones indexadas con {type(indice).__name__}.')
+        )
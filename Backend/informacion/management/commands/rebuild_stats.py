@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from informacion.estadisticas import reconstruir
+from informacion.versiones import incrementar
+from ioticsemillero.cache import invalidar
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula desde las publicaciones la tabla de estadísticas por año, tipo, '
+        'país y usuario.'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            combinaciones = reconstruir()
+            # Los reportes cacheados pueden venir de los totales anteriores.
+            incrementar('publicaciones')
+            invalidar('publicaciones')
+        self.stdout.write(self.style.SUCCESS(f'{combinaciones} combinaciones recalculadas.'))
@@ -0,0 +1,231 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Productividad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(editable=False, max_length=30)),
+                ('titulo', models.CharField(max_length=255)),
+                ('tipoProductividad', models.CharField(blank=True, max_length=100)),
+                ('pais', models.CharField(blank=True, max_length=100)),
+                ('anio', models.CharField(blank=True, max_length=4)),
+                ('autores', models.JSONField(blank=True, default=list)),
+                ('image_r2', models.CharField(blank=True, max_length=500)),
+                ('file_r2', models.CharField(blank=True, max_length=500)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='productividades', to='usuarios.usuario')),
+            ],
+            options={
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UltimaPublicacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=30, unique=True)),
+                ('publicacion_id', models.BigIntegerField()),
+                ('datos', models.JSONField(default=dict)),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['tipo'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CapituloLibro',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('isbn', models.CharField(blank=True, max_length=20)),
+                ('volumen', models.CharField(blank=True, max_length=50)),
+                ('paginaInicio', models.PositiveIntegerField(blank=True, null=True)),
+                ('paginasFin', models.PositiveIntegerField(blank=True, null=True)),
+                ('editorial', models.CharField(blank=True, max_length=150)),
+                ('codigoEditorial', models.CharField(blank=True, max_length=50)),
+                ('propiedadIntelectual', models.CharField(blank=True, max_length=150)),
+                ('numeroCapitulo', models.PositiveIntegerField(blank=True, null=True)),
+                ('nombreCapitulo', models.CharField(blank=True, max_length=255)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='Curso',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('etiquetas', models.JSONField(blank=True, default=list)),
+                ('propiedadIntelectual', models.CharField(blank=True, max_length=150)),
+                ('duracion', models.PositiveIntegerField(blank=True, null=True)),
+                ('institucion', models.CharField(blank=True, max_length=150)),
+                ('fechaPublicacion', models.DateField(blank=True, null=True)),
+                ('link', models.URLField(blank=True, max_length=500, null=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='Evento',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('etiquetas', models.JSONField(blank=True, default=list)),
+                ('propiedadIntelectual', models.CharField(blank=True, max_length=150)),
+                ('alcance', models.CharField(blank=True, max_length=100)),
+                ('institucion', models.CharField(blank=True, max_length=150)),
+                ('fechaPublicacion', models.DateField(blank=True, null=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='Jurado',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('orientados', models.JSONField(blank=True, default=list)),
+                ('programa', models.CharField(blank=True, max_length=150)),
+                ('institucion', models.CharField(blank=True, max_length=150)),
+                ('etiquetas', models.JSONField(blank=True, default=list)),
+                ('licencia', models.CharField(blank=True, max_length=100)),
+                ('fechaPublicacion', models.DateField(blank=True, null=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='Libro',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('isbn', models.CharField(blank=True, max_length=20)),
+                ('volumen', models.CharField(blank=True, max_length=50)),
+                ('paginas', models.PositiveIntegerField(blank=True, null=True)),
+                ('editorial', models.CharField(blank=True, max_length=150)),
+                ('codigoEditorial', models.CharField(blank=True, max_length=50)),
+                ('etiquetas', models.JSONField(blank=True, default=list)),
+                ('propiedadIntelectual', models.CharField(blank=True, max_length=150)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='MaterialDidactico',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('descripcion', models.TextField(blank=True)),
+                ('etiquetasGTI', models.JSONField(blank=True, default=list)),
+                ('licencia', models.CharField(blank=True, max_length=100)),
+                ('fechaPublicacion', models.DateField(blank=True, null=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='Noticia',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('contenido', models.TextField(blank=True)),
+                ('fecha_publicacion', models.DateTimeField(auto_now_add=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='ParticipacionComitesEv',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('institucion', models.CharField(blank=True, max_length=150)),
+                ('etiquetasGTI', models.JSONField(blank=True, default=list)),
+                ('licencia', models.CharField(blank=True, max_length=100)),
+                ('fechaPublicacion', models.DateField(blank=True, null=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='ProcesoTecnica',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('etiquetasGTI', models.JSONField(blank=True, default=list)),
+                ('licencia', models.CharField(blank=True, max_length=100)),
+                ('fechaPublicacion', models.DateField(blank=True, null=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='Revista',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('issn', models.CharField(blank=True, max_length=20)),
+                ('volumen', models.PositiveIntegerField(blank=True, null=True)),
+                ('fasc', models.PositiveIntegerField(blank=True, null=True)),
+                ('linkDescargaArticulo', models.URLField(blank=True, max_length=500, null=True)),
+                ('linksitioWeb', models.URLField(blank=True, max_length=500, null=True)),
+                ('paginas', models.PositiveIntegerField(blank=True, null=True)),
+                ('responsable', models.JSONField(blank=True, default=list)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='Software',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('tituloDesarrollo', models.CharField(blank=True, max_length=255)),
+                ('etiquetas', models.JSONField(blank=True, default=list)),
+                ('nivelAcceso', models.CharField(blank=True, max_length=100)),
+                ('tipoProducto', models.CharField(blank=True, max_length=100)),
+                ('responsable', models.JSONField(blank=True, default=list)),
+                ('codigoRegistro', models.CharField(blank=True, max_length=100, null=True)),
+                ('descripcionFuncional', models.TextField(blank=True)),
+                ('propiedadIntelectual', models.CharField(blank=True, max_length=150)),
+                ('fechaPublicacion', models.DateField(blank=True, null=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='TrabajoEventos',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('volumen', models.PositiveIntegerField(blank=True, null=True)),
+                ('nombreSeminario', models.CharField(blank=True, max_length=255)),
+                ('tipoPresentacion', models.CharField(blank=True, max_length=100)),
+                ('tituloActas', models.CharField(blank=True, max_length=255)),
+                ('isbn', models.CharField(blank=True, max_length=20)),
+                ('paginas', models.PositiveIntegerField(blank=True, null=True)),
+                ('etiquetas', models.JSONField(blank=True, default=list)),
+                ('propiedadIntelectual', models.CharField(blank=True, max_length=150)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='TutoriaConcluida',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('orientados', models.JSONField(blank=True, default=list)),
+                ('programa', models.CharField(blank=True, max_length=150)),
+                ('institucion', models.CharField(blank=True, max_length=150)),
+                ('etiquetasGTI', models.JSONField(blank=True, default=list)),
+                ('licencia', models.CharField(blank=True, max_length=100)),
+                ('fechaPublicacion', models.DateField(blank=True, null=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+        migrations.CreateModel(
+            name='TutoriaEnMarcha',
+            fields=[
+                ('productividad_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='informacion.productividad')),
+                ('subtipoTitulo', models.CharField(blank=True, max_length=150)),
+                ('descripcion', models.TextField(blank=True)),
+                ('orientados', models.JSONField(blank=True, default=list)),
+                ('programa', models.CharField(blank=True, max_length=150)),
+                ('institucion', models.CharField(blank=True, max_length=150)),
+                ('etiquetasGTI', models.JSONField(blank=True, default=list)),
+                ('licencia', models.CharField(blank=True, max_length=100)),
+                ('fechaPublicacion', models.DateField(blank=True, null=True)),
+            ],
+            bases=('informacion.productividad',),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('informacion', '0001_initial'),
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='productividad',
+            name='usuario',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='productividades', to='usuarios.usuario'),
+        ),
+        migrations.AddIndex(
+            model_name='productividad',
+            index=models.Index(fields=['tipo', '-id'], name='productividad_tipo_id'),
+        ),
+        migrations.AddIndex(
+            model_name='productividad',
+            index=models.Index(fields=['usuario', 'tipo'], name='productividad_usuario_tipo'),
+        ),
+        migrations.AddIndex(
+            model_name='productividad',
+            index=models.Index(fields=['anio'], name='productividad_anio'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def crear_tabla_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS informacion_busqueda USING fts5('
+        'tipo UNINDEXED, titulo, autores, pais, cuerpo, '
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+
+def borrar_tabla_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS informacion_busqueda')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('informacion', '0002_indices_productividad'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TerminoBusqueda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('termino', models.CharField(max_length=64)),
+                ('peso', models.PositiveSmallIntegerField(default=1)),
+                ('productividad', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='informacion.productividad')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('termino', 'productividad'), name='termino_productividad_unico')],
+            },
+        ),
+        migrations.RunPython(crear_tabla_fts, borrar_tabla_fts),
+    ]
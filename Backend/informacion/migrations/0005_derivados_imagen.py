@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('informacion', '0004_quienes_somos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productividad',
+            name='image_medium',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='productividad',
+            name='image_thumb',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('informacion', '0005_derivados_imagen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferenciaAlmacenamiento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('llave', models.CharField(max_length=500)),
+                ('modelo', models.CharField(max_length=100)),
+                ('objeto_id', models.PositiveBigIntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['llave'], name='referencia_llave')],
+                'constraints': [models.UniqueConstraint(fields=('modelo', 'objeto_id', 'llave'), name='referencia_unica')],
+            },
+        ),
+    ]
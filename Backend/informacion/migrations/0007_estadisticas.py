@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:12
+
+from django.db import migrations, models
+
+
+def poblar(apps, schema_editor):
+    from informacion.estadisticas import reconstruir
+
+    reconstruir(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('informacion', '0006_referencias_almacenamiento'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticaProductividad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('anio', models.CharField(blank=True, max_length=4)),
+                ('tipo', models.CharField(max_length=30)),
+                ('pais', models.CharField(blank=True, max_length=100)),
+                ('usuario_id', models.PositiveBigIntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['anio', 'tipo', 'pais', 'usuario_id'],
+                'indexes': [models.Index(fields=['usuario_id'], name='estadistica_usuario')],
+                'constraints': [models.UniqueConstraint(fields=('anio', 'tipo', 'pais', 'usuario_id'), name='estadistica_unica')],
+            },
+        ),
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
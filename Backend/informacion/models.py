@@ -0,0 +1,466 @@
+from django.db import models
+
+
+class ProductividadQuerySet(models.QuerySet):
+    """Consultas que cruzan tipos sobre la tabla común."""
+
+    def del_tipo(self, tipo):
+        return self.filter(tipo=tipo)
+
+    def de_usuario(self, usuario_id):
+        return self.filter(usuario_id=usuario_id)
+
+    def recientes(self):
+        return self.order_by('-id')
+
+    def conteo_por_anio(self):
+        return (
+            self.order_by()
+            .values('anio')
+            .annotate(total=models.Count('id'))
+            .order_by('anio')
+        )
+
+    def con_detalle(self):
+        """Lista de instancias del tipo concreto, en el orden del queryset.
+
+        Hace una consulta sobre la tabla común y una por cada tipo presente
+        (no una por fila).
+        """
+        filas = list(self.only('id', 'tipo'))
+        ids_por_tipo = {}
+        for fila in filas:
+            ids_por_tipo.setdefault(fila.tipo, []).append(fila.id)
+        detalles = {}
+        for tipo, ids in ids_por_tipo.items():
+            modelo = TIPOS_PRODUCTIVIDAD.get(tipo)
+            if modelo is not None:
+                detalles.update(modelo.objects.in_bulk(ids))
+        return [detalles[fila.id] for fila in filas if fila.id in detalles]
+
+
+class Productividad(models.Model):
+    """Campos comunes a todos los tipos de productividad (BaseProductivityDTO).
+
+    Cada tipo concreto hereda de esta tabla (herencia multitabla), de modo que
+    las consultas que cruzan tipos se resuelven sobre una sola tabla.
+    """
+
+    # Clave del tipo, etiqueta legible y clave en la respuesta de publicaciones.
+    TIPO = None
+    ETIQUETA = None
+    CLAVE_PUBLICACIONES = None
+    # Campos de texto largo que entran al índice de búsqueda.
+    CAMPOS_TEXTO = ()
+
+    # Discriminador del tipo concreto. tipoProductividad es la etiqueta libre
+    # que envían los formularios, por eso no sirve para indexar.
+    tipo = models.CharField(max_length=30, editable=False)
+    titulo = models.CharField(max_length=255)
+    tipoProductividad = models.CharField(max_length=100, blank=True)
+    pais = models.CharField(max_length=100, blank=True)
+    anio = models.CharField(max_length=4, blank=True)
+    autores = models.JSONField(default=list, blank=True)
+    image_r2 = models.CharField(max_length=500, blank=True)
+    # Derivados WebP de image_r2 (ver derivados.py); vacíos mientras se generan.
+    image_thumb = models.CharField(max_length=500, blank=True, editable=False)
+    image_medium = models.CharField(max_length=500, blank=True, editable=False)
+    file_r2 = models.CharField(max_length=500, blank=True)
+    usuario = models.ForeignKey(
+        'usuarios.Usuario',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='productividades',
+        # Cubierto por el índice (usuario, tipo).
+        db_index=False,
+    )
+    creado_en = models.DateTimeField(auto_now_add=True)
+    actualizado_en = models.DateTimeField(auto_now=True)
+
+    objects = ProductividadQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['tipo', '-id'], name='productividad_tipo_id'),
+            models.Index(fields=['usuario', 'tipo'], name='productividad_usuario_tipo'),
+            models.Index(fields=['anio'], name='productividad_anio'),
+        ]
+
+    def __str__(self):
+        return self.titulo
+
+    def save(self, *args, **kwargs):
+        if self.TIPO is not None:
+            self.tipo = self.TIPO
+            if not self.tipoProductividad:
+                self.tipoProductividad = self.ETIQUETA
+        super().save(*args, **kwargs)
+
+
+class Libro(Productividad):
+    TIPO = 'libro'
+    ETIQUETA = 'Libro'
+    CLAVE_PUBLICACIONES = 'libros'
+
+    isbn = models.CharField(max_length=20, blank=True)
+    volumen = models.CharField(max_length=50, blank=True)
+    paginas = models.PositiveIntegerField(null=True, blank=True)
+    editorial = models.CharField(max_length=150, blank=True)
+    codigoEditorial = models.CharField(max_length=50, blank=True)
+    etiquetas = models.JSONField(default=list, blank=True)
+    propiedadIntelectual = models.CharField(max_length=150, blank=True)
+
+
+class CapituloLibro(Productividad):
+    TIPO = 'capitulo'
+    ETIQUETA = 'Capitulo de libros'
+    CLAVE_PUBLICACIONES = 'capitulos de libro'
+
+    isbn = models.CharField(max_length=20, blank=True)
+    volumen = models.CharField(max_length=50, blank=True)
+    paginaInicio = models.PositiveIntegerField(null=True, blank=True)
+    paginasFin = models.PositiveIntegerField(null=True, blank=True)
+    editorial = models.CharField(max_length=150, blank=True)
+    codigoEditorial = models.CharField(max_length=50, blank=True)
+    propiedadIntelectual = models.CharField(max_length=150, blank=True)
+    numeroCapitulo = models.PositiveIntegerField(null=True, blank=True)
+    nombreCapitulo = models.CharField(max_length=255, blank=True)
+
+
+class Curso(Productividad):
+    TIPO = 'curso'
+    ETIQUETA = 'Curso de duración corta'
+    CLAVE_PUBLICACIONES = 'cursos'
+
+    etiquetas = models.JSONField(default=list, blank=True)
+    propiedadIntelectual = models.CharField(max_length=150, blank=True)
+    duracion = models.PositiveIntegerField(null=True, blank=True)
+    institucion = models.CharField(max_length=150, blank=True)
+    fechaPublicacion = models.DateField(null=True, blank=True)
+    link = models.URLField(max_length=500, null=True, blank=True)
+
+
+class Evento(Productividad):
+    TIPO = 'evento'
+    ETIQUETA = 'Organización de eventos'
+    CLAVE_PUBLICACIONES = 'eventos'
+    CAMPOS_TEXTO = ('institucion', 'alcance')
+
+    etiquetas = models.JSONField(default=list, blank=True)
+    propiedadIntelectual = models.CharField(max_length=150, blank=True)
+    alcance = models.CharField(max_length=100, blank=True)
+    institucion = models.CharField(max_length=150, blank=True)
+    fechaPublicacion = models.DateField(null=True, blank=True)
+
+
+class Jurado(Productividad):
+    TIPO = 'jurado'
+    ETIQUETA = 'Jurado'
+    CLAVE_PUBLICACIONES = 'jurados'
+
+    orientados = models.JSONField(default=list, blank=True)
+    programa = models.CharField(max_length=150, blank=True)
+    institucion = models.CharField(max_length=150, blank=True)
+    etiquetas = models.JSONField(default=list, blank=True)
+    licencia = models.CharField(max_length=100, blank=True)
+    fechaPublicacion = models.DateField(null=True, blank=True)
+
+
+class MaterialDidactico(Productividad):
+    TIPO = 'material_didactico'
+    ETIQUETA = 'Desarrollo de material didáctico'
+    CLAVE_PUBLICACIONES = 'materiales didacticos'
+    CAMPOS_TEXTO = ('descripcion',)
+
+    descripcion = models.TextField(blank=True)
+    etiquetasGTI = models.JSONField(default=list, blank=True)
+    licencia = models.CharField(max_length=100, blank=True)
+    fechaPublicacion = models.DateField(null=True, blank=True)
+
+
+class Noticia(Productividad):
+    TIPO = 'noticia'
+    ETIQUETA = 'Noticia'
+    CLAVE_PUBLICACIONES = 'noticias'
+    CAMPOS_TEXTO = ('contenido',)
+
+    contenido = models.TextField(blank=True)
+    fecha_publicacion = models.DateTimeField(auto_now_add=True)
+
+
+class ParticipacionComitesEv(Productividad):
+    TIPO = 'participacion_comites'
+    ETIQUETA = 'Participación en comités de evaluación'
+    CLAVE_PUBLICACIONES = 'participaciones en comites de evaluacion'
+
+    institucion = models.CharField(max_length=150, blank=True)
+    etiquetasGTI = models.JSONField(default=list, blank=True)
+    licencia = models.CharField(max_length=100, blank=True)
+    fechaPublicacion = models.DateField(null=True, blank=True)
+
+
+class ProcesoTecnica(Productividad):
+    TIPO = 'proceso_tecnica'
+    ETIQUETA = 'Procesos o Técnicas'
+    CLAVE_PUBLICACIONES = 'procesos o tecnicas'
+
+    etiquetasGTI = models.JSONField(default=list, blank=True)
+    licencia = models.CharField(max_length=100, blank=True)
+    fechaPublicacion = models.DateField(null=True, blank=True)
+
+
+class Revista(Productividad):
+    TIPO = 'revista'
+    ETIQUETA = 'Revista'
+    CLAVE_PUBLICACIONES = 'revistas'
+
+    issn = models.CharField(max_length=20, blank=True)
+    volumen = models.PositiveIntegerField(null=True, blank=True)
+    fasc = models.PositiveIntegerField(null=True, blank=True)
+    linkDescargaArticulo = models.URLField(max_length=500, null=True, blank=True)
+    linksitioWeb = models.URLField(max_length=500, null=True, blank=True)
+    paginas = models.PositiveIntegerField(null=True, blank=True)
+    responsable = models.JSONField(default=list, blank=True)
+
+
+class Software(Productividad):
+    TIPO = 'software'
+    ETIQUETA = 'Software'
+    CLAVE_PUBLICACIONES = 'software'
+    CAMPOS_TEXTO = ('tituloDesarrollo', 'descripcionFuncional')
+
+    tituloDesarrollo = models.CharField(max_length=255, blank=True)
+    etiquetas = models.JSONField(default=list, blank=True)
+    nivelAcceso = models.CharField(max_length=100, blank=True)
+    tipoProducto = models.CharField(max_length=100, blank=True)
+    responsable = models.JSONField(default=list, blank=True)
+    codigoRegistro = models.CharField(max_length=100, null=True, blank=True)
+    descripcionFuncional = models.TextField(blank=True)
+    propiedadIntelectual = models.CharField(max_length=150, blank=True)
+    fechaPublicacion = models.DateField(null=True, blank=True)
+
+
+class TrabajoEventos(Productividad):
+    TIPO = 'trabajo_eventos'
+    ETIQUETA = 'Trabajo evento'
+    CLAVE_PUBLICACIONES = 'trabajo en eventos'
+
+    volumen = models.PositiveIntegerField(null=True, blank=True)
+    nombreSeminario = models.CharField(max_length=255, blank=True)
+    tipoPresentacion = models.CharField(max_length=100, blank=True)
+    tituloActas = models.CharField(max_length=255, blank=True)
+    isbn = models.CharField(max_length=20, blank=True)
+    paginas = models.PositiveIntegerField(null=True, blank=True)
+    etiquetas = models.JSONField(default=list, blank=True)
+    propiedadIntelectual = models.CharField(max_length=150, blank=True)
+
+
+class TutoriaConcluida(Productividad):
+    TIPO = 'tutoria_concluida'
+    ETIQUETA = 'Tutoría concluida'
+    CLAVE_PUBLICACIONES = 'tutorias concluidas'
+
+    orientados = models.JSONField(default=list, blank=True)
+    programa = models.CharField(max_length=150, blank=True)
+    institucion = models.CharField(max_length=150, blank=True)
+    etiquetasGTI = models.JSONField(default=list, blank=True)
+    licencia = models.CharField(max_length=100, blank=True)
+    fechaPublicacion = models.DateField(null=True, blank=True)
+
+
+class TutoriaEnMarcha(Productividad):
+    TIPO = 'tutoria_en_marcha'
+    ETIQUETA = 'Tutoría en marcha'
+    CLAVE_PUBLICACIONES = 'tutorias en marcha'
+    CAMPOS_TEXTO = ('descripcion',)
+
+    subtipoTitulo = models.CharField(max_length=150, blank=True)
+    descripcion = models.TextField(blank=True)
+    orientados = models.JSONField(default=list, blank=True)
+    programa = models.CharField(max_length=150, blank=True)
+    institucion = models.CharField(max_length=150, blank=True)
+    etiquetasGTI = models.JSONField(default=list, blank=True)
+    licencia = models.CharField(max_length=100, blank=True)
+    fechaPublicacion = models.DateField(null=True, blank=True)
+
+
+TIPOS_PRODUCTIVIDAD = {
+    modelo.TIPO: modelo
+    for modelo in (
+        Libro,
+        CapituloLibro,
+        Curso,
+        Evento,
+        Jurado,
+        MaterialDidactico,
+        Noticia,
+        ParticipacionComitesEv,
+        ProcesoTecnica,
+        Revista,
+        Software,
+        TrabajoEventos,
+        TutoriaConcluida,
+        TutoriaEnMarcha,
+    )
+}
+
+
+class TerminoBusqueda(models.Model):
+    """Índice invertido para motores sin FTS5 (ver busqueda.py)."""
+
+    termino = models.CharField(max_length=64)
+    productividad = models.ForeignKey(
+        Productividad, on_delete=models.CASCADE, related_name='+'
+    )
+    peso = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['termino', 'productividad'], name='termino_productividad_unico'
+            ),
+        ]
+
+
+class UltimaPublicacion(models.Model):
+    """Índice desnormalizado con la publicación más reciente de cada tipo.
+
+    Se mantiene desde las señales de guardado/borrado de Productividad, así la
+    portada se responde con una sola lectura de esta tabla (una fila por tipo).
+    """
+
+    tipo = models.CharField(max_length=30, unique=True)
+    # Id sin llave foránea: la fila se reemplaza desde las señales y no debe
+    # borrarse en cascada a mitad del borrado de la publicación.
+    publicacion_id = models.BigIntegerField()
+    datos = models.JSONField(default=dict)
+    actualizado_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['tipo']
+
+    def __str__(self):
+        return f'{self.tipo}: {self.publicacion_id}'
+
+
+class ContenidoInstitucional(models.Model):
+    """Texto de la sección "quiénes somos" (misión, visión, historia)."""
+
+    # Recurso cuya versión se incrementa al escribir (ver versiones.py).
+    RECURSO = None
+
+    contenido = models.TextField()
+    actualizado_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+        ordering = ['-id']
+
+    def __str__(self):
+        return self.contenido[:50]
+
+
+class Mision(ContenidoInstitucional):
+    RECURSO = 'mision'
+
+
+class Vision(ContenidoInstitucional):
+    RECURSO = 'vision'
+
+
+class Historia(ContenidoInstitucional):
+    RECURSO = 'historia'
+
+
+class ElementoInstitucional(ContenidoInstitucional):
+    """Elemento de una lista de "quiénes somos" (objetivos, valores)."""
+
+    titulo = models.CharField(max_length=200)
+
+    class Meta:
+        abstract = True
+        ordering = ['id']
+
+    def __str__(self):
+        return self.titulo
+
+
+class Objetivo(ElementoInstitucional):
+    RECURSO = 'objetivos'
+
+
+class Valor(ElementoInstitucional):
+    RECURSO = 'valores'
+
+
+class VersionRecurso(models.Model):
+    """Contador de cambios de un recurso público, para ETag y Last-Modified.
+
+    Se incrementa al escribir, así un GET condicional se contesta con 304 sin
+    leer ni serializar las filas del recurso.
+    """
+
+    recurso = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    actualizado_en = models.DateTimeField()
+
+    class Meta:
+        ordering = ['recurso']
+
+    def __str__(self):
+        return f'{self.recurso} v{self.version}'
+
+
+class ReferenciaAlmacenamiento(models.Model):
+    """Objeto del almacenamiento usado por un registro (ver referencias.py).
+
+    ``modelo`` es la etiqueta del modelo base (``informacion.Productividad``,
+    ``inventario.Item``). El recolector de huérfanos busca aquí, por el
+    índice de ``llave``, qué objetos listados del bucket siguen en uso.
+    """
+
+    llave = models.CharField(max_length=500)
+    modelo = models.CharField(max_length=100)
+    objeto_id = models.PositiveBigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['modelo', 'objeto_id', 'llave'], name='referencia_unica'
+            ),
+        ]
+        indexes = [models.Index(fields=['llave'], name='referencia_llave')]
+
+    def __str__(self):
+        return self.llave
+
+
+class EstadisticaProductividad(models.Model):
+    """Número de publicaciones por año, tipo, país y usuario (ver estadisticas.py).
+
+    Las señales ajustan ``total`` en cada alta, edición y borrado; los
+    reportes agrupan esta tabla, que crece con las combinaciones distintas y
+    no con el número de publicaciones.
+    """
+
+    anio = models.CharField(max_length=4, blank=True)
+    tipo = models.CharField(max_length=30)
+    pais = models.CharField(max_length=100, blank=True)
+    # 0 = sin usuario; así la combinación es única también sin autor (un
+    # NULL no choca con otro NULL en la restricción).
+    usuario_id = models.PositiveBigIntegerField(default=0)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['anio', 'tipo', 'pais', 'usuario_id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['anio', 'tipo', 'pais', 'usuario_id'], name='estadistica_unica'
+            ),
+        ]
+        indexes = [models.Index(fields=['usuario_id'], name='estadistica_usuario')]
+
+    def __str__(self):
+        return f'{self.anio} {self.tipo} {self.pais} {self.usuario_id}: {self.total}'
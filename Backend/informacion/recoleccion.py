@@ -0,0 +1,73 @@
+"""Recolección de objetos huérfanos del almacenamiento.
+
+Se lista el bucket por páginas (solo las carpetas que escribe el backend) y
+cada página se compara, con una consulta por el índice de ``llave``, contra
+ReferenciaAlmacenamiento. Lo que no está referenciado y es más viejo que el
+periodo de gracia se borra por lotes. La gracia protege las subidas recién
+firmadas cuyo registro todavía no se guarda.
+
+Solo corre en un proceso con todas las apps de ``referencias.CAMPOS``: con
+``IOTIC_APPS=informacion`` las imágenes de los items no quedarían
+registradas y se borrarían.
+"""
+import datetime
+import logging
+from dataclasses import dataclass
+
+from django.utils import timezone
+
+from .almacenamiento import CARPETAS, TAMANO_PAGINA
+from .models import ReferenciaAlmacenamiento
+from .referencias import faltantes
+
+logger = logging.getLogger(__name__)
+
+# Carpetas que administra el backend; el resto del bucket no se toca.
+PREFIJOS = (*(f'{carpeta}/' for carpeta in CARPETAS.values()), 'derivados/')
+GRACIA = datetime.timedelta(hours=24)
+
+
+@dataclass
+class ResultadoRecoleccion:
+    revisados: int = 0
+    huerfanos: int = 0
+    bytes_huerfanos: int = 0
+    eliminados: int = 0
+
+
+def recolectar(almacenamiento, gracia=GRACIA, lote=TAMANO_PAGINA, simular=False, ahora=None):
+    """Borra los objetos sin referencia más viejos que ``gracia``."""
+    resultado = ResultadoRecoleccion()
+    faltan = faltantes()
+    if faltan:
+        logger.warning('Recolección omitida: faltan %s en este proceso', ', '.join(faltan))
+        return resultado
+    limite = (ahora or timezone.now()) - gracia
+    pendientes = []
+
+    def vaciar():
+        if not simular:
+            resultado.eliminados += len(almacenamiento.eliminar(pendientes))
+        pendientes.clear()
+
+    for prefijo in PREFIJOS:
+        for pagina in almacenamiento.listar(prefijo):
+            resultado.revisados += len(pagina)
+            candidatos = {o.llave: o for o in pagina if o.modificado < limite}
+            if not candidatos:
+                continue
+            referenciadas = set(
+                ReferenciaAlmacenamiento.objects.filter(llave__in=candidatos)
+                .values_list('llave', flat=True)
+                .distinct()
+            )
+            for llave in candidatos.keys() - referenciadas:
+                resultado.huerfanos += 1
+                resultado.bytes_huerfanos += candidatos[llave].tamano
+                pendientes.append(llave)
+                if len(pendientes) >= lote:
+                    vaciar()
+    if pendientes:
+        vaciar()
+    logger.info('Recolección de almacenamiento: %s', resultado)
+    return resultado
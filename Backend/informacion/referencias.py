@@ -0,0 +1,99 @@
+"""Qué objetos del almacenamiento usa cada registro.
+
+Las señales mantienen ReferenciaAlmacenamiento al guardar y borrar
+publicaciones e items; ``reconstruir()`` la rehace desde las tablas (lo que
+no pasa por ``save()``, como ``bulk_create``, solo queda registrado así).
+"""
+from django.apps import apps as apps_globales
+from django.db import transaction
+
+from .almacenamiento import obtener_almacenamiento
+from .models import ReferenciaAlmacenamiento
+
+# Modelo base -> campos con URLs del almacenamiento.
+CAMPOS = {
+    'informacion.Productividad': ('image_r2', 'image_thumb', 'image_medium', 'file_r2'),
+    'inventario.Item': ('image_r2', 'image_thumb', 'image_medium'),
+}
+TAMANO_LOTE = 1000
+
+
+def modelos(registro=apps_globales):
+    """``[(etiqueta, modelo, campos)]`` de los modelos instalados."""
+    instalados = []
+    for etiqueta, campos in CAMPOS.items():
+        try:
+            instalados.append((etiqueta, registro.get_model(etiqueta), campos))
+        except LookupError:
+            continue
+    return instalados
+
+
+def faltantes(registro=apps_globales):
+    """Modelos de ``CAMPOS`` sin instalar: sus referencias no se pueden rehacer aquí."""
+    instalados = {etiqueta for etiqueta, _, _ in modelos(registro)}
+    return [etiqueta for etiqueta in CAMPOS if etiqueta not in instalados]
+
+
+def llaves(valores):
+    almacenamiento = obtener_almacenamiento()
+    return {almacenamiento.llave_de(valor) for valor in valores if valor} - {None}
+
+
+def _base(instancia):
+    for etiqueta, modelo, campos in modelos():
+        if isinstance(instancia, modelo):
+            return etiqueta, campos
+    return None, ()
+
+
+def actualizar(instancia, nuevo=False):
+    """Deja las referencias del registro iguales a sus campos actuales."""
+    etiqueta, campos = _base(instancia)
+    if etiqueta is None:
+        return
+    actuales = llaves(getattr(instancia, campo) for campo in campos)
+    if nuevo and not actuales:
+        return
+    filas = ReferenciaAlmacenamiento.objects.filter(modelo=etiqueta, objeto_id=instancia.pk)
+    registradas = set() if nuevo else set(filas.values_list('llave', flat=True))
+    if registradas - actuales:
+        filas.filter(llave__in=registradas - actuales).delete()
+    if actuales - registradas:
+        ReferenciaAlmacenamiento.objects.bulk_create(
+            [
+                ReferenciaAlmacenamiento(llave=llave, modelo=etiqueta, objeto_id=instancia.pk)
+                for llave in actuales - registradas
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def retirar(instancia):
+    etiqueta, _ = _base(instancia)
+    if etiqueta is None:
+        return
+    ReferenciaAlmacenamiento.objects.filter(modelo=etiqueta, objeto_id=instancia.pk).delete()
+
+
+def reconstruir(registro=apps_globales):
+    """Rehace la tabla completa. Devuelve el número de referencias."""
+    Referencia = registro.get_model('informacion', 'ReferenciaAlmacenamiento')
+    total = 0
+    with transaction.atomic():
+        Referencia.objects.all().delete()
+        lote = []
+        for etiqueta, modelo, campos in modelos(registro):
+            filas = modelo.objects.order_by().values_list('pk', *campos)
+            for pk, *valores in filas.iterator(chunk_size=TAMANO_LOTE):
+                lote.extend(
+                    Referencia(llave=llave, modelo=etiqueta, objeto_id=pk)
+                    for llave in llaves(valores)
+                )
+                if len(lote) >= TAMANO_LOTE:
+                    Referencia.objects.bulk_create(lote, ignore_conflicts=True)
+                    total += len(lote)
+                    lote = []
+        Referencia.objects.bulk_create(lote, ignore_conflicts=True)
+        total += len(lote)
+    return total
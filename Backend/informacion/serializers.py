@@ -0,0 +1,207 @@
+from rest_framework import serializers
+
+from ioticsemillero.serializers import CamposParcialesMixin
+
+from .models import (
+    CapituloLibro,
+    Curso,
+    Evento,
+    Historia,
+    Jurado,
+    Libro,
+    MaterialDidactico,
+    Mision,
+    Noticia,
+    Objetivo,
+    ParticipacionComitesEv,
+    ProcesoTecnica,
+    Productividad,
+    Revista,
+    Software,
+    TrabajoEventos,
+    TutoriaConcluida,
+    TutoriaEnMarcha,
+    Valor,
+    Vision,
+)
+
+CAMPOS_BASE = [
+    'id',
+    'titulo',
+    'tipoProductividad',
+    'pais',
+    'anio',
+    'autores',
+    'image_r2',
+    'image_thumb',
+    'image_medium',
+    'file_r2',
+    'usuario',
+]
+
+
+class ProductividadResumenSerializer(serializers.ModelSerializer):
+    """Solo los campos comunes; lo que consumen la portada y el perfil."""
+
+    class Meta:
+        model = Productividad
+        fields = CAMPOS_BASE
+
+
+class ProductividadSerializer(CamposParcialesMixin, serializers.ModelSerializer):
+    """Base de los serializadores por tipo.
+
+    El frontend envía las rutas de R2 como ``image_path``/``archivo_path`` y
+    las recibe de vuelta como ``image_r2``/``file_r2``.
+    """
+
+    image_path = serializers.CharField(
+        source='image_r2', write_only=True, required=False, allow_blank=True
+    )
+    archivo_path = serializers.CharField(
+        source='file_r2', write_only=True, required=False, allow_blank=True
+    )
+
+    class Meta:
+        exclude = ['tipo']
+        read_only_fields = [
+            'image_r2',
+            'image_thumb',
+            'image_medium',
+            'file_r2',
+            'creado_en',
+            'actualizado_en',
+        ]
+
+
+class LibroSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = Libro
+
+
+class CapituloLibroSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = CapituloLibro
+
+
+class CursoSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = Curso
+
+
+class EventoSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = Evento
+
+
+class JuradoSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = Jurado
+
+
+class MaterialDidacticoSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = MaterialDidactico
+
+
+class NoticiaSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = Noticia
+
+
+class ParticipacionComitesEvSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = ParticipacionComitesEv
+
+
+class ProcesoTecnicaSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = ProcesoTecnica
+
+
+class RevistaSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = Revista
+
+
+class SoftwareSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = Software
+
+
+class TrabajoEventosSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = TrabajoEventos
+
+
+class TutoriaConcluidaSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = TutoriaConcluida
+
+
+class TutoriaEnMarchaSerializer(ProductividadSerializer):
+    class Meta(ProductividadSerializer.Meta):
+        model = TutoriaEnMarcha
+
+
+class MisionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Mision
+        fields = ['id', 'contenido', 'actualizado_en']
+
+
+class VisionSerializer(MisionSerializer):
+    class Meta(MisionSerializer.Meta):
+        model = Vision
+
+
+class HistoriaSerializer(MisionSerializer):
+    class Meta(MisionSerializer.Meta):
+        model = Historia
+
+
+class ObjetivoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Objetivo
+        fields = ['id', 'titulo', 'contenido', 'actualizado_en']
+
+
+class ValorSerializer(ObjetivoSerializer):
+    class Meta(ObjetivoSerializer.Meta):
+        model = Valor
+
+
+# Extensiones y tipos MIME aceptados por tipo de subida.
+EXTENSIONES_SUBIDA = {
+    'images': {'jpg', 'jpeg', 'png', 'webp', 'gif'},
+    'files': {'pdf', 'doc', 'docx', 'ppt', 'pptx', 'xls', 'xlsx', 'odt', 'txt', 'zip'},
+}
+
+
+class SolicitudSubidaSerializer(serializers.Serializer):
+    """Datos para firmar una subida; el tipo (``images``/``files``) va en el contexto."""
+
+    extension = serializers.CharField(max_length=10)
+    content_type = serializers.CharField(max_length=100)
+
+    def validate_extension(self, valor):
+        valor = valor.lower().lstrip('.')
+        permitidas = EXTENSIONES_SUBIDA[self.context['tipo']]
+        if valor not in permitidas:
+            raise serializers.ValidationError(
+                f'Extensión no permitida; opciones: {", ".join(sorted(permitidas))}'
+            )
+        return valor
+
+    def validate_content_type(self, valor):
+        if self.context['tipo'] == 'images' and not valor.startswith('image/'):
+            raise serializers.ValidationError('Se esperaba un tipo image/*')
+        return valor
+
+
+# Cada URL firmada es una subida autorizada: un lote no reserva más que esto.
+MAXIMO_POR_LOTE = 50
+
+
+class LoteSubidaSerializer(serializers.Serializer):
+    archivos = SolicitudSubidaSerializer(many=True, allow_empty=False, max_length=MAXIMO_POR_LOTE)
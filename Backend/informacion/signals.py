@@ -0,0 +1,134 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from ioticsemillero.cache import invalidar
+from usuarios.models import Usuario
+
+from . import derivados, estadisticas, referencias
+from .busqueda import obtener_indice
+from .models import ContenidoInstitucional, Productividad, UltimaPublicacion
+from .serializers import ProductividadResumenSerializer
+from .versiones import incrementar
+
+
+def _es_tipo_concreto(instance):
+    return isinstance(instance, Productividad) and instance.TIPO is not None
+
+
+def recalcular_ultima(tipo, excluir=None):
+    """Vuelve a calcular la fila de UltimaPublicacion de un tipo."""
+    candidatas = Productividad.objects.del_tipo(tipo)
+    if excluir is not None:
+        candidatas = candidatas.exclude(pk=excluir)
+    ultima = candidatas.recientes().first()
+    if ultima is None:
+        UltimaPublicacion.objects.filter(tipo=tipo).delete()
+        return
+    UltimaPublicacion.objects.update_or_create(
+        tipo=tipo,
+        defaults={
+            'publicacion_id': ultima.pk,
+            'datos': ProductividadResumenSerializer(ultima).data,
+        },
+    )
+
+
+@receiver(post_save)
+def actualizar_ultima_publicacion(sender, instance, created, raw=False, **kwargs):
+    if raw or not _es_tipo_concreto(instance):
+        return
+    datos = ProductividadResumenSerializer(instance).data
+    if created:
+        # Los ids son crecientes: lo recién creado es lo más reciente del tipo.
+        UltimaPublicacion.objects.update_or_create(
+            tipo=instance.tipo,
+            defaults={'publicacion_id': instance.pk, 'datos': datos},
+        )
+    else:
+        UltimaPublicacion.objects.filter(
+            tipo=instance.tipo, publicacion_id=instance.pk
+        ).update(datos=datos)
+
+
+@receiver(post_delete)
+def retirar_ultima_publicacion(sender, instance, **kwargs):
+    if not _es_tipo_concreto(instance):
+        return
+    if UltimaPublicacion.objects.filter(
+        tipo=instance.tipo, publicacion_id=instance.pk
+    ).exists():
+        recalcular_ultima(instance.tipo, excluir=instance.pk)
+
+
+@receiver(post_save)
+def indexar_para_busqueda(sender, instance, raw=False, **kwargs):
+    if raw or not _es_tipo_concreto(instance):
+        return
+    obtener_indice().indexar([instance])
+
+
+@receiver(post_delete)
+def retirar_de_busqueda(sender, instance, **kwargs):
+    if not _es_tipo_concreto(instance):
+        return
+    obtener_indice().eliminar([instance.pk])
+
+
+@receiver(pre_save)
+def recordar_estadistica(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw and _es_tipo_concreto(instance):
+        estadisticas.recordar(instance, update_fields)
+
+
+@receiver(post_save)
+def actualizar_estadisticas(sender, instance, created, raw=False, **kwargs):
+    if not raw and _es_tipo_concreto(instance):
+        estadisticas.registrar(instance, created)
+
+
+@receiver(post_delete)
+def descontar_estadisticas(sender, instance, **kwargs):
+    if _es_tipo_concreto(instance):
+        estadisticas.descontar(instance)
+
+
+@receiver(post_delete, sender=Usuario)
+def reasignar_estadisticas(sender, instance, **kwargs):
+    # SET_NULL deja sus publicaciones sin usuario sin pasar por save().
+    estadisticas.reasignar_usuario(instance.pk)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def nueva_version(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if _es_tipo_concreto(instance):
+        recursos = (instance.tipo, 'publicaciones')
+    elif isinstance(instance, ContenidoInstitucional):
+        recursos = (instance.RECURSO,)
+    else:
+        return
+    incrementar(*recursos)
+    invalidar(*recursos)
+
+
+@receiver(post_save)
+def generar_derivados(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Los items los atiende inventario.signals, también sin esta app instalada.
+    if raw or not isinstance(instance, Productividad):
+        return
+    if update_fields is not None and 'image_r2' not in update_fields:
+        return
+    derivados.programar(instance)
+
+
+@receiver(post_save)
+def registrar_referencias(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        referencias.actualizar(instance, nuevo=created)
+
+
+@receiver(post_delete)
+def retirar_referencias(sender, instance, **kwargs):
+    referencias.retirar(instance)
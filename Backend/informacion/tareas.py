@@ -0,0 +1,21 @@
+"""Trabajos en segundo plano de informacion (ver trabajos/cola.py)."""
+import datetime
+
+from trabajos.cola import tarea
+
+from . import recoleccion, referencias
+from .almacenamiento import obtener_almacenamiento
+
+# La generación de derivados (``derivados.generar``) vive junto a su código
+# para que inventario la registre sin importar los modelos de informacion.
+
+
+@tarea(max_intentos=3)
+def recolectar_almacenamiento(gracia_horas=24):
+    """Lo mismo que ``manage.py gc_storage``; periódica solo si se configura."""
+    # Sin todas las apps la tabla quedaría sin sus referencias; recolectar no corre.
+    total = 0 if referencias.faltantes() else referencias.reconstruir()
+    resultado = recoleccion.recolectar(
+        obtener_almacenamiento(), gracia=datetime.timedelta(hours=gracia_horas)
+    )
+    return {'referencias': total, **vars(resultado)}
@@ -0,0 +1,178 @@
+from django.conf import settings
+from django.urls import path
+
+from ioticsemillero.cache import cache_publica
+
+from . import asincronas, serializers
+from .views import (
+    BusquedaView,
+    ContenidoUnicoViewSet,
+    ElementosInstitucionalesViewSet,
+    EstadisticasView,
+    ProductividadViewSet,
+    PublicacionesUsuarioView,
+    UltimasPublicacionesView,
+    UrlFirmadaLoteView,
+    UrlFirmadaView,
+    subida_local,
+)
+
+# (prefijo, segmento de escritura, serializador, segmento de borrado si difiere)
+PRODUCTIVIDADES = [
+    ('libros', 'libro', serializers.LibroSerializer, 'Libros'),
+    ('capLibros', 'capitulo_libro', serializers.CapituloLibroSerializer, None),
+    ('cursos', 'curso', serializers.CursoSerializer, None),
+    ('eventos', 'evento', serializers.EventoSerializer, None),
+    ('jurados', 'jurado', serializers.JuradoSerializer, None),
+    ('materialDidactico', 'material_did', serializers.MaterialDidacticoSerializer, None),
+    ('noticias', 'noticia', serializers.NoticiaSerializer, None),
+    ('participacionComitesEv', 'comite_ev', serializers.ParticipacionComitesEvSerializer, None),
+    ('procesosTecnicas', 'proceso_tecnica', serializers.ProcesoTecnicaSerializer, None),
+    ('revistas', 'revista', serializers.RevistaSerializer, None),
+    ('software', 'software', serializers.SoftwareSerializer, None),
+    ('trabajoEventos', 'trabajo_evento', serializers.TrabajoEventosSerializer, None),
+    ('tutoriasConcluidas', 'tutoria_concluida', serializers.TutoriaConcluidaSerializer, None),
+    ('tutoriasEnMarcha', 'tutoria_en_marcha', serializers.TutoriaEnMarchaSerializer, None),
+]
+
+
+def rutas_productividad(prefijo, segmento, serializer_class, segmento_borrado=None):
+    """Rutas CRUD con la forma que usan los servicios del frontend."""
+
+    def vista(acciones):
+        return ProductividadViewSet.as_view(acciones, serializer_class=serializer_class)
+
+    nombre = serializer_class.Meta.model.TIPO
+    lectura = cache_publica(nombre)
+    rutas = [
+        path(f'{prefijo}/', lectura(vista({'get': 'list'})), name=f'{nombre}-list'),
+        path(
+            f'{prefijo}/imagenes/',
+            lectura(vista({'get': 'imagenes'})),
+            name=f'{nombre}-imagenes',
+        ),
+        path(f'{prefijo}/{segmento}/', vista({'post': 'create'}), name=f'{nombre}-create'),
+        path(
+            f'{prefijo}/<int:pk>/',
+            lectura(vista({'get': 'retrieve'})),
+            name=f'{nombre}-detail',
+        ),
+        path(
+            f'{prefijo}/<int:pk>/imagen/',
+            vista({'delete': 'eliminar_imagen'}),
+            name=f'{nombre}-imagen',
+        ),
+        path(
+            f'{prefijo}/<int:pk>/archivo/',
+            vista({'delete': 'eliminar_archivo'}),
+            name=f'{nombre}-archivo',
+        ),
+    ]
+    if segmento_borrado and segmento_borrado != segmento:
+        rutas += [
+            path(
+                f'{prefijo}/<int:pk>/{segmento}/',
+                vista({'put': 'update', 'patch': 'partial_update'}),
+                name=f'{nombre}-update',
+            ),
+            path(
+                f'{prefijo}/<int:pk>/{segmento_borrado}/',
+                vista({'delete': 'destroy'}),
+                name=f'{nombre}-delete',
+            ),
+        ]
+    else:
+        rutas.append(
+            path(
+                f'{prefijo}/<int:pk>/{segmento}/',
+                vista({'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}),
+                name=f'{nombre}-update',
+            )
+        )
+    return rutas
+
+
+# Secciones de "quiénes somos": (prefijo, serializador, es lista)
+INSTITUCIONAL = [
+    ('mision', serializers.MisionSerializer, False),
+    ('vision', serializers.VisionSerializer, False),
+    ('historia', serializers.HistoriaSerializer, False),
+    ('objetivos', serializers.ObjetivoSerializer, True),
+    ('valores', serializers.ValorSerializer, True),
+]
+
+
+def rutas_institucionales(prefijo, serializer_class, es_lista):
+    recurso = serializer_class.Meta.model.RECURSO
+    if es_lista:
+        vista = ElementosInstitucionalesViewSet
+        acciones = [
+            ('ver/', {'get': 'list'}, 'ver'),
+            ('agregar/', {'post': 'create'}, 'agregar'),
+            ('<int:pk>/editar/', {'put': 'update', 'patch': 'partial_update'}, 'editar'),
+            ('<int:pk>/eliminar/', {'delete': 'destroy'}, 'eliminar'),
+        ]
+    else:
+        vista = ContenidoUnicoViewSet
+        acciones = [
+            ('ver/', {'get': 'ver'}, 'ver'),
+            ('agregar/', {'post': 'create'}, 'agregar'),
+            ('<int:pk>/editar/', {'put': 'update'}, 'editar'),
+        ]
+    rutas = []
+    for ruta, metodos, nombre in acciones:
+        funcion = vista.as_view(metodos, serializer_class=serializer_class)
+        if nombre == 'ver':
+            funcion = cache_publica(recurso)(funcion)
+        rutas.append(path(f'{prefijo}/{ruta}', funcion, name=f'{prefijo}-{nombre}'))
+    return rutas
+
+
+if settings.IOTIC_ASGI:
+    # Rutas de E/S con vistas asíncronas (ver ioticsemillero/asincrono.py).
+    ultimas = asincronas.ultimas_publicaciones
+    publicaciones_usuario = asincronas.publicaciones_usuario
+    url_firmada = asincronas.url_firmada
+    url_firmada_lote = asincronas.url_firmada_lote
+else:
+    ultimas = cache_publica('publicaciones')(UltimasPublicacionesView.as_view())
+    publicaciones_usuario = cache_publica('publicaciones', 'usuarios')(
+        PublicacionesUsuarioView.as_view()
+    )
+
+    def url_firmada(tipo):
+        return UrlFirmadaView.as_view(tipo=tipo)
+
+    def url_firmada_lote(tipo):
+        return UrlFirmadaLoteView.as_view(tipo=tipo)
+
+
+urlpatterns = [
+    path('publicaciones/ultimas/', ultimas, name='publicaciones-ultimas'),
+    path(
+        'publicaciones/buscar/',
+        cache_publica('publicaciones')(BusquedaView.as_view()),
+        name='publicaciones-buscar',
+    ),
+    path(
+        'publicaciones/estadisticas/',
+        cache_publica('publicaciones', 'usuarios')(EstadisticasView.as_view()),
+        name='publicaciones-estadisticas',
+    ),
+    path(
+        'publicaciones/<int:pk>/Publicaciones/',
+        publicaciones_usuario,
+        name='publicaciones-usuario',
+    ),
+    path('urlfirmada/images/', url_firmada('images'), name='urlfirmada-images'),
+    path('urlfirmada/files/', url_firmada('files'), name='urlfirmada-files'),
+    path('urlfirmada/images/lote/', url_firmada_lote('images'), name='urlfirmada-images-lote'),
+    path('urlfirmada/files/lote/', url_firmada_lote('files'), name='urlfirmada-files-lote'),
+    path('almacenamiento/<path:llave>', subida_local, name='almacenamiento-local'),
+]
+
+for productividad in PRODUCTIVIDADES:
+    urlpatterns += rutas_productividad(*productividad)
+
+for institucional in INSTITUCIONAL:
+    urlpatterns += rutas_institucionales(*institucional)
@@ -0,0 +1,148 @@
+"""Versiones de los recursos públicos y GET condicional (ETag / Last-Modified).
+
+Cada escritura de un recurso (``mision``, ``objetivos``, un tipo de
+publicación, ...) incrementa su fila en VersionRecurso. Las vistas calculan
+el ETag con el recurso, su versión y la URL pedida, así un
+``If-None-Match``/``If-Modified-Since`` vigente se contesta con 304 sin leer
+las filas del recurso. La versión se guarda además en la cache de Django, con
+lo que un 304 normalmente no toca la base de datos.
+
+``get_condicional(recurso)`` hace lo mismo para las vistas asíncronas.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import VersionRecurso
+
+LLAVE_CACHE = 'informacion:version:{}'
+# Los navegadores revalidan siempre (un 304 es barato); caches compartidas
+# (nginx, el servidor SSR) pueden servir la copia un minuto.
+CACHE_CONTROL = 'public, max-age=0, s-maxage=60'
+
+
+def version_de(recurso):
+    """``(version, actualizado_en)`` del recurso; ``(0, None)`` si nunca se escribió."""
+    llave = LLAVE_CACHE.format(recurso)
+    valor = cache.get(llave)
+    if valor is None:
+        fila = (
+            VersionRecurso.objects.filter(recurso=recurso)
+            .values_list('version', 'actualizado_en')
+            .first()
+        )
+        valor = tuple(fila) if fila else (0, None)
+        cache.set(llave, valor, timeout=None)
+    return valor
+
+
+async def aversion_de(recurso):
+    llave = LLAVE_CACHE.format(recurso)
+    valor = await cache.aget(llave)
+    if valor is None:
+        fila = await (
+            VersionRecurso.objects.filter(recurso=recurso)
+            .values_list('version', 'actualizado_en')
+            .afirst()
+        )
+        valor = tuple(fila) if fila else (0, None)
+        await cache.aset(llave, valor, timeout=None)
+    return valor
+
+
+def incrementar(*recursos):
+    """Marca los recursos como modificados (nueva versión y fecha)."""
+    ahora = timezone.now()
+    for recurso in recursos:
+        filas = VersionRecurso.objects.filter(recurso=recurso)
+        if not filas.update(version=F('version') + 1, actualizado_en=ahora):
+            VersionRecurso.objects.bulk_create(
+                [VersionRecurso(recurso=recurso, actualizado_en=ahora)], ignore_conflicts=True
+            )
+            filas.update(version=F('version') + 1, actualizado_en=ahora)
+    llaves = [LLAVE_CACHE.format(r) for r in recursos]
+    cache.delete_many(llaves)
+    # Otra petición pudo volver a cachear la versión vieja antes del commit.
+    transaction.on_commit(lambda: cache.delete_many(llaves))
+
+
+def etag(recurso, version, ruta):
+    resumen = hashlib.sha1(f'{recurso}:{version}:{ruta}'.encode()).hexdigest()[:20]
+    return f'"{resumen}"'
+
+
+def validadores(recurso, version, fecha, ruta):
+    return {
+        'etag': etag(recurso, version, ruta),
+        'last_modified': int(fecha.timestamp()) if fecha else None,
+    }
+
+
+def agregar_validadores(respuesta, validadores, cache_control=None):
+    respuesta['ETag'] = validadores['etag']
+    if validadores['last_modified'] is not None:
+        respuesta['Last-Modified'] = http_date(validadores['last_modified'])
+    respuesta['Cache-Control'] = cache_control or getattr(
+        settings, 'INFORMACION_CACHE_CONTROL', CACHE_CONTROL
+    )
+    return respuesta
+
+
+def get_condicional(recurso):
+    """Decorador de vistas asíncronas: validadores y 304 según la versión de ``recurso``."""
+
+    def decorador(vista):
+        @wraps(vista)
+        async def envuelta(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await vista(request, *args, **kwargs)
+            actuales = validadores(recurso, *await aversion_de(recurso), request.get_full_path())
+            no_modificado = get_conditional_response(request, **actuales)
+            if no_modificado is not None:
+                return agregar_validadores(no_modificado, actuales)
+            respuesta = await vista(request, *args, **kwargs)
+            if respuesta.status_code == 200:
+                agregar_validadores(respuesta, actuales)
+            return respuesta
+
+        return envuelta
+
+    return decorador
+
+
+class GetCondicionalMixin:
+    """Vista pública con ETag, Last-Modified y Cache-Control según la versión del recurso.
+
+    La vista define ``recurso_version`` (o ``get_recurso_version()``); si
+    devuelve None la petición se atiende sin validadores.
+    """
+
+    recurso_version = None
+    cache_control = None
+
+    def get_recurso_version(self):
+        return self.recurso_version
+
+    def dispatch(self, request, *args, **kwargs):
+        actuales = None
+        if request.method in ('GET', 'HEAD'):
+            self.args, self.kwargs = args, kwargs
+            self.action = getattr(self, 'action_map', {}).get(request.method.lower())
+            recurso = self.get_recurso_version()
+            if recurso is not None:
+                actuales = validadores(recurso, *version_de(recurso), request.get_full_path())
+                no_modificado = get_conditional_response(request, **actuales)
+                if no_modificado is not None:
+                    return agregar_validadores(no_modificado, actuales, self.cache_control)
+
+        respuesta = super().dispatch(request, *args, **kwargs)
+        if actuales is not None and respuesta.status_code == 200:
+            agregar_validadores(respuesta, actuales, self.cache_control)
+        return respuesta
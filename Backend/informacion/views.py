@@ -0,0 +1,284 @@
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.shortcuts import get_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from rest_framework import generics, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ioticsemillero.filters import FiltroPorCampos
+from usuarios.models import Usuario
+from usuarios.permisos import escritura
+
+from .almacenamiento import AlmacenamientoLocal, nueva_llave, obtener_almacenamiento
+from .busqueda import obtener_indice
+from .estadisticas import DIMENSIONES, agrupar
+from .models import (
+    TIPOS_PRODUCTIVIDAD,
+    EstadisticaProductividad,
+    Productividad,
+    UltimaPublicacion,
+)
+from .serializers import CAMPOS_BASE, LoteSubidaSerializer, SolicitudSubidaSerializer
+from .versiones import GetCondicionalMixin
+
+
+class ProductividadViewSet(GetCondicionalMixin, viewsets.ModelViewSet):
+    """CRUD genérico de un tipo de productividad.
+
+    Las rutas (urls.py) fijan ``serializer_class``; el modelo sale de su Meta.
+    """
+
+    serializer_class = None
+    permisos_requeridos = escritura('informacion.publicar')
+    filtros = {
+        'anio': 'anio',
+        'pais': 'pais__iexact',
+        'usuario': 'usuario_id',
+    }
+
+    def get_queryset(self):
+        return self.serializer_class.Meta.model.objects.all()
+
+    def get_recurso_version(self):
+        if self.action in ('list', 'retrieve', 'imagenes'):
+            return self.serializer_class.Meta.model.TIPO
+        return None
+
+    def eliminar_imagen(self, request, *args, **kwargs):
+        return self._quitar_adjunto('image_r2')
+
+    def eliminar_archivo(self, request, *args, **kwargs):
+        return self._quitar_adjunto('file_r2')
+
+    def imagenes(self, request, *args, **kwargs):
+        rutas = (
+            self.filter_queryset(self.get_queryset())
+            .exclude(image_r2='')
+            .values_list('image_r2', flat=True)
+        )
+        return Response(list(rutas))
+
+    def _quitar_adjunto(self, campo):
+        instancia = self.get_object()
+        if not getattr(instancia, campo):
+            return Response(
+                {'message': 'La publicación no tiene adjunto'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        setattr(instancia, campo, '')
+        instancia.save(update_fields=[campo, 'actualizado_en'])
+        return Response(self.get_serializer(instancia).data)
+
+
+class UltimasPublicacionesView(GetCondicionalMixin, APIView):
+    """Última publicación de cada tipo, leída del índice UltimaPublicacion."""
+
+    recurso_version = 'publicaciones'
+
+    def get(self, request):
+        ultimas = dict.fromkeys(TIPOS_PRODUCTIVIDAD)
+        for fila in UltimaPublicacion.objects.only('tipo', 'datos'):
+            ultimas[fila.tipo] = fila.datos
+        return Response(ultimas)
+
+
+class PublicacionesUsuarioView(GetCondicionalMixin, APIView):
+    """Todas las publicaciones de un usuario agrupadas por tipo.
+
+    Se leen de la tabla común Productividad en una sola consulta (los autores
+    van en la misma fila), así el costo no depende de cuántos tipos o
+    publicaciones tenga el usuario.
+    """
+
+    recurso_version = 'publicaciones'
+
+    def get(self, request, pk):
+        get_object_or_404(Usuario.objects.only('pk'), pk=pk)
+        respuesta = {'usuario_id': pk}
+        respuesta.update(
+            (modelo.CLAVE_PUBLICACIONES, []) for modelo in TIPOS_PRODUCTIVIDAD.values()
+        )
+        filas = (
+            Productividad.objects.de_usuario(pk)
+            .recientes()
+            .values('tipo', *CAMPOS_BASE)
+        )
+        for fila in filas:
+            modelo = TIPOS_PRODUCTIVIDAD.get(fila.pop('tipo'))
+            if modelo is not None:
+                respuesta[modelo.CLAVE_PUBLICACIONES].append(fila)
+        return Response(respuesta)
+
+
+class EstadisticasView(GetCondicionalMixin, generics.GenericAPIView):
+    """Número de publicaciones agrupado por cualquier combinación de dimensiones.
+
+    ``?agrupar=anio,tipo`` con ``anio``, ``tipo``, ``pais`` o ``usuario``; los
+    mismos nombres filtran (``?pais=Colombia&tipo=libro,curso``). Se responde
+    desde EstadisticaProductividad, sin leer las publicaciones.
+    """
+
+    queryset = EstadisticaProductividad.objects.all()
+    filter_backends = [FiltroPorCampos]
+    filtros = {
+        'anio': 'anio',
+        'tipo': 'tipo',
+        'pais': 'pais__iexact',
+        'usuario': 'usuario_id',
+    }
+    recurso_version = 'publicaciones'
+
+    def get(self, request):
+        pedidas = request.query_params.get('agrupar', '').split(',')
+        dimensiones = list(dict.fromkeys(d.strip() for d in pedidas if d.strip()))
+        desconocidas = [d for d in dimensiones if d not in DIMENSIONES]
+        if desconocidas:
+            mensaje = f'Dimensiones desconocidas: {", ".join(desconocidas)}'
+            raise ValidationError({'agrupar': f'{mensaje}. Use {", ".join(DIMENSIONES)}.'})
+        grupos = agrupar(self.filter_queryset(self.get_queryset()), dimensiones)
+        return Response(
+            {
+                'agrupar': dimensiones,
+                'total': sum(grupo['total'] for grupo in grupos),
+                'grupos': grupos,
+            }
+        )
+
+
+class BusquedaView(GetCondicionalMixin, APIView):
+    """Búsqueda de texto en título, autores, país y cuerpo de las publicaciones.
+
+    ``?q=`` texto a buscar, ``?tipo=`` restringe a un tipo y ``?limit=`` (máx.
+    50) el número de resultados, ordenados por relevancia.
+    """
+
+    LIMITE_MAXIMO = 50
+    recurso_version = 'publicaciones'
+
+    def get(self, request):
+        texto = request.query_params.get('q', '').strip()
+        tipo = request.query_params.get('tipo') or None
+        try:
+            limite = min(int(request.query_params.get('limit', 20)), self.LIMITE_MAXIMO)
+        except ValueError:
+            limite = 20
+        if not texto or limite < 1:
+            return Response([])
+        ids = obtener_indice().buscar(texto, tipo=tipo, limite=limite)
+        if not ids:
+            return Response([])
+        filas = {
+            fila['id']: fila
+            for fila in Productividad.objects.filter(id__in=ids).values('tipo', *CAMPOS_BASE)
+        }
+        return Response([filas[i] for i in ids if i in filas])
+
+
+class ContenidoUnicoViewSet(GetCondicionalMixin, viewsets.GenericViewSet):
+    """Misión, visión o historia: un solo texto vigente.
+
+    ``ver`` responde el registro más reciente o ``{'message': ...}`` si aún
+    no hay ninguno, como espera WhoWeAreService.
+    """
+
+    permisos_requeridos = escritura('informacion.institucional')
+    pagination_class = None
+    filter_backends = []
+
+    def get_queryset(self):
+        return self.serializer_class.Meta.model.objects.all()
+
+    def get_recurso_version(self):
+        return self.serializer_class.Meta.model.RECURSO
+
+    def ver(self, request):
+        actual = self.get_queryset().first()
+        if actual is None:
+            nombre = self.serializer_class.Meta.model._meta.verbose_name
+            return Response({'message': f'No hay {nombre} registrada'})
+        return Response(self.get_serializer(actual).data)
+
+    def create(self, request):
+        if self.get_queryset().exists():
+            return Response(
+                {'message': 'Ya existe un registro; edítelo en lugar de crear otro'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def update(self, request, pk=None):
+        serializer = self.get_serializer(self.get_object(), data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class ElementosInstitucionalesViewSet(GetCondicionalMixin, viewsets.ModelViewSet):
+    """Objetivos o valores: lista completa, sin paginar."""
+
+    permisos_requeridos = escritura('informacion.institucional')
+    pagination_class = None
+    filter_backends = []
+
+    def get_queryset(self):
+        return self.serializer_class.Meta.model.objects.all()
+
+    def get_recurso_version(self):
+        if self.action == 'list':
+            return self.serializer_class.Meta.model.RECURSO
+        return None
+
+
+def firmar_subida(request, tipo, extension, content_type):
+    """URL firmada para subir un objeto nuevo y la URL pública que tendrá."""
+    almacenamiento = obtener_almacenamiento()
+    llave = nueva_llave(tipo, extension)
+    return {
+        'upload_url': request.build_absolute_uri(almacenamiento.url_subida(llave, content_type)),
+        'file_path': request.build_absolute_uri(almacenamiento.url_publica(llave)),
+        'key': llave,
+    }
+
+
+class UrlFirmadaView(APIView):
+    """Firma la subida de una imagen o un archivo (``tipo`` lo fijan las rutas)."""
+
+    tipo = None
+    permisos_requeridos = {'POST': 'almacenamiento.subir'}
+
+    def post(self, request):
+        serializer = SolicitudSubidaSerializer(data=request.data, context={'tipo': self.tipo})
+        serializer.is_valid(raise_exception=True)
+        return Response(firmar_subida(request, self.tipo, **serializer.validated_data))
+
+
+class UrlFirmadaLoteView(UrlFirmadaView):
+    """Varias URLs firmadas en una petición: ``{"archivos": [{extension, content_type}, ...]}``."""
+
+    def post(self, request):
+        serializer = LoteSubidaSerializer(data=request.data, context={'tipo': self.tipo})
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            [
+                firmar_subida(request, self.tipo, **archivo)
+                for archivo in serializer.validated_data['archivos']
+            ]
+        )
+
+
+@csrf_exempt
+@require_http_methods(['PUT'])
+def subida_local(request, llave):
+    """Recibe el PUT de una URL firmada por AlmacenamientoLocal."""
+    almacenamiento = obtener_almacenamiento()
+    if not isinstance(almacenamiento, AlmacenamientoLocal):
+        raise Http404
+    if not almacenamiento.verificar(llave, request.GET.get('expira'), request.GET.get('firma')):
+        return HttpResponseForbidden('Firma inválida o vencida')
+    almacenamiento.guardar(llave, iter(lambda: request.read(64 * 1024), b''))
+    return HttpResponse(status=200)
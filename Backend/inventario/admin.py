@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from .models import Item, Prestamo, ResumenInventario
+
+
+@admin.register(Item)
+class ItemAdmin(admin.ModelAdmin):
+    list_display = ('id', 'serial', 'descripcion', 'estado_fisico', 'estado_admin')
+    list_filter = ('estado_admin', 'estado_fisico')
+    search_fields = ('serial', 'descripcion')
+
+
+@admin.register(Prestamo)
+class PrestamoAdmin(admin.ModelAdmin):
+    list_display = ('id', 'item', 'nombre_persona', 'fecha_limite', 'estado')
+    list_filter = ('estado',)
+    search_fields = ('nombre_persona', 'cedula', 'item__serial')
+
+
+@admin.register(ResumenInventario)
+class ResumenInventarioAdmin(admin.ModelAdmin):
+    list_display = ('descripcion', 'disponibles', 'prestados', 'no_prestar', 'actualizado_en')
+    search_fields = ('descripcion',)
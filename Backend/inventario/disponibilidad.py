@@ -0,0 +1,134 @@
+"""Estado de disponibilidad precalculado del inventario.
+
+Cada item guarda su préstamo activo (``Item.prestamo_actual``) y la tabla
+ResumenInventario lleva cuántos items hay por descripción en cada estado.
+Ambos se actualizan dentro de la transacción que presta, devuelve, registra
+o edita un item, así los reportes son lecturas indexadas y no recorridos.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+from .models import Item, Prestamo, ResumenInventario
+
+
+def contar(items, signo=1):
+    """Cambios de contadores que aportan ``items`` (o retiran, con ``signo=-1``)."""
+    cambios = Counter()
+    for item in items:
+        cambios[(item.descripcion, item.estado_admin)] += signo
+    return cambios
+
+
+def ajustar_contadores(cambios):
+    """Aplica un Counter ``{(descripcion, estado): delta}`` a ResumenInventario.
+
+    Una consulta UPDATE por descripción; la fila solo se crea la primera vez.
+    """
+    por_descripcion = defaultdict(dict)
+    for (descripcion, estado), delta in cambios.items():
+        if delta:
+            campo = ResumenInventario.CAMPOS[estado]
+            por_descripcion[descripcion][campo] = por_descripcion[descripcion].get(campo, 0) + delta
+
+    ahora = timezone.now()
+    for descripcion, deltas in por_descripcion.items():
+        valores = {campo: F(campo) + delta for campo, delta in deltas.items()}
+        filas = ResumenInventario.objects.filter(descripcion=descripcion)
+        if not filas.update(actualizado_en=ahora, **valores):
+            ResumenInventario.objects.bulk_create(
+                [ResumenInventario(descripcion=descripcion)], ignore_conflicts=True
+            )
+            filas.update(actualizado_en=ahora, **valores)
+
+
+def conteo_real():
+    """Contadores calculados desde la tabla de items: ``{descripcion: {campo: n}}``."""
+    conteo = defaultdict(lambda: dict.fromkeys(ResumenInventario.CAMPOS.values(), 0))
+    filas = (
+        Item.objects.order_by()
+        .values('descripcion', 'estado_admin')
+        .annotate(cantidad=Count('id'))
+    )
+    for fila in filas:
+        conteo[fila['descripcion']][ResumenInventario.CAMPOS[fila['estado_admin']]] = fila['cantidad']
+    return conteo
+
+
+def prestamos_activos():
+    """``{item_id: prestamo_id}`` con el préstamo activo más reciente de cada item."""
+    return dict(
+        Prestamo.objects.activos()
+        .order_by()
+        .values('item_id')
+        .annotate(ultimo=Max('id'))
+        .values_list('item_id', 'ultimo')
+    )
+
+
+def revisar():
+    """Diferencias entre el estado guardado y el que se deduce de los préstamos."""
+    activos = prestamos_activos()
+    diferencias = []
+
+    revisados = Item.objects.filter(
+        Q(estado_admin=Item.PRESTADO)
+        | Q(prestamo_actual__isnull=False)
+        | Q(pk__in=list(activos))
+    ).order_by('id')
+    for item_id, estado, actual in revisados.values_list(
+        'id', 'estado_admin', 'prestamo_actual_id'
+    ):
+        esperado = activos.get(item_id)
+        estado_esperado = Item.PRESTADO if esperado else (
+            Item.DISPONIBLE if estado == Item.PRESTADO else estado
+        )
+        if actual != esperado or estado != estado_esperado:
+            diferencias.append(
+                f'Item {item_id}: estado {estado!r} préstamo {actual} '
+                f'(esperado {estado_esperado!r} préstamo {esperado})'
+            )
+
+    guardado = {
+        r.descripcion: {campo: getattr(r, campo) for campo in ResumenInventario.CAMPOS.values()}
+        for r in ResumenInventario.objects.all()
+    }
+    vacio = dict.fromkeys(ResumenInventario.CAMPOS.values(), 0)
+    real = conteo_real()
+    for descripcion in sorted(set(guardado) | set(real)):
+        if guardado.get(descripcion, vacio) != real.get(descripcion, vacio):
+            diferencias.append(
+                f'Resumen {descripcion!r}: {guardado.get(descripcion, vacio)} '
+                f'(esperado {real.get(descripcion, vacio)})'
+            )
+    return diferencias
+
+
+@transaction.atomic
+def reconstruir():
+    """Recalcula los punteros de préstamo activo y los contadores desde cero."""
+    activos = prestamos_activos()
+    Item.objects.filter(estado_admin=Item.PRESTADO).exclude(pk__in=list(activos)).update(
+        estado_admin=Item.DISPONIBLE
+    )
+    Item.objects.exclude(pk__in=list(activos)).filter(prestamo_actual__isnull=False).update(
+        prestamo_actual=None
+    )
+    pendientes = list(
+        Item.objects.filter(pk__in=list(activos)).only('id', 'estado_admin', 'prestamo_actual')
+    )
+    for item in pendientes:
+        item.estado_admin = Item.PRESTADO
+        item.prestamo_actual_id = activos[item.pk]
+    Item.objects.bulk_update(pendientes, ['estado_admin', 'prestamo_actual'], batch_size=500)
+
+    ResumenInventario.objects.all().delete()
+    ResumenInventario.objects.bulk_create(
+        [
+            ResumenInventario(descripcion=descripcion, **campos)
+            for descripcion, campos in conteo_real().items()
+        ],
+        batch_size=500,
+    )
@@ -0,0 +1,133 @@
+"""Registro masivo de items (endpoint items/bulk/ y comando import_items).
+
+Las filas se validan por lotes; cada lote revisa los seriales contra el
+índice único con una sola consulta e inserta con ``bulk_create``. Todo va en
+una transacción, pero una fila inválida no aborta el resto: se reporta con su
+número de fila.
+"""
+import csv
+import uuid
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .disponibilidad import ajustar_contadores, contar
+from .models import Item
+
+TAMANO_LOTE = 500
+MAXIMO_ERRORES_REPORTADOS = 1000
+
+
+class ItemImportacionSerializer(serializers.ModelSerializer):
+    # Sin UniqueValidator: la unicidad se revisa por lote, no fila a fila.
+    serial = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    estado_admin = serializers.ChoiceField(
+        choices=[Item.DISPONIBLE, Item.NO_PRESTAR], default=Item.DISPONIBLE
+    )
+    file_path = serializers.CharField(
+        source='image_r2', required=False, allow_blank=True, max_length=500
+    )
+    cantidad = serializers.IntegerField(min_value=1, max_value=1000, default=1)
+
+    class Meta:
+        model = Item
+        fields = [
+            'serial',
+            'descripcion',
+            'estado_fisico',
+            'estado_admin',
+            'observacion',
+            'file_path',
+            'cantidad',
+        ]
+
+    def validate(self, datos):
+        if datos.get('serial') and datos['cantidad'] > 1:
+            raise serializers.ValidationError(
+                {'cantidad': 'Con un serial explícito solo se puede registrar un item'}
+            )
+        return datos
+
+
+@dataclass
+class ResultadoImportacion:
+    creados: list = field(default_factory=list)
+    errores: list = field(default_factory=list)
+    total_errores: int = 0
+
+    def agregar_error(self, fila, errores):
+        self.total_errores += 1
+        if len(self.errores) < MAXIMO_ERRORES_REPORTADOS:
+            self.errores.append({'fila': fila, 'errores': errores})
+
+    def como_dict(self):
+        return {
+            'creados': len(self.creados),
+            'ids': self.creados,
+            'errores': self.errores,
+            'total_errores': self.total_errores,
+        }
+
+
+def generar_serial():
+    return f'IOT-{uuid.uuid4().hex[:10].upper()}'
+
+
+def _lotes(iterable, tamano):
+    iterador = iter(iterable)
+    while lote := list(islice(iterador, tamano)):
+        yield lote
+
+
+def importar_items(filas, tamano_lote=TAMANO_LOTE):
+    """Registra los items de ``filas`` (iterable de dicts) y devuelve el resultado."""
+    resultado = ResultadoImportacion()
+    vistos = set()
+    with transaction.atomic():
+        for lote in _lotes(enumerate(filas, start=1), tamano_lote):
+            candidatos = []
+            for numero, fila in lote:
+                serializer = ItemImportacionSerializer(data=fila)
+                if not serializer.is_valid():
+                    resultado.agregar_error(numero, serializer.errors)
+                    continue
+                datos = dict(serializer.validated_data)
+                cantidad = datos.pop('cantidad')
+                if datos.get('serial'):
+                    candidatos.append((numero, datos))
+                else:
+                    candidatos.extend(
+                        (numero, {**datos, 'serial': generar_serial()}) for _ in range(cantidad)
+                    )
+
+            existentes = set(
+                Item.objects.filter(
+                    serial__in=[datos['serial'] for _, datos in candidatos]
+                ).values_list('serial', flat=True)
+            )
+            nuevos = []
+            for numero, datos in candidatos:
+                if datos['serial'] in existentes or datos['serial'] in vistos:
+                    resultado.agregar_error(
+                        numero, {'serial': [f'El serial {datos["serial"]} ya está registrado']}
+                    )
+                    continue
+                vistos.add(datos['serial'])
+                nuevos.append(Item(**datos))
+            resultado.errores.sort(key=lambda error: error['fila'])
+            resultado.creados.extend(item.pk for item in Item.objects.bulk_create(nuevos))
+            # bulk_create no emite post_save: los contadores se ajustan por lote.
+            ajustar_contadores(contar(nuevos))
+    return resultado
+
+
+def filas_csv(lineas):
+    """Convierte un iterable de líneas (str o bytes) de un CSV en dicts.
+
+    Las celdas vacías se omiten para que apliquen los valores por defecto.
+    """
+    texto = (l.decode('utf-8-sig') if isinstance(l, bytes) else l for l in lineas)
+    for fila in csv.DictReader(texto):
+        yield {k.strip(): v.strip() for k, v in fila.items() if k and v not in (None, '')}
@@ -0,0 +1,102 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from inventario.models import Item, Prestamo
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide la latencia de las consultas de préstamos (activos, vencidos, por '
+        'vencer, barrido) con volúmenes crecientes de historial. Los datos se '
+        'crean dentro de una transacción que se revierte al terminar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prestamos',
+            type=int,
+            nargs='+',
+            default=[1_000, 10_000, 100_000],
+            help='Volúmenes de préstamos históricos a medir.',
+        )
+        parser.add_argument('--repeticiones', type=int, default=20)
+
+    def medir(self, consulta, repeticiones):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            consulta()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(tiempos)
+
+    def sembrar(self, items, desde, hasta, ahora):
+        # Como en producción: ~96 % del historial devuelto, con fechas repartidas en
+        # el último año; ~3 % prestado alrededor de hoy y ~1 % ya marcado vencido.
+        prestamos = []
+        for i in range(desde, hasta):
+            tipo = i % 100
+            if tipo < 3:
+                estado = Prestamo.PRESTADO
+                fecha_limite = ahora + timedelta(hours=(i % 240) - 24)
+            elif tipo == 3:
+                estado = Prestamo.VENCIDO
+                fecha_limite = ahora - timedelta(days=1 + i % 30)
+            else:
+                estado = Prestamo.DEVUELTO
+                fecha_limite = ahora - timedelta(days=i % 365, hours=i % 24)
+            prestamos.append(
+                Prestamo(
+                    item=items[i % len(items)],
+                    nombre_persona=f'Persona {i}',
+                    cedula=str(i),
+                    fecha_limite=fecha_limite,
+                    fecha_devolucion=(
+                        fecha_limite - timedelta(hours=i % 48)
+                        if estado == Prestamo.DEVUELTO
+                        else None
+                    ),
+                    estado=estado,
+                )
+            )
+        Prestamo.objects.bulk_create(prestamos, batch_size=2000)
+
+    def handle(self, *args, **options):
+        repeticiones = options['repeticiones']
+        ahora = timezone.now()
+        consultas = {
+            'activos': lambda: list(Prestamo.objects.activos()[:100]),
+            'vencidos': lambda: list(Prestamo.objects.vencidos(ahora)[:100]),
+            'por_vencer': lambda: list(
+                Prestamo.objects.por_vencer(ahora).order_by('fecha_limite')[:100]
+            ),
+            'barrido': lambda: Prestamo.objects.marcar_vencidos(ahora),
+        }
+        self.stdout.write('prestamos  ' + '  '.join(f'{n:>12}' for n in consultas))
+        try:
+            with transaction.atomic():
+                items = Item.objects.bulk_create(
+                    Item(serial=f'BENCH-{i}', descripcion='Benchmark') for i in range(1000)
+                )
+                sembrados = 0
+                for total in sorted(options['prestamos']):
+                    self.sembrar(items, sembrados, total, ahora)
+                    sembrados = total
+                    if connection.vendor == 'sqlite':
+                        with connection.cursor() as cursor:
+                            cursor.execute('ANALYZE')
+                    medianas = [self.medir(c, repeticiones) for c in consultas.values()]
+                    self.stdout.write(
+                        f'{total:>9}  ' + '  '.join(f'{m:>10.2f}ms' for m in medianas)
+                    )
+                raise Rollback
+        except Rollback:
+            pass
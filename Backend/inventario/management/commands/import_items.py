@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventario.importacion import TAMANO_LOTE, filas_csv, importar_items
+
+
+def filas_json(archivo):
+    """Arreglo JSON o JSON Lines (un objeto por línea, leído en streaming)."""
+    inicio = archivo.read(1)
+    while inicio.isspace():
+        inicio = archivo.read(1)
+    if inicio == '[':
+        archivo.seek(0)
+        yield from json.load(archivo)
+        return
+    archivo.seek(0)
+    for linea in archivo:
+        if linea.strip():
+            yield json.loads(linea)
+
+
+class Command(BaseCommand):
+    help = 'Registra items del inventario desde un archivo CSV, JSON o JSON Lines.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo a importar.')
+        parser.add_argument(
+            '--formato',
+            choices=['csv', 'json'],
+            help='Por defecto se deduce de la extensión (.csv, .json, .jsonl).',
+        )
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help='Filas por lote.')
+
+    def handle(self, *args, **options):
+        ruta = Path(options['archivo'])
+        if not ruta.is_file():
+            raise CommandError(f'No existe el archivo {ruta}')
+        formato = options['formato'] or ('csv' if ruta.suffix.lower() == '.csv' else 'json')
+
+        with ruta.open(encoding='utf-8-sig', newline='') as archivo:
+            filas = filas_csv(archivo) if formato == 'csv' else filas_json(archivo)
+            resultado = importar_items(filas, tamano_lote=options['lote'])
+
+        for error in resultado.errores:
+            self.stderr.write(f'Fila {error["fila"]}: {error["errores"]}')
+        if resultado.total_errores > len(resultado.errores):
+            self.stderr.write(f'... y {resultado.total_errores - len(resultado.errores)} errores más')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{len(resultado.creados)} items registrados, {resultado.total_errores} filas con error.'
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventario.disponibilidad import reconstruir, revisar
+
+
+class Command(BaseCommand):
+    help = (
+        'Revisa el préstamo activo de cada item y los contadores de ResumenInventario '
+        'contra la tabla de préstamos, y los reconstruye.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Solo reporta diferencias; termina con error si las hay.',
+        )
+
+    def handle(self, *args, **options):
+        diferencias = revisar()
+        for diferencia in diferencias:
+            self.stderr.write(diferencia)
+        if options['check']:
+            if diferencias:
+                raise CommandError(f'{len(diferencias)} diferencias encontradas.')
+            self.stdout.write(self.style.SUCCESS('Disponibilidad consistente.'))
+            return
+        reconstruir()
+        self.stdout.write(
+            self.style.SUCCESS(f'Disponibilidad reconstruida; {len(diferencias)} diferencias corregidas.')
+        )
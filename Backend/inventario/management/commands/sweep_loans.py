@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventario.models import Prestamo
+
+
+class Command(BaseCommand):
+    help = (
+        'Marca como vencidos, con un solo UPDATE, los préstamos cuya fecha límite '
+        'ya pasó. Pensado para cron; con --intervalo se queda corriendo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=0,
+            help='Segundos entre pasadas; 0 (por defecto) hace una sola pasada.',
+        )
+
+    def handle(self, *args, **options):
+        intervalo = options['intervalo']
+        while True:
+            vencidos = Prestamo.objects.marcar_vencidos()
+            self.stdout.write(f'{vencidos} préstamos marcados como vencidos.')
+            if intervalo <= 0:
+                return
+            time.sleep(intervalo)
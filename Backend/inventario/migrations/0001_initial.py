@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Item',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('serial', models.CharField(max_length=100, unique=True)),
+                ('descripcion', models.CharField(max_length=255)),
+                ('estado_fisico', models.CharField(default='Bueno', max_length=50)),
+                ('estado_admin', models.CharField(choices=[('Disponible', 'Disponible'), ('Prestado', 'Prestado'), ('No prestar', 'No prestar')], db_index=True, default='Disponible', max_length=20)),
+                ('fecha_registro', models.DateTimeField(auto_now_add=True)),
+                ('observacion', models.TextField(blank=True)),
+                ('image_r2', models.CharField(blank=True, max_length=500)),
+            ],
+            options={
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Prestamo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre_persona', models.CharField(max_length=150)),
+                ('cedula', models.CharField(max_length=30)),
+                ('telefono', models.CharField(blank=True, max_length=30)),
+                ('correo', models.EmailField(blank=True, max_length=254)),
+                ('direccion', models.CharField(blank=True, max_length=255)),
+                ('fecha_prestamo', models.DateTimeField(auto_now_add=True)),
+                ('fecha_limite', models.DateTimeField()),
+                ('fecha_devolucion', models.DateTimeField(blank=True, null=True)),
+                ('estado', models.CharField(choices=[('Prestado', 'Prestado'), ('Devuelto', 'Devuelto')], db_index=True, default='Prestado', max_length=20)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='prestamos', to='inventario.item')),
+            ],
+            options={
+                'ordering': ['-id'],
+            },
+        ),
+    ]
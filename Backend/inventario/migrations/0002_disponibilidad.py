@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+CAMPOS = {'Disponible': 'disponibles', 'Prestado': 'prestados', 'No prestar': 'no_prestar'}
+
+
+def llenar_disponibilidad(apps, schema_editor):
+    Item = apps.get_model('inventario', 'Item')
+    Prestamo = apps.get_model('inventario', 'Prestamo')
+    ResumenInventario = apps.get_model('inventario', 'ResumenInventario')
+
+    activos = (
+        Prestamo.objects.filter(estado='Prestado')
+        .order_by()
+        .values('item_id')
+        .annotate(ultimo=Max('id'))
+        .values_list('item_id', 'ultimo')
+    )
+    for item_id, prestamo_id in activos:
+        Item.objects.filter(pk=item_id).update(prestamo_actual_id=prestamo_id)
+
+    resumen = {}
+    filas = Item.objects.order_by().values('descripcion', 'estado_admin').annotate(n=Count('id'))
+    for fila in filas:
+        resumen.setdefault(fila['descripcion'], {})[CAMPOS[fila['estado_admin']]] = fila['n']
+    ResumenInventario.objects.bulk_create(
+        [ResumenInventario(descripcion=d, **campos) for d, campos in resumen.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenInventario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('descripcion', models.CharField(max_length=255, unique=True)),
+                ('disponibles', models.IntegerField(default=0)),
+                ('prestados', models.IntegerField(default=0)),
+                ('no_prestar', models.IntegerField(default=0)),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['descripcion'],
+            },
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='prestamo_actual',
+            field=models.OneToOneField(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='inventario.prestamo'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['estado_admin', '-id'], name='item_estado_id'),
+        ),
+        migrations.RunPython(llenar_disponibilidad, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0002_disponibilidad'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='prestamo',
+            name='estado',
+            field=models.CharField(choices=[('Prestado', 'Prestado'), ('Vencido', 'Vencido'), ('Devuelto', 'Devuelto')], default='Prestado', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='prestamo',
+            index=models.Index(fields=['estado', 'fecha_limite'], name='prestamo_estado_limite'),
+        ),
+    ]
@@ -0,0 +1,173 @@
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+
+
+class Item(models.Model):
+    """Componente electrónico del inventario del laboratorio."""
+
+    DISPONIBLE = 'Disponible'
+    PRESTADO = 'Prestado'
+    NO_PRESTAR = 'No prestar'
+    ESTADOS_ADMIN = [
+        (DISPONIBLE, DISPONIBLE),
+        (PRESTADO, PRESTADO),
+        (NO_PRESTAR, NO_PRESTAR),
+    ]
+
+    serial = models.CharField(max_length=100, unique=True)
+    descripcion = models.CharField(max_length=255)
+    estado_fisico = models.CharField(max_length=50, default='Bueno')
+    estado_admin = models.CharField(
+        max_length=20, choices=ESTADOS_ADMIN, default=DISPONIBLE, db_index=True
+    )
+    fecha_registro = models.DateTimeField(auto_now_add=True)
+    observacion = models.TextField(blank=True)
+    image_r2 = models.CharField(max_length=500, blank=True)
+    # Derivados WebP de image_r2, generados por informacion.derivados.
+    image_thumb = models.CharField(max_length=500, blank=True, editable=False)
+    image_medium = models.CharField(max_length=500, blank=True, editable=False)
+    # Préstamo activo del item; se mantiene junto con estado_admin al prestar y devolver.
+    prestamo_actual = models.OneToOneField(
+        'Prestamo',
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name='+',
+    )
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['estado_admin', '-id'], name='item_estado_id'),
+        ]
+
+    def __str__(self):
+        return f'{self.serial} - {self.descripcion}'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Estado con el que el item cuenta en ResumenInventario (ver signals.py).
+        datos = instance.__dict__
+        if 'descripcion' in datos and 'estado_admin' in datos:
+            instance._contado = (instance.descripcion, instance.estado_admin)
+        return instance
+
+
+class PrestamoQuerySet(models.QuerySet):
+    """Consultas por estado y fecha límite, servidas por el índice (estado, fecha_limite).
+
+    Casi todo el historial está devuelto, pero las estadísticas de SQLite
+    (``ANALYZE``) solo saben que ``estado`` tiene pocos valores: con ``estado IN
+    (...)`` o un OR entre estados, y ``ORDER BY id``, eligen recorrer la tabla
+    completa. Por eso activos y vencidos buscan los ids de cada estado por
+    separado en el índice (UNION ALL) y luego leen solo esas filas por llave.
+    """
+
+    def _por_ids(self, *condiciones):
+        partes = [
+            self.model._default_manager.filter(condicion).order_by().values('pk')
+            for condicion in condiciones
+        ]
+        return self.filter(pk__in=partes[0].union(*partes[1:], all=True))
+
+    def activos(self):
+        return self._por_ids(
+            models.Q(estado=Prestamo.PRESTADO), models.Q(estado=Prestamo.VENCIDO)
+        )
+
+    def devueltos(self):
+        return self.filter(estado=Prestamo.DEVUELTO)
+
+    def vencidos(self, ahora=None):
+        # Incluye los que vencieron desde la última pasada del barrido.
+        ahora = ahora or timezone.now()
+        return self._por_ids(
+            models.Q(estado=Prestamo.VENCIDO),
+            models.Q(estado=Prestamo.PRESTADO, fecha_limite__lt=ahora),
+        )
+
+    def por_vencer(self, ahora=None, horas=48):
+        ahora = ahora or timezone.now()
+        return self.filter(
+            estado=Prestamo.PRESTADO,
+            fecha_limite__gte=ahora,
+            fecha_limite__lt=ahora + timedelta(hours=horas),
+        )
+
+    def marcar_vencidos(self, ahora=None):
+        """Pasa a Vencido los préstamos cuya fecha límite ya pasó, en un solo UPDATE."""
+        ahora = ahora or timezone.now()
+        return self.filter(estado=Prestamo.PRESTADO, fecha_limite__lt=ahora).update(
+            estado=Prestamo.VENCIDO
+        )
+
+
+class Prestamo(models.Model):
+    """Préstamo de un item a una persona."""
+
+    PRESTADO = 'Prestado'
+    VENCIDO = 'Vencido'
+    DEVUELTO = 'Devuelto'
+    ESTADOS = [
+        (PRESTADO, PRESTADO),
+        (VENCIDO, VENCIDO),
+        (DEVUELTO, DEVUELTO),
+    ]
+    # Estados en los que el item sigue en manos de la persona.
+    ACTIVOS = (PRESTADO, VENCIDO)
+
+    item = models.ForeignKey(Item, on_delete=models.PROTECT, related_name='prestamos')
+    nombre_persona = models.CharField(max_length=150)
+    cedula = models.CharField(max_length=30)
+    telefono = models.CharField(max_length=30, blank=True)
+    correo = models.EmailField(blank=True)
+    direccion = models.CharField(max_length=255, blank=True)
+    fecha_prestamo = models.DateTimeField(auto_now_add=True)
+    fecha_limite = models.DateTimeField()
+    fecha_devolucion = models.DateTimeField(null=True, blank=True)
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PRESTADO)
+
+    objects = PrestamoQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['estado', 'fecha_limite'], name='prestamo_estado_limite'),
+        ]
+
+    def __str__(self):
+        return f'{self.item} -> {self.nombre_persona}'
+
+
+class ResumenInventario(models.Model):
+    """Contadores de items por descripción y estado administrativo.
+
+    Se actualizan en la misma transacción que cambia el estado de un item;
+    ``manage.py rebuild_availability`` los recalcula desde la tabla de items.
+    """
+
+    descripcion = models.CharField(max_length=255, unique=True)
+    disponibles = models.IntegerField(default=0)
+    prestados = models.IntegerField(default=0)
+    no_prestar = models.IntegerField(default=0)
+    actualizado_en = models.DateTimeField(auto_now=True)
+
+    CAMPOS = {
+        Item.DISPONIBLE: 'disponibles',
+        Item.PRESTADO: 'prestados',
+        Item.NO_PRESTAR: 'no_prestar',
+    }
+
+    class Meta:
+        ordering = ['descripcion']
+
+    def __str__(self):
+        return self.descripcion
+
+    @property
+    def total(self):
+        return self.disponibles + self.prestados + self.no_prestar
@@ -0,0 +1,75 @@
+from rest_framework import serializers
+
+from ioticsemillero.serializers import CamposParcialesMixin
+
+from .models import Item, Prestamo, ResumenInventario
+
+
+class ItemSerializer(CamposParcialesMixin, serializers.ModelSerializer):
+    # El frontend envía la ruta de la imagen en R2 como file_path.
+    file_path = serializers.CharField(
+        source='image_r2', write_only=True, required=False, allow_blank=True
+    )
+
+    class Meta:
+        model = Item
+        fields = [
+            'id',
+            'serial',
+            'descripcion',
+            'estado_fisico',
+            'estado_admin',
+            'fecha_registro',
+            'observacion',
+            'image_r2',
+            'image_thumb',
+            'image_medium',
+            'file_path',
+        ]
+        # estado_admin sigue a los préstamos (prestar, devolver) y a activar/desactivar.
+        read_only_fields = [
+            'serial',
+            'fecha_registro',
+            'estado_admin',
+            'image_r2',
+            'image_thumb',
+            'image_medium',
+        ]
+
+
+class PrestamoSerializer(CamposParcialesMixin, serializers.ModelSerializer):
+    item = ItemSerializer(read_only=True)
+    item_id = serializers.PrimaryKeyRelatedField(
+        source='item', queryset=Item.objects.all(), write_only=True
+    )
+
+    class Meta:
+        model = Prestamo
+        fields = [
+            'id',
+            'item',
+            'item_id',
+            'nombre_persona',
+            'cedula',
+            'telefono',
+            'correo',
+            'direccion',
+            'fecha_prestamo',
+            'fecha_limite',
+            'fecha_devolucion',
+            'estado',
+        ]
+        read_only_fields = ['fecha_prestamo', 'fecha_devolucion', 'estado']
+
+    def validate_item_id(self, item):
+        if item.estado_admin != Item.DISPONIBLE:
+            raise serializers.ValidationError('El item no está disponible para préstamo')
+        return item
+
+
+class ResumenInventarioSerializer(serializers.ModelSerializer):
+    total = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = ResumenInventario
+        fields = ['descripcion', 'disponibles', 'prestados', 'no_prestar', 'total']
@@ -0,0 +1,47 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from informacion import derivados
+
+from .disponibilidad import ajustar_contadores
+from .models import Item
+
+CAMPOS_CONTADOS = {'descripcion', 'estado_admin'}
+
+
+@receiver(post_save, sender=Item)
+def contar_item(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not CAMPOS_CONTADOS & set(update_fields):
+        return
+    anterior = getattr(instance, '_contado', None)
+    if not created and anterior is None:
+        # Instancia cargada sin esos campos: no se puede saber qué cambió.
+        return
+    actual = (instance.descripcion, instance.estado_admin)
+    if actual == anterior:
+        return
+    cambios = Counter({actual: 1})
+    if anterior is not None:
+        cambios[anterior] -= 1
+    ajustar_contadores(cambios)
+    instance._contado = actual
+
+
+@receiver(post_delete, sender=Item)
+def descontar_item(sender, instance, **kwargs):
+    anterior = getattr(instance, '_contado', None)
+    ajustar_contadores(
+        Counter({anterior or (instance.descripcion, instance.estado_admin): -1})
+    )
+
+
+@receiver(post_save, sender=Item)
+def generar_derivados(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Aquí y no en informacion: un proceso solo con inventario también los genera.
+    if raw or (update_fields is not None and 'image_r2' not in update_fields):
+        return
+    derivados.programar(instance)
@@ -0,0 +1,10 @@
+"""Trabajos en segundo plano del inventario (ver trabajos/cola.py)."""
+from trabajos.cola import tarea
+
+from .models import Prestamo
+
+
+@tarea(max_intentos=3, cada=300)
+def marcar_vencidos():
+    """Cada 5 minutos, lo que hace ``manage.py sweep_loans``."""
+    return {'vencidos': Prestamo.objects.marcar_vencidos()}
@@ -0,0 +1,460 @@
+import csv
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ayudas_pruebas import iniciar_sesion
+from ioticsemillero.pagination import PaginacionPorCursor
+
+from .importacion import importar_items
+from .models import Item, Prestamo, ResumenInventario
+from .views import ItemViewSet
+
+
+def crear_items(cantidad, **extra):
+    return Item.objects.bulk_create(
+        Item(serial=f'SN-{i:04d}', descripcion=f'Sensor {i}', **extra)
+        for i in range(cantidad)
+    )
+
+
+class ListasPaginadasTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        iniciar_sesion(self.client)
+
+    def test_items_paginados_por_cursor(self):
+        crear_items(5)
+
+        primera = self.client.get('/api/inventario/items/?page_size=2')
+
+        self.assertEqual(primera.status_code, 200)
+        self.assertEqual(len(primera.data), 2)
+        self.assertIn('rel="next"', primera['Link'])
+        siguiente = primera['Link'].split('<', 1)[1].split('>', 1)[0]
+        segunda = self.client.get(siguiente)
+        ids = [i['id'] for i in primera.data] + [i['id'] for i in segunda.data]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(set(ids)), 4)
+
+    @mock.patch.object(PaginacionPorCursor, 'page_size', 2)
+    def test_sin_cursor_ni_page_size_responde_la_lista_completa(self):
+        crear_items(5)
+
+        completa = self.client.get('/api/inventario/items/')
+        paginada = self.client.get('/api/inventario/items/?cursor=')
+
+        self.assertEqual(len(completa.data), 5)
+        self.assertNotIn('Link', completa)
+        ids = [i['id'] for i in completa.data]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(paginada.data), 2)
+        self.assertIn('rel="next"', paginada['Link'])
+
+    def test_filtro_por_estado_en_sql(self):
+        crear_items(3)
+        Item.objects.create(serial='X-1', descripcion='Dañado', estado_admin=Item.NO_PRESTAR)
+
+        respuesta = self.client.get('/api/inventario/items/?estado=No prestar')
+
+        self.assertEqual([i['serial'] for i in respuesta.data], ['X-1'])
+
+    def test_filtro_con_valor_invalido_responde_400(self):
+        for url in ('/api/inventario/prestamos/history/', '/api/inventario/prestamos/active/'):
+            respuesta = self.client.get(url, {'item': 'abc'})
+            self.assertEqual(respuesta.status_code, 400)
+            self.assertIn('item', respuesta.data)
+        historial = '/api/inventario/prestamos/history/'
+        self.assertEqual(self.client.get(historial, {'item': '1,2'}).status_code, 200)
+        self.assertEqual(self.client.get(historial, {'item': '1,x'}).status_code, 400)
+
+    def test_campos_parciales(self):
+        crear_items(2)
+
+        respuesta = self.client.get('/api/inventario/items/?fields=id,serial')
+
+        self.assertEqual(set(respuesta.data[0]), {'id', 'serial'})
+
+    def test_historial_paginado_con_item_anidado(self):
+        items = crear_items(3)
+        limite = timezone.now() + timedelta(days=2)
+        for item in items:
+            Prestamo.objects.create(
+                item=item, nombre_persona='Luis', cedula='123', fecha_limite=limite
+            )
+
+        with self.assertNumQueries(1):
+            respuesta = self.client.get('/api/inventario/prestamos/history/?page_size=2')
+
+        self.assertEqual(len(respuesta.data), 2)
+        self.assertEqual(respuesta.data[0]['item']['id'], items[-1].id)
+
+
+class PrestamoTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        iniciar_sesion(self.client)
+        self.item = Item.objects.create(serial='SN-1', descripcion='Arduino')
+
+    def crear_prestamo(self):
+        return self.client.post(
+            '/api/inventario/prestamos/',
+            {
+                'item_id': self.item.id,
+                'nombre_persona': 'Luis',
+                'cedula': '123',
+                'fecha_limite': (timezone.now() + timedelta(days=3)).isoformat(),
+            },
+            format='json',
+        )
+
+    def test_prestar_y_devolver(self):
+        creado = self.crear_prestamo()
+        self.assertEqual(creado.status_code, 201)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.estado_admin, Item.PRESTADO)
+
+        devuelto = self.client.patch(f'/api/inventario/prestamos/{creado.data["id"]}/')
+
+        self.assertEqual(devuelto.data['estado'], Prestamo.DEVUELTO)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.estado_admin, Item.DISPONIBLE)
+
+    def test_no_se_presta_un_item_prestado(self):
+        self.crear_prestamo()
+
+        self.assertEqual(self.crear_prestamo().status_code, 400)
+
+    def test_editar_no_cambia_el_estado_administrativo(self):
+        self.crear_prestamo()
+        url = f'/api/inventario/items/{self.item.id}/'
+
+        editado = self.client.put(
+            url,
+            {'descripcion': 'Arduino UNO', 'estado_fisico': 'Bueno', 'estado_admin': 'Disponible'},
+            format='json',
+        )
+
+        self.assertEqual(editado.status_code, 200)
+        self.assertEqual(editado.data['estado_admin'], Item.PRESTADO)
+        self.assertEqual(self.client.patch(f'{url}activate/').status_code, 400)
+        self.item.refresh_from_db()
+        self.assertEqual((self.item.descripcion, self.item.estado_admin), ('Arduino UNO', Item.PRESTADO))
+
+    def test_desactivar_y_activar(self):
+        url = f'/api/inventario/items/{self.item.id}/'
+
+        self.assertEqual(self.client.patch(url).data['estado_admin'], Item.NO_PRESTAR)
+        self.assertEqual(self.crear_prestamo().status_code, 400)
+        self.assertEqual(self.client.patch(f'{url}activate/').data['estado_admin'], Item.DISPONIBLE)
+        self.assertEqual(self.crear_prestamo().status_code, 201)
+
+    def test_desactivar_revisa_el_estado_bajo_bloqueo(self):
+        # El item se leyó disponible justo antes de que se registrara el préstamo.
+        leido = Item.objects.get(pk=self.item.pk)
+        self.assertEqual(self.crear_prestamo().status_code, 201)
+        url = f'/api/inventario/items/{self.item.id}/'
+
+        with mock.patch.object(ItemViewSet, 'get_object', return_value=leido):
+            self.assertEqual(self.client.patch(url).status_code, 400)
+            self.assertEqual(self.client.patch(f'{url}activate/').status_code, 400)
+
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.estado_admin, Item.PRESTADO)
+        self.assertIsNotNone(self.item.prestamo_actual_id)
+
+
+class EstadoPrestamosTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        iniciar_sesion(self.client)
+        self.ahora = timezone.now()
+        items = crear_items(4)
+        self.vencido, self.por_vencer, self.lejano, self.devuelto = [
+            Prestamo.objects.create(
+                item=item,
+                nombre_persona='Luis',
+                cedula='123',
+                fecha_limite=self.ahora + timedelta(hours=horas),
+                estado=estado,
+            )
+            for item, horas, estado in zip(
+                items,
+                (-5, 20, 100, -50),
+                (Prestamo.PRESTADO, Prestamo.PRESTADO, Prestamo.PRESTADO, Prestamo.DEVUELTO),
+            )
+        ]
+
+    def ids(self, url):
+        return [p['id'] for p in self.client.get(url).data]
+
+    def test_vencidos_y_por_vencer(self):
+        self.assertEqual(self.ids('/api/inventario/prestamos/overdue/'), [self.vencido.id])
+        self.assertEqual(self.ids('/api/inventario/prestamos/por-vencer/'), [self.por_vencer.id])
+
+    def test_barrido_en_un_update(self):
+        with self.assertNumQueries(1):
+            call_command('sweep_loans', stdout=StringIO())
+
+        self.vencido.refresh_from_db()
+        self.assertEqual(self.vencido.estado, Prestamo.VENCIDO)
+        self.assertEqual(self.ids('/api/inventario/prestamos/overdue/'), [self.vencido.id])
+        self.assertEqual(len(self.ids('/api/inventario/prestamos/active/')), 3)
+
+    def test_un_vencido_se_puede_devolver(self):
+        Prestamo.objects.marcar_vencidos()
+
+        respuesta = self.client.patch(f'/api/inventario/prestamos/{self.vencido.id}/')
+
+        self.assertEqual(respuesta.data['estado'], Prestamo.DEVUELTO)
+
+    def test_consultas_usan_el_indice(self):
+        for consulta in (Prestamo.objects.vencidos(), Prestamo.objects.por_vencer()):
+            self.assertIn('prestamo_estado_limite', consulta.explain())
+
+    def test_sin_recorrer_la_tabla_con_historial_devuelto(self):
+        items = list(Item.objects.all())
+        Prestamo.objects.bulk_create(
+            Prestamo(
+                item=items[i % len(items)],
+                nombre_persona='Luis',
+                cedula=str(i),
+                fecha_limite=self.ahora - timedelta(days=i % 300),
+                estado=Prestamo.DEVUELTO,
+            )
+            for i in range(2000)
+        )
+        if connection.vendor == 'sqlite':
+            # Con estadísticas SQLite cree que cada estado es la mitad de la tabla.
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        for consulta in (Prestamo.objects.activos(), Prestamo.objects.vencidos()):
+            plan = consulta.select_related('item').order_by('-id')[:100].explain()
+            self.assertIn('prestamo_estado_limite', plan)
+            self.assertNotRegex(plan, r'SCAN (inventario_prestamo|"inventario_prestamo")\b')
+        self.assertEqual(self.ids('/api/inventario/prestamos/overdue/'), [self.vencido.id])
+        self.assertEqual(len(self.ids('/api/inventario/prestamos/active/')), 3)
+
+
+class ExportacionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        iniciar_sesion(self.client)
+        self.items = crear_items(3)
+        Item.objects.filter(pk=self.items[0].pk).update(estado_admin=Item.NO_PRESTAR)
+        Prestamo.objects.create(
+            item=self.items[1],
+            nombre_persona='Núñez',
+            cedula='123',
+            fecha_limite=timezone.now() + timedelta(days=1),
+        )
+
+    def contenido(self, respuesta):
+        self.assertTrue(respuesta.streaming)
+        return b''.join(respuesta.streaming_content).decode('utf-8-sig')
+
+    def test_items_csv_con_filtros(self):
+        respuesta = self.client.get('/api/inventario/items/export/?estado=Disponible')
+
+        self.assertEqual(respuesta['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="items-', respuesta['Content-Disposition'])
+        lineas = self.contenido(respuesta).splitlines()
+        self.assertEqual(lineas[0].split(',')[:3], ['id', 'serial', 'descripcion'])
+        self.assertEqual([l.split(',')[1] for l in lineas[1:]], ['SN-0002', 'SN-0001'])
+
+    def test_csv_no_exporta_formulas(self):
+        Prestamo.objects.update(nombre_persona='=HYPERLINK("http://x","y")')
+        Item.objects.filter(pk=self.items[1].pk).update(descripcion='-2+3')
+
+        respuesta = self.client.get(
+            '/api/inventario/prestamos/history/export/?fields=item_descripcion,nombre_persona,cedula'
+        )
+
+        filas = list(csv.reader(self.contenido(respuesta).splitlines()))
+        self.assertEqual(filas[1], ["'-2+3", '\'=HYPERLINK("http://x","y")', '123'])
+
+    def test_historial_jsonl_con_campos(self):
+        respuesta = self.client.get(
+            '/api/inventario/prestamos/history/export/?formato=jsonl&fields=item_serial,nombre_persona'
+        )
+
+        filas = [json.loads(l) for l in self.contenido(respuesta).splitlines()]
+        self.assertEqual(filas, [{'item_serial': 'SN-0001', 'nombre_persona': 'Núñez'}])
+
+    def test_formato_invalido(self):
+        respuesta = self.client.get('/api/inventario/items/export/?formato=xml')
+
+        self.assertEqual(respuesta.status_code, 400)
+
+
+class RegistroMasivoTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        iniciar_sesion(self.client)
+        self.url = '/api/inventario/items/bulk/'
+
+    def test_formulario_con_cantidad_responde_el_item(self):
+        respuesta = self.client.post(
+            self.url,
+            {'descripcion': 'Sensor DHT11', 'estado_fisico': 'Bueno', 'cantidad': 3},
+            format='json',
+        )
+
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(respuesta.data['descripcion'], 'Sensor DHT11')
+        self.assertEqual(len(respuesta.data['ids']), 3)
+        self.assertEqual(Item.objects.values('serial').distinct().count(), 3)
+
+    def test_arreglo_reporta_errores_por_fila_sin_abortar(self):
+        Item.objects.create(serial='EXISTE', descripcion='Previo')
+        filas = [
+            {'serial': 'A-1', 'descripcion': 'Arduino'},
+            {'serial': 'EXISTE', 'descripcion': 'Repetido en BD'},
+            {'descripcion': ''},
+            {'serial': 'A-1', 'descripcion': 'Repetido en el archivo'},
+            {'serial': 'A-2', 'descripcion': 'ESP32', 'estado_admin': 'No prestar'},
+        ]
+
+        respuesta = self.client.post(self.url, filas, format='json')
+
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(respuesta.data['creados'], 2)
+        self.assertEqual([e['fila'] for e in respuesta.data['errores']], [2, 3, 4])
+        self.assertEqual(Item.objects.get(serial='A-2').estado_admin, Item.NO_PRESTAR)
+
+    def test_consultas_por_lote_y_no_por_fila(self):
+        filas = [{'serial': f'S-{i}', 'descripcion': 'Resistencia'} for i in range(100)]
+
+        # Por lote: seriales, inserción y contadores (la fila del resumen se
+        # crea la primera vez), más el savepoint del atomic. SQLite parte el
+        # INSERT de 100 filas en dos por su límite de 999 parámetros.
+        with self.assertNumQueries(8):
+            respuesta = self.client.post(self.url, filas, format='json')
+        self.assertEqual(respuesta.data['creados'], 100)
+
+        filas = [{'serial': f'T-{i}', 'descripcion': 'Resistencia'} for i in range(100)]
+        with self.assertNumQueries(8):
+            resultado = importar_items(filas, tamano_lote=50)
+        self.assertEqual(len(resultado.creados), 100)
+
+    def test_csv_en_streaming(self):
+        contenido = 'serial,descripcion,estado_fisico,cantidad\nC-1,Protoboard,Bueno,\n,Jumper,,5\n'
+
+        respuesta = self.client.generic(
+            'POST', self.url, contenido.encode(), content_type='text/csv'
+        )
+
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(respuesta.data['creados'], 6)
+        self.assertEqual(Item.objects.filter(descripcion='Jumper').count(), 5)
+
+    def test_comando_import_items(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = Path(carpeta) / 'kit.jsonl'
+            ruta.write_text(
+                '\n'.join(json.dumps({'descripcion': f'LED {i}'}) for i in range(4)),
+                encoding='utf-8',
+            )
+            salida = StringIO()
+
+            call_command('import_items', str(ruta), stdout=salida, stderr=StringIO())
+
+        self.assertIn('4 items registrados', salida.getvalue())
+        self.assertEqual(Item.objects.count(), 4)
+
+
+class DisponibilidadTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        iniciar_sesion(self.client)
+        importar_items(
+            [{'descripcion': 'Arduino', 'cantidad': 3}, {'descripcion': 'ESP32', 'cantidad': 2}]
+        )
+        self.arduino = Item.objects.filter(descripcion='Arduino').first()
+
+    def resumen(self, descripcion):
+        fila = ResumenInventario.objects.get(descripcion=descripcion)
+        return fila.disponibles, fila.prestados, fila.no_prestar
+
+    def prestar(self, item):
+        return self.client.post(
+            '/api/inventario/prestamos/',
+            {
+                'item_id': item.id,
+                'nombre_persona': 'Luis',
+                'cedula': '123',
+                'fecha_limite': (timezone.now() + timedelta(days=3)).isoformat(),
+            },
+            format='json',
+        )
+
+    def test_contadores_siguen_prestamos_y_devoluciones(self):
+        self.assertEqual(self.resumen('Arduino'), (3, 0, 0))
+
+        prestamo = self.prestar(self.arduino).data
+        self.arduino.refresh_from_db()
+        self.assertEqual(self.arduino.prestamo_actual_id, prestamo['id'])
+        self.assertEqual(self.resumen('Arduino'), (2, 1, 0))
+
+        self.client.patch(f'/api/inventario/prestamos/{prestamo["id"]}/')
+        self.arduino.refresh_from_db()
+        self.assertIsNone(self.arduino.prestamo_actual_id)
+        self.assertEqual(self.resumen('Arduino'), (3, 0, 0))
+
+    def test_contadores_siguen_ediciones_y_borrados(self):
+        self.client.patch(f'/api/inventario/items/{self.arduino.id}/')
+        self.assertEqual(self.resumen('Arduino'), (2, 0, 1))
+
+        item = Item.objects.get(pk=self.arduino.id)
+        item.descripcion = 'ESP32'
+        item.save()
+        self.assertEqual(self.resumen('Arduino'), (2, 0, 0))
+        self.assertEqual(self.resumen('ESP32'), (2, 0, 1))
+
+        item.delete()
+        self.assertEqual(self.resumen('ESP32'), (2, 0, 0))
+
+    def test_reportes_son_una_consulta(self):
+        self.prestar(self.arduino)
+
+        with self.assertNumQueries(1):
+            disponibles = self.client.get('/api/inventario/items/reports/available/')
+        with self.assertNumQueries(1):
+            prestados = self.client.get('/api/inventario/items/reports/loaned/')
+
+        self.assertEqual(len(disponibles.data), 4)
+        self.assertEqual([i['id'] for i in prestados.data], [self.arduino.id])
+
+        resumen = self.client.get('/api/inventario/items/reports/summary/')
+        self.assertEqual(
+            resumen.data[0],
+            {'descripcion': 'Arduino', 'disponibles': 2, 'prestados': 1, 'no_prestar': 0, 'total': 3},
+        )
+
+    def test_rebuild_availability(self):
+        self.prestar(self.arduino)
+        Item.objects.filter(pk=self.arduino.pk).update(
+            estado_admin=Item.DISPONIBLE, prestamo_actual=None
+        )
+        ResumenInventario.objects.filter(descripcion='ESP32').update(disponibles=7)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_availability', '--check', stdout=StringIO(), stderr=StringIO())
+        call_command('rebuild_availability', stdout=StringIO(), stderr=StringIO())
+
+        self.arduino.refresh_from_db()
+        self.assertEqual(self.arduino.estado_admin, Item.PRESTADO)
+        self.assertIsNotNone(self.arduino.prestamo_actual_id)
+        self.assertEqual(self.resumen('Arduino'), (2, 1, 0))
+        self.assertEqual(self.resumen('ESP32'), (2, 0, 0))
+        call_command('rebuild_availability', '--check', stdout=StringIO(), stderr=StringIO())
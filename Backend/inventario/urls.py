@@ -0,0 +1,73 @@
+from django.urls import path
+
+from .views import ItemViewSet, PrestamoViewSet, ResumenInventarioView
+
+urlpatterns = [
+    path('items/', ItemViewSet.as_view({'get': 'list'}), name='item-list'),
+    path('items/export/', ItemViewSet.as_view({'get': 'exportar'}), name='item-exportar'),
+    path('items/bulk/', ItemViewSet.as_view({'post': 'bulk'}), name='item-bulk'),
+    path(
+        'items/reports/available/',
+        ItemViewSet.as_view({'get': 'disponibles'}),
+        name='item-disponibles',
+    ),
+    path(
+        'items/reports/loaned/',
+        ItemViewSet.as_view({'get': 'prestados'}),
+        name='item-prestados',
+    ),
+    path(
+        'items/reports/summary/',
+        ResumenInventarioView.as_view(),
+        name='item-resumen',
+    ),
+    path(
+        'items/<int:pk>/',
+        ItemViewSet.as_view({
+            'get': 'retrieve',
+            'put': 'update',
+            'patch': 'desactivar',
+            'delete': 'destroy',
+        }),
+        name='item-detail',
+    ),
+    path(
+        'items/<int:pk>/activate/',
+        ItemViewSet.as_view({'patch': 'activar'}),
+        name='item-activar',
+    ),
+    path(
+        'items/<int:pk>/images/',
+        ItemViewSet.as_view({'delete': 'eliminar_imagen'}),
+        name='item-imagen',
+    ),
+    path(
+        'items/<int:item_pk>/loans/',
+        PrestamoViewSet.as_view({'get': 'del_item'}),
+        name='item-prestamos',
+    ),
+    path('prestamos/', PrestamoViewSet.as_view({'post': 'create'}), name='prestamo-create'),
+    path('prestamos/history/', PrestamoViewSet.as_view({'get': 'list'}), name='prestamo-list'),
+    path(
+        'prestamos/history/export/',
+        PrestamoViewSet.as_view({'get': 'exportar'}),
+        name='prestamo-exportar',
+    ),
+    path('prestamos/active/', PrestamoViewSet.as_view({'get': 'activos'}), name='prestamo-activos'),
+    path(
+        'prestamos/returned/',
+        PrestamoViewSet.as_view({'get': 'devueltos'}),
+        name='prestamo-devueltos',
+    ),
+    path('prestamos/overdue/', PrestamoViewSet.as_view({'get': 'vencidos'}), name='prestamo-vencidos'),
+    path(
+        'prestamos/por-vencer/',
+        PrestamoViewSet.as_view({'get': 'por_vencer'}),
+        name='prestamo-por-vencer',
+    ),
+    path(
+        'prestamos/<int:pk>/',
+        PrestamoViewSet.as_view({'get': 'retrieve', 'patch': 'devolver'}),
+        name='prestamo-detail',
+    ),
+]
@@ -0,0 +1,210 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import generics, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from usuarios.permisos import escritura
+
+from .exportacion import respuesta_exportacion
+from .importacion import filas_csv, importar_items
+from .models import Item, Prestamo, ResumenInventario
+from .serializers import ItemSerializer, PrestamoSerializer, ResumenInventarioSerializer
+
+
+def exportar(view, columnas, nombre):
+    """Exporta en streaming la lista de la vista, con sus mismos filtros."""
+    queryset = view.filter_queryset(view.get_queryset())
+    respuesta = respuesta_exportacion(view.request, queryset, columnas, nombre)
+    if respuesta is None:
+        return Response(
+            {'formato': 'Use csv o jsonl'}, status=status.HTTP_400_BAD_REQUEST
+        )
+    return respuesta
+
+
+def listar(view, queryset):
+    """Lista filtrada y paginada igual que ``list`` pero sobre otro queryset."""
+    queryset = view.filter_queryset(queryset)
+    pagina = view.paginate_queryset(queryset)
+    if pagina is not None:
+        return view.get_paginated_response(view.get_serializer(pagina, many=True).data)
+    return Response(view.get_serializer(queryset, many=True).data)
+
+
+class ItemViewSet(viewsets.ModelViewSet):
+    queryset = Item.objects.all()
+    serializer_class = ItemSerializer
+    # Ver el inventario basta para prestar; editarlo pide gestionar.
+    permisos_requeridos = escritura('inventario.gestionar', lectura='inventario.prestar')
+    filtros = {
+        'estado': 'estado_admin',
+        'estado_fisico': 'estado_fisico',
+        'serial': 'serial',
+    }
+
+    columnas_exportacion = [
+        'id',
+        'serial',
+        'descripcion',
+        'estado_fisico',
+        'estado_admin',
+        'fecha_registro',
+        'observacion',
+        'image_r2',
+    ]
+
+    def exportar(self, request, *args, **kwargs):
+        return exportar(self, self.columnas_exportacion, 'items')
+
+    def bulk(self, request, *args, **kwargs):
+        """Registro masivo: CSV en streaming, arreglo JSON o un objeto con ``cantidad``."""
+        if request.content_type.startswith('text/csv'):
+            # Se lee el cuerpo línea a línea sin pasar por los parsers de DRF.
+            return self._respuesta_importacion(importar_items(filas_csv(request._request)))
+        if isinstance(request.data, list):
+            return self._respuesta_importacion(importar_items(request.data))
+
+        # Formulario del frontend: un item, posiblemente con varias unidades.
+        resultado = importar_items([request.data])
+        if not resultado.creados:
+            return Response(resultado.errores[0]['errores'], status=status.HTTP_400_BAD_REQUEST)
+        datos = self.get_serializer(Item.objects.get(pk=resultado.creados[0])).data
+        datos['ids'] = resultado.creados
+        return Response(datos, status=status.HTTP_201_CREATED)
+
+    def _respuesta_importacion(self, resultado):
+        estado = status.HTTP_201_CREATED if resultado.creados else status.HTTP_400_BAD_REQUEST
+        return Response(resultado.como_dict(), status=estado)
+
+    def disponibles(self, request, *args, **kwargs):
+        # Índice (estado_admin, -id): lectura indexada, sin cruzar con préstamos.
+        return listar(self, self.get_queryset().filter(estado_admin=Item.DISPONIBLE))
+
+    def prestados(self, request, *args, **kwargs):
+        return listar(self, self.get_queryset().filter(estado_admin=Item.PRESTADO))
+
+    def destroy(self, request, *args, **kwargs):
+        item = self.get_object()
+        if item.prestamos.exists():
+            return Response(
+                {'message': 'El item tiene préstamos registrados; desactívelo en su lugar'},
+                status=status.HTTP_409_CONFLICT,
+            )
+        item.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def _cambiar_estado(self, estado, mensaje):
+        with transaction.atomic():
+            # Bloqueado como en perform_create: un préstamo que se registra a la
+            # vez no puede quedar entre la revisión y el guardado.
+            item = Item.objects.select_for_update().get(pk=self.get_object().pk)
+            if item.estado_admin == Item.PRESTADO:
+                return Response({'message': mensaje}, status=status.HTTP_400_BAD_REQUEST)
+            item.estado_admin = estado
+            item.save(update_fields=['estado_admin'])
+        return Response(self.get_serializer(item).data)
+
+    def desactivar(self, request, *args, **kwargs):
+        return self._cambiar_estado(Item.NO_PRESTAR, 'No se puede desactivar un item prestado')
+
+    def activar(self, request, *args, **kwargs):
+        return self._cambiar_estado(
+            Item.DISPONIBLE, 'El item está prestado; se libera al devolverlo'
+        )
+
+    def eliminar_imagen(self, request, *args, **kwargs):
+        item = self.get_object()
+        item.image_r2 = ''
+        item.save(update_fields=['image_r2'])
+        return Response(self.get_serializer(item).data)
+
+
+class PrestamoViewSet(viewsets.ModelViewSet):
+    queryset = Prestamo.objects.select_related('item')
+    serializer_class = PrestamoSerializer
+    # Datos personales de quien pidió prestado: nada es público.
+    permisos_requeridos = {'*': 'inventario.prestar'}
+    filtros = {
+        'estado': 'estado',
+        'item': 'item_id',
+        'cedula': 'cedula',
+        'correo': 'correo',
+    }
+
+    columnas_exportacion = [
+        'id',
+        'item_id',
+        'item__serial',
+        'item__descripcion',
+        'nombre_persona',
+        'cedula',
+        'telefono',
+        'correo',
+        'direccion',
+        'fecha_prestamo',
+        'fecha_limite',
+        'fecha_devolucion',
+        'estado',
+    ]
+
+    def exportar(self, request, *args, **kwargs):
+        return exportar(self, self.columnas_exportacion, 'prestamos')
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            item = Item.objects.select_for_update().get(pk=serializer.validated_data['item'].pk)
+            if item.estado_admin != Item.DISPONIBLE:
+                raise ValidationError({'item_id': 'El item no está disponible para préstamo'})
+            prestamo = serializer.save(item=item)
+            item.estado_admin = Item.PRESTADO
+            item.prestamo_actual = prestamo
+            item.save(update_fields=['estado_admin', 'prestamo_actual'])
+
+    def devolver(self, request, *args, **kwargs):
+        with transaction.atomic():
+            prestamo = self.get_object()
+            if prestamo.estado == Prestamo.DEVUELTO:
+                return Response(
+                    {'message': 'El préstamo ya fue devuelto'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            prestamo.estado = Prestamo.DEVUELTO
+            prestamo.fecha_devolucion = timezone.now()
+            prestamo.save(update_fields=['estado', 'fecha_devolucion'])
+            item = Item.objects.select_for_update().get(pk=prestamo.item_id)
+            item.estado_admin = Item.DISPONIBLE
+            item.prestamo_actual = None
+            item.save(update_fields=['estado_admin', 'prestamo_actual'])
+            prestamo.item = item
+        return Response(self.get_serializer(prestamo).data)
+
+    def activos(self, request, *args, **kwargs):
+        return listar(self, self.get_queryset().activos())
+
+    def devueltos(self, request, *args, **kwargs):
+        return listar(self, self.get_queryset().devueltos())
+
+    def vencidos(self, request, *args, **kwargs):
+        return listar(self, self.get_queryset().vencidos())
+
+    def por_vencer(self, request, *args, **kwargs):
+        # Los más próximos a vencer primero.
+        self.cursor_ordering = 'fecha_limite'
+        return listar(self, self.get_queryset().por_vencer())
+
+    def del_item(self, request, item_pk=None):
+        prestamos = self.get_queryset().filter(item_id=item_pk)
+        if request.query_params.get('activo') == 'true':
+            prestamos = prestamos.activos()
+        return listar(self, prestamos)
+
+
+class ResumenInventarioView(generics.ListAPIView):
+    """Cantidad de items por descripción y estado, desde los contadores precalculados."""
+
+    queryset = ResumenInventario.objects.exclude(disponibles=0, prestados=0, no_prestar=0)
+    serializer_class = ResumenInventarioSerializer
+    permisos_requeridos = {'*': 'inventario.prestar'}
+    cursor_ordering = 'descripcion'
+    filtros = {'descripcion': 'descripcion__iexact'}
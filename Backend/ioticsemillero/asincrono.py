@@ -0,0 +1,82 @@
+"""Vistas asíncronas para el modo ASGI (``IOTIC_ASGI=True``).
+
+DRF no tiene vistas asíncronas, así que los endpoints que pasan la mayor
+parte del tiempo esperando E/S (firmar subidas, leer índices, hablar con
+Firebase) tienen además una versión con vistas async de Django. Se
+comportan como las de DRF: JSON con el codificador de DRF, autenticación
+con Firebase, los mismos permisos (escribir pide sesión; ``permiso`` exige
+ese código como ``permisos_requeridos``) y los mismos cuerpos de error
+(``{'detail': ...}``).
+"""
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from rest_framework import exceptions, status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.utils.encoders import JSONEncoder
+
+from usuarios.autenticacion import aautenticar
+from usuarios.permisos import autorizado
+
+from .perfilado import medir
+
+
+def respuesta_json(datos, status=status.HTTP_200_OK, **kwargs):
+    return JsonResponse(datos, encoder=JSONEncoder, safe=False, status=status, **kwargs)
+
+
+def leer_json(request):
+    """Cuerpo JSON de la petición (``{}`` si viene vacío)."""
+    if not request.body:
+        return {}
+    try:
+        return json.loads(request.body)
+    except ValueError as error:
+        raise exceptions.ParseError(f'JSON inválido: {error}') from error
+
+
+def _respuesta_error(error):
+    datos = error.detail if isinstance(error.detail, (list, dict)) else {'detail': error.detail}
+    respuesta = respuesta_json(datos, status=error.status_code)
+    if isinstance(error, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        respuesta['WWW-Authenticate'] = 'Bearer'
+    return respuesta
+
+
+async def verificar_permiso(request, permiso):
+    if permiso is None and request.method in SAFE_METHODS:
+        return
+    if not request.user.is_authenticated:
+        raise exceptions.NotAuthenticated()
+    # Los permisos del rol pueden leerse de la base.
+    if permiso is not None and not await sync_to_async(autorizado)(request.user, permiso):
+        raise exceptions.PermissionDenied('No tiene permiso para realizar esta acción')
+
+
+def api_async(*metodos, permiso=None):
+    """Decorador de vistas async: métodos, autenticación, permisos y errores como DRF."""
+
+    def decorador(vista):
+        @csrf_exempt
+        @require_http_methods(metodos)
+        @wraps(vista)
+        async def envuelta(request, *args, **kwargs):
+            try:
+                with medir('autenticacion'):
+                    autenticado = await aautenticar(request)
+                request.user, request.auth = autenticado or (AnonymousUser(), None)
+                await verificar_permiso(request, permiso)
+                return await vista(request, *args, **kwargs)
+            except exceptions.APIException as error:
+                return _respuesta_error(error)
+            except Http404:
+                return _respuesta_error(exceptions.NotFound())
+
+        return envuelta
+
+    return decorador
@@ -0,0 +1,173 @@
+"""Cache de respuestas de las lecturas públicas con invalidación por etiquetas.
+
+El servidor SSR del frontend pide las mismas noticias, eventos, misión/visión
+y últimas publicaciones en cada render. Las vistas envueltas con
+``cache_publica('noticia', 'publicaciones')`` guardan la respuesta ya
+renderizada en la cache ``RESPUESTAS_CACHE`` (alias de ``CACHES``).
+
+Cada etiqueta tiene un número de versión en la misma cache y la llave de una
+respuesta incluye las versiones de sus etiquetas. ``invalidar('noticia')``
+solo incrementa esa versión: las respuestas viejas dejan de encontrarse y
+expiran solas, sin recorrer llaves. Las señales de ``informacion`` la llaman
+en cada escritura, así que el tiempo de vida puede ser largo.
+
+Solo se cachean GET/HEAD anónimos (sin cabecera Authorization) con estado 200.
+Con varios workers la cache debe ser compartida (``CACHE_BACKEND=redis`` o
+``file``); con ``locmem`` cada proceso invalida solo lo suyo y los demás
+esperan a que venza ``RESPUESTAS_CACHE_TIMEOUT``.
+
+El decorador también acepta vistas asíncronas (modo ASGI); en ese caso la
+cache se consulta con su API asíncrona.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from . import metricas
+
+LLAVE_ETIQUETA = 'respuestas:etiqueta:{}'
+LLAVE_RESPUESTA = 'respuestas:{}'
+TIMEOUT = 600
+CABECERAS_GUARDADAS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Link')
+
+
+def obtener_cache():
+    return caches[getattr(settings, 'RESPUESTAS_CACHE', 'default')]
+
+
+def versiones(etiquetas):
+    """Versión actual de cada etiqueta (en una sola lectura de la cache)."""
+    cache = obtener_cache()
+    llaves = [LLAVE_ETIQUETA.format(e) for e in etiquetas]
+    actuales = cache.get_many(llaves)
+    # Si la cache descartó la llave, la versión nueva no repite una anterior.
+    faltantes = {llave: time.time_ns() for llave in llaves if llave not in actuales}
+    if faltantes:
+        cache.set_many(faltantes, timeout=None)
+        actuales.update(faltantes)
+    return [actuales[llave] for llave in llaves]
+
+
+async def aversiones(etiquetas):
+    cache = obtener_cache()
+    llaves = [LLAVE_ETIQUETA.format(e) for e in etiquetas]
+    actuales = await cache.aget_many(llaves)
+    faltantes = {llave: time.time_ns() for llave in llaves if llave not in actuales}
+    if faltantes:
+        await cache.aset_many(faltantes, timeout=None)
+        actuales.update(faltantes)
+    return [actuales[llave] for llave in llaves]
+
+
+def invalidar(*etiquetas):
+    """Descarta las respuestas cacheadas con alguna de las etiquetas."""
+
+    def incrementar():
+        cache = obtener_cache()
+        for etiqueta in etiquetas:
+            llave = LLAVE_ETIQUETA.format(etiqueta)
+            try:
+                cache.incr(llave)
+            except ValueError:
+                cache.set(llave, time.time_ns(), timeout=None)
+
+    incrementar()
+    # Una petición concurrente pudo cachear los datos previos al commit.
+    transaction.on_commit(incrementar)
+
+
+def llave_respuesta(request, etiquetas, versiones_actuales=None):
+    if versiones_actuales is None:
+        versiones_actuales = versiones(etiquetas)
+    partes = [
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', ''),
+        *(f'{e}={v}' for e, v in zip(etiquetas, versiones_actuales)),
+    ]
+    return LLAVE_RESPUESTA.format(hashlib.sha1('|'.join(partes).encode()).hexdigest())
+
+
+def _es_cacheable(request):
+    return request.method in ('GET', 'HEAD') and 'HTTP_AUTHORIZATION' not in request.META
+
+
+def _desde_cache(request, guardada):
+    contenido, cabeceras = guardada
+    respuesta = HttpResponse(contenido)
+    for nombre, valor in cabeceras.items():
+        respuesta[nombre] = valor
+    return get_conditional_response(
+        request,
+        etag=cabeceras.get('ETag'),
+        last_modified=parse_http_date_safe(cabeceras.get('Last-Modified', '')),
+        response=respuesta,
+    )
+
+
+def _para_guardar(respuesta, timeout):
+    """``(valor, vigencia)`` a guardar en la cache, o None si la respuesta no se cachea."""
+    if respuesta.status_code != 200 or respuesta.streaming:
+        return None
+    if hasattr(respuesta, 'render'):
+        respuesta.render()
+    cabeceras = {n: respuesta[n] for n in CABECERAS_GUARDADAS if n in respuesta}
+    vigencia = timeout or getattr(settings, 'RESPUESTAS_CACHE_TIMEOUT', TIMEOUT)
+    return (respuesta.content, cabeceras), vigencia
+
+
+def cache_publica(*etiquetas, timeout=None):
+    """Decorador de vista: cachea la respuesta hasta que se invalide una etiqueta."""
+
+    def decorador(vista):
+        if iscoroutinefunction(vista):
+            return _cache_publica_async(vista, etiquetas, timeout)
+
+        @wraps(vista)
+        def envuelta(request, *args, **kwargs):
+            if not _es_cacheable(request):
+                return vista(request, *args, **kwargs)
+            cache = obtener_cache()
+            llave = llave_respuesta(request, etiquetas)
+            guardada = cache.get(llave)
+            metricas.cache('respuestas', guardada is not None)
+            if guardada is not None:
+                return _desde_cache(request, guardada)
+
+            respuesta = vista(request, *args, **kwargs)
+            guardar = _para_guardar(respuesta, timeout)
+            if guardar is not None:
+                cache.set(llave, guardar[0], timeout=guardar[1])
+            return respuesta
+
+        return envuelta
+
+    return decorador
+
+
+def _cache_publica_async(vista, etiquetas, timeout):
+    @wraps(vista)
+    async def envuelta(request, *args, **kwargs):
+        if not _es_cacheable(request):
+            return await vista(request, *args, **kwargs)
+        cache = obtener_cache()
+        llave = llave_respuesta(request, etiquetas, await aversiones(etiquetas))
+        guardada = await cache.aget(llave)
+        metricas.cache('respuestas', guardada is not None)
+        if guardada is not None:
+            return _desde_cache(request, guardada)
+
+        respuesta = await vista(request, *args, **kwargs)
+        guardar = _para_guardar(respuesta, timeout)
+        if guardar is not None:
+            await cache.aset(llave, guardar[0], timeout=guardar[1])
+        return respuesta
+
+    return envuelta
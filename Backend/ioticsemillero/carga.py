@@ -0,0 +1,193 @@
+"""Prueba de carga a concurrencia fija contra un servidor HTTP en marcha.
+
+Pensada para comparar el mismo backend servido por WSGI (gunicorn) y por
+ASGI (uvicorn con ``IOTIC_ASGI=True``): ``concurrencia`` clientes con
+conexiones keep-alive piden las rutas en ronda durante ``duracion`` segundos
+y se reportan peticiones por segundo y percentiles de latencia. El cliente es
+un HTTP/1.1 mínimo sobre asyncio para no depender de paquetes externos ni
+medir el costo de un cliente con hilos.
+
+Las lecturas públicas anónimas salen de la cache de respuestas; para medir
+las vistas (y no la cache) cada petición agrega ``_=<n>`` a la ruta, como en
+``rendimiento``. ``variar=False`` mide la ruta tal cual.
+"""
+import asyncio
+import itertools
+import ssl
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+PERCENTILES = (50, 90, 99)
+
+
+def separar_objetivo(texto):
+    """``(nombre, url)`` de ``nombre=url`` o de una URL sola (que puede llevar ``=``)."""
+    if texto.startswith(('http://', 'https://')):
+        return texto, texto
+    nombre, _, url = texto.partition('=')
+    return nombre, url
+
+
+def rutas_sin_cache(rutas):
+    """Las rutas en ronda, cada vez con un ``_=<n>`` distinto."""
+    for numero, ruta in enumerate(itertools.cycle(rutas)):
+        separador = '&' if '?' in ruta else '?'
+        yield f'{ruta}{separador}_={numero}'
+
+
+def percentiles(latencias):
+    """``{'p50': ..., 'p90': ..., 'p99': ..., 'max': ...}`` redondeados a centésimas."""
+    if len(latencias) >= 2:
+        cortes = statistics.quantiles(latencias, n=100, method='inclusive')
+        datos = {f'p{p}': round(cortes[p - 1], 2) for p in PERCENTILES}
+    else:
+        datos = {f'p{p}': round(sum(latencias), 2) for p in PERCENTILES}
+    datos['max'] = round(max(latencias, default=0.0), 2)
+    return datos
+
+
+@dataclass
+class ResultadoCarga:
+    objetivo: str
+    concurrencia: int
+    duracion: float = 0.0
+    latencias: list = field(default_factory=list)
+    estados: Counter = field(default_factory=Counter)
+    errores: int = 0
+
+    @property
+    def peticiones(self):
+        return len(self.latencias)
+
+    def resumen(self):
+        """Métricas en ms, listas para imprimir o guardar en JSON."""
+        datos = {
+            'objetivo': self.objetivo,
+            'concurrencia': self.concurrencia,
+            'peticiones': self.peticiones,
+            'errores': self.errores,
+            'estados': {str(e): n for e, n in sorted(self.estados.items())},
+            'rps': round(self.peticiones / self.duracion, 1) if self.duracion else 0.0,
+        }
+        datos.update(percentiles(self.latencias))
+        return datos
+
+
+class Conexion:
+    """Conexión keep-alive HTTP/1.1 a un host."""
+
+    def __init__(self, url_base):
+        partes = urlsplit(url_base)
+        self.host = partes.hostname
+        self.puerto = partes.port or (443 if partes.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if partes.scheme == 'https' else None
+        self.cabecera_host = partes.netloc
+        self.lector = self.escritor = None
+
+    async def abrir(self):
+        self.lector, self.escritor = await asyncio.open_connection(
+            self.host, self.puerto, ssl=self.ssl
+        )
+
+    def cerrar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+        self.lector = self.escritor = None
+
+    async def pedir(self, metodo, ruta, cuerpo=b'', cabeceras=()):
+        """Envía una petición y consume la respuesta completa; devuelve el estado."""
+        if self.escritor is None:
+            await self.abrir()
+        lineas = [f'{metodo} {ruta} HTTP/1.1', f'Host: {self.cabecera_host}', *cabeceras]
+        if cuerpo:
+            lineas.append(f'Content-Length: {len(cuerpo)}')
+        self.escritor.write(('\r\n'.join(lineas) + '\r\n\r\n').encode('latin-1') + cuerpo)
+        await self.escritor.drain()
+
+        inicial = await self.lector.readline()
+        if not inicial:
+            raise ConnectionError('El servidor cerró la conexión')
+        estado = int(inicial.split()[1])
+        recibidas = {}
+        while (linea := await self.lector.readline()) not in (b'\r\n', b'\n', b''):
+            nombre, _, valor = linea.decode('latin-1').partition(':')
+            recibidas[nombre.strip().lower()] = valor.strip()
+
+        cerrar = recibidas.get('connection', '').lower() == 'close'
+        if metodo == 'HEAD' or estado in (204, 304) or 100 <= estado < 200:
+            pass
+        elif 'content-length' in recibidas:
+            await self.lector.readexactly(int(recibidas['content-length']))
+        elif recibidas.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                tamano = int((await self.lector.readline()).split(b';')[0], 16)
+                await self.lector.readexactly(tamano + 2)
+                if tamano == 0:
+                    break
+        else:
+            await self.lector.read()
+            cerrar = True
+        if cerrar:
+            self.cerrar()
+        return estado
+
+
+async def _cliente(url_base, rutas, metodo, cuerpo, cabeceras, fin, timeout, resultado):
+    conexion = Conexion(url_base)
+    try:
+        while time.monotonic() < fin:
+            ruta = next(rutas)
+            inicio = time.perf_counter()
+            try:
+                estado = await asyncio.wait_for(
+                    conexion.pedir(metodo, ruta, cuerpo, cabeceras), timeout
+                )
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                resultado.errores += 1
+                conexion.cerrar()
+                continue
+            resultado.latencias.append((time.perf_counter() - inicio) * 1000)
+            resultado.estados[estado] += 1
+            if estado >= 400:
+                resultado.errores += 1
+    finally:
+        conexion.cerrar()
+
+
+async def medir(
+    url_base,
+    rutas,
+    concurrencia=32,
+    duracion=10.0,
+    metodo='GET',
+    cuerpo=b'',
+    cabeceras=(),
+    calentamiento=1.0,
+    timeout=30.0,
+    objetivo=None,
+    variar=True,
+):
+    """Corre la prueba y devuelve un ResultadoCarga (el calentamiento no se cuenta)."""
+    ciclo = rutas_sin_cache(rutas) if variar else itertools.cycle(rutas)
+    objetivo = objetivo or url_base
+    resultado = ResultadoCarga(objetivo, concurrencia)
+    fases = [(calentamiento, ResultadoCarga(objetivo, concurrencia)), (duracion, resultado)]
+    for segundos, destino in fases:
+        if segundos <= 0:
+            continue
+        inicio = time.monotonic()
+        fin = inicio + segundos
+        clientes = [
+            _cliente(url_base, ciclo, metodo, cuerpo, cabeceras, fin, timeout, destino)
+            for _ in range(concurrencia)
+        ]
+        await asyncio.gather(*clientes)
+        destino.duracion = time.monotonic() - inicio
+    return resultado
+
+
+def ejecutar(url_base, rutas, **opciones):
+    return asyncio.run(medir(url_base, rutas, **opciones))
@@ -0,0 +1,100 @@
+from django.core.exceptions import FieldDoesNotExist, ValidationError as ErrorDeDjango
+from django.db import models
+from django.forms import NullBooleanField
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class FiltroPorCampos(BaseFilterBackend):
+    """Filtra en SQL con los parámetros declarados en ``view.filtros``.
+
+    ``filtros`` asocia el parámetro de la URL con el lookup del ORM, p. ej.
+    ``{'anio': 'anio', 'usuario': 'usuario_id'}``. En lookups exactos un
+    valor con comas se traduce a ``__in``. Los parámetros no declarados se
+    ignoran; un valor que no corresponde al tipo del campo (``?usuario=abc``)
+    responde 400.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filtros = getattr(view, 'filtros', None) or {}
+        for parametro, lookup in filtros.items():
+            valor = request.query_params.get(parametro)
+            if valor in (None, ''):
+                continue
+            campo = campo_del_lookup(queryset.model, lookup)
+            if ',' in valor and '__' not in lookup:
+                valores = [v.strip() for v in valor.split(',') if v.strip()]
+                queryset = queryset.filter(
+                    **{f'{lookup}__in': [convertir(campo, parametro, v) for v in valores]}
+                )
+            else:
+                queryset = queryset.filter(**{lookup: convertir(campo, parametro, valor)})
+        return queryset
+
+
+def campo_del_lookup(modelo, lookup):
+    """Campo del modelo al que apunta ``lookup`` (sin el sufijo, p. ej. ``__iexact``)."""
+    campo = None
+    for parte in lookup.split('__'):
+        try:
+            campo = modelo._meta.get_field(parte)
+        except FieldDoesNotExist:
+            break
+        modelo = campo.related_model
+        if modelo is None:
+            break
+    return campo
+
+
+def convertir(campo, parametro, valor):
+    if campo is None:
+        return valor
+    if isinstance(campo, models.BooleanField):
+        convertido = NullBooleanField().to_python(valor)
+        if convertido is None:
+            raise ValidationError({parametro: [f'"{valor}" no es true ni false.']})
+        return convertido
+    try:
+        return campo.to_python(valor)
+    except ErrorDeDjango as error:
+        raise ValidationError({parametro: error.messages})
+
+
+class SeleccionDeCampos(BaseFilterBackend):
+    """Con ``?fields=a,b`` solo se leen esas columnas de la tabla.
+
+    Complementa a ``CamposParcialesMixin``: el serializador recorta la
+    respuesta y aquí se evita traer columnas que no se van a serializar. Si
+    se pide algo que no es una columna local (relaciones seguidas con
+    ``select_related``, campos calculados) se deja la consulta como está.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        pedidos = campos_pedidos(request)
+        if not pedidos or queryset.query.select_related:
+            return queryset
+        columnas = set()
+        for nombre in pedidos:
+            try:
+                campo = queryset.model._meta.get_field(nombre)
+            except FieldDoesNotExist:
+                return queryset
+            if not campo.concrete or campo.many_to_many:
+                return queryset
+            columnas.add(campo.name)
+        orden = getattr(view, 'cursor_ordering', None) or ()
+        if isinstance(orden, str):
+            orden = (orden,)
+        columnas.update(o.lstrip('-') for o in orden)
+        return queryset.only('pk', *columnas)
+
+
+def campos_pedidos(request):
+    """Conjunto de campos pedidos con ``?fields=``, o None si no aplica."""
+    if request is None or request.method != 'GET':
+        return None
+    valor = request.query_params.get('fields')
+    if not valor:
+        return None
+    return {c.strip() for c in valor.split(',') if c.strip()} or None
+
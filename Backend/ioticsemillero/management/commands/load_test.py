@@ -0,0 +1,86 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ioticsemillero.carga import PERCENTILES, ejecutar, separar_objetivo
+
+# Vista asíncrona con IOTIC_ASGI=True; cada petición lleva ``_=<n>`` para que
+# no la conteste la cache de respuestas (ver --con-cache).
+RUTAS = ['/api/informacion/publicaciones/ultimas/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de carga a concurrencia fija contra servidores en marcha, p. ej. '
+        '--objetivo wsgi=http://127.0.0.1:8000 --objetivo asgi=http://127.0.0.1:8001. '
+        'Reporta peticiones por segundo y percentiles de latencia.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--objetivo',
+            action='append',
+            required=True,
+            help='URL base, opcionalmente con nombre: nombre=http://host:puerto (repetible).',
+        )
+        parser.add_argument(
+            '--ruta',
+            action='append',
+            help=f'Ruta a pedir, en ronda si hay varias (por defecto {RUTAS[0]}).',
+        )
+        parser.add_argument(
+            '--con-cache',
+            action='store_true',
+            help='Pide las rutas tal cual, sin _=<n>: mide la cache de respuestas.',
+        )
+        parser.add_argument('--concurrencia', type=int, nargs='+', default=[32])
+        parser.add_argument('--duracion', type=float, default=10.0, help='Segundos por medición.')
+        parser.add_argument('--calentamiento', type=float, default=1.0)
+        parser.add_argument('--metodo', default='GET')
+        parser.add_argument('--cuerpo', default='', help='Cuerpo JSON (para POST).')
+        parser.add_argument(
+            '--cabecera', action='append', default=[], help='"Nombre: valor" (repetible).'
+        )
+        parser.add_argument('--json', help='Archivo donde guardar los resultados.')
+
+    def handle(self, *args, **options):
+        objetivos = []
+        for objetivo in options['objetivo']:
+            nombre, url = separar_objetivo(objetivo)
+            if not url.startswith(('http://', 'https://')):
+                raise CommandError(f'URL inválida: {objetivo}')
+            objetivos.append((nombre, url.rstrip('/')))
+        cabeceras = list(options['cabecera'])
+        cuerpo = options['cuerpo'].encode()
+        if cuerpo:
+            cabeceras.append('Content-Type: application/json')
+
+        resultados = []
+        self.stdout.write(
+            f'{"objetivo":<12}{"conc.":>6}{"req/s":>10}'
+            + ''.join(f'{f"p{p} ms":>10}' for p in PERCENTILES)
+            + f'{"errores":>9}'
+        )
+        for concurrencia in options['concurrencia']:
+            for nombre, url in objetivos:
+                resumen = ejecutar(
+                    url,
+                    options['ruta'] or RUTAS,
+                    concurrencia=concurrencia,
+                    duracion=options['duracion'],
+                    calentamiento=options['calentamiento'],
+                    metodo=options['metodo'].upper(),
+                    cuerpo=cuerpo,
+                    cabeceras=cabeceras,
+                    objetivo=nombre,
+                    variar=not options['con_cache'],
+                ).resumen()
+                resultados.append(resumen)
+                self.stdout.write(
+                    f'{nombre:<12}{concurrencia:>6}{resumen["rps"]:>10.1f}'
+                    + ''.join(f'{resumen[f"p{p}"]:>10.2f}' for p in PERCENTILES)
+                    + f'{resumen["errores"]:>9}'
+                )
+        if options['json']:
+            with open(options['json'], 'w') as archivo:
+                json.dump(resultados, archivo, indent=2)
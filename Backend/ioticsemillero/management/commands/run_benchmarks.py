@@ -0,0 +1,68 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ioticsemillero.carga import PERCENTILES
+from ioticsemillero.rendimiento import BENCHMARKS, comparar, ejecutar
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide latencia y número de consultas de los endpoints más usados sobre la base '
+        'configurada (llénela antes con seed_synthetic). Falla si un endpoint pasa su '
+        'presupuesto de consultas o, con --comparar, si empeoró frente a un reporte anterior.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=20)
+        parser.add_argument(
+            '--solo',
+            action='append',
+            choices=[b.nombre for b in BENCHMARKS],
+            help='Benchmark a correr (repetible); por defecto todos.',
+        )
+        parser.add_argument('--json', help='Archivo donde guardar el reporte.')
+        parser.add_argument('--comparar', help='Reporte anterior contra el cual comparar.')
+        parser.add_argument(
+            '--tolerancia',
+            type=float,
+            default=0.25,
+            help='Aumento relativo de latencia aceptado frente al reporte anterior.',
+        )
+
+    def handle(self, *args, **options):
+        reporte = ejecutar(options['repeticiones'], options['solo'])
+        self.stdout.write(
+            ', '.join(f'{n} {nombre}' for nombre, n in reporte['volumenes'].items())
+        )
+        self.stdout.write(
+            f'{"benchmark":<24}{"consultas":>10}'
+            + ''.join(f'{f"p{p} ms":>10}' for p in PERCENTILES)
+            + '  escaneos'
+        )
+        for resultado in reporte['resultados']:
+            consultas = f'{resultado["consultas"]}/{resultado["presupuesto"]}'
+            self.stdout.write(
+                f'{resultado["nombre"]:<24}{consultas:>10}'
+                + ''.join(f'{resultado[f"p{p}"]:>10.2f}' for p in PERCENTILES)
+                + f'  {", ".join(resultado["escaneos"]) or "-"}'
+            )
+        if options['json']:
+            with open(options['json'], 'w') as archivo:
+                json.dump(reporte, archivo, indent=2)
+
+        problemas = [
+            f'{r["nombre"]}: {r["consultas"]} consultas (presupuesto {r["presupuesto"]})'
+            for r in reporte['resultados']
+            if r['excede']
+        ]
+        problemas += [
+            f'{r["nombre"]}: respuestas {r["estados"]}'
+            for r in reporte['resultados']
+            if set(r['estados']) != {'200'}
+        ]
+        if options['comparar']:
+            with open(options['comparar']) as archivo:
+                problemas += comparar(reporte, json.load(archivo), options['tolerancia'])
+        if problemas:
+            raise CommandError('\n'.join(problemas))
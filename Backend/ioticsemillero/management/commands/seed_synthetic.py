@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ioticsemillero.sinteticos import VOLUMENES, sembrar, ya_sembrado
+
+
+class Command(BaseCommand):
+    help = (
+        'Llena la base con datos sintéticos (usuarios, items, préstamos y publicaciones '
+        'de todos los tipos) para correr run_benchmarks. Use una base aparte, p. ej. '
+        'DB_NAME=bench.sqlite3: los datos no se borran.'
+    )
+
+    def add_arguments(self, parser):
+        for nombre, cantidad in VOLUMENES.items():
+            parser.add_argument(f'--{nombre}', type=int, default=cantidad)
+        parser.add_argument('--semilla', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if ya_sembrado():
+            raise CommandError('La base ya tiene datos sintéticos; use una base nueva (DB_NAME).')
+        creados = sembrar(
+            semilla=options['semilla'], **{nombre: options[nombre] for nombre in VOLUMENES}
+        )
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        self.stdout.write(
+            self.style.SUCCESS(
+                'Creados: ' + ', '.join(f'{n} {nombre}' for nombre, n in creados.items()) + '.'
+            )
+        )
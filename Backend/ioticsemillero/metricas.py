@@ -0,0 +1,306 @@
+"""Métricas de uso en formato de texto de Prometheus (``GET /metrics``).
+
+Con ``METRICAS=True`` el middleware cuenta cada petición por ruta (el patrón
+de la URL, p. ej. ``api/inventario/items/<int:pk>/``, no la ruta concreta),
+método y estado, y guarda su duración en un histograma junto con las
+consultas SQL que hizo. Las caches de respuestas y de tokens anotan aciertos
+y fallos, y la cola de trabajos en segundo plano su profundidad y resultados:
+
+    iotic_peticiones_total{ruta, metodo, estado}    contador
+    iotic_errores_total{ruta, metodo}               contador (respuestas 5xx)
+    iotic_peticion_segundos{ruta, metodo}           histograma
+    iotic_db_consultas_total{ruta}                  contador
+    iotic_db_segundos_total{ruta}                   contador
+    iotic_cache_total{cache, resultado}             contador (acierto/fallo)
+    iotic_trabajos_en_cola{cola}                    gauge (pendientes por tarea)
+    iotic_trabajos_total{tarea, resultado}          contador (ok/error)
+
+Cada proceso lleva su registro en memoria. Con varios workers (gunicorn o
+uvicorn con ``--workers``) defina ``METRICAS_DIR``: cada proceso escribe su
+registro en ``metricas-<pid>.json`` a lo sumo cada ``METRICAS_INTERVALO``
+segundos y ``/metrics`` suma los de todos; los gauges solo cuentan para
+procesos vivos. Los valores de un ``colector`` (p. ej. la profundidad de la
+cola, leída de la base) se calculan al exponer y no se suman. Vacíe el directorio al desplegar, como con el modo
+multiproceso de ``prometheus_client``.
+
+Si ``METRICAS_TOKEN`` tiene valor, ``/metrics`` pide
+``Authorization: Bearer <token>``.
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from . import perfilado
+
+CONTADOR, GAUGE, HISTOGRAMA = 'counter', 'gauge', 'histogram'
+METRICAS = {
+    'iotic_peticiones_total': (CONTADOR, 'Peticiones atendidas.'),
+    'iotic_errores_total': (CONTADOR, 'Peticiones que terminaron en 5xx.'),
+    'iotic_peticion_segundos': (HISTOGRAMA, 'Duración de las peticiones.'),
+    'iotic_db_consultas_total': (CONTADOR, 'Consultas SQL hechas por las peticiones.'),
+    'iotic_db_segundos_total': (CONTADOR, 'Tiempo en consultas SQL de las peticiones.'),
+    'iotic_cache_total': (CONTADOR, 'Lecturas de cache por resultado (acierto o fallo).'),
+    'iotic_trabajos_en_cola': (GAUGE, 'Trabajos en segundo plano pendientes.'),
+    'iotic_trabajos_total': (CONTADOR, 'Intentos de trabajos en segundo plano por resultado.'),
+}
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def activas():
+    return getattr(settings, 'METRICAS', False)
+
+
+def _llave(nombre, etiquetas):
+    return (nombre, tuple(sorted(etiquetas.items())))
+
+
+class Registro:
+    """Valores de un proceso; ``datos()`` los deja en forma serializable."""
+
+    def __init__(self):
+        self.candado = threading.Lock()
+        self.valores = defaultdict(float)
+        # (nombre, etiquetas) -> [conteo por bucket..., +Inf, suma]
+        self.histogramas = {}
+        self.escrito = 0.0
+
+    def sumar(self, nombre, valor, etiquetas):
+        with self.candado:
+            self.valores[_llave(nombre, etiquetas)] += valor
+
+    def observar(self, nombre, valor, etiquetas):
+        llave = _llave(nombre, etiquetas)
+        with self.candado:
+            cubetas = self.histogramas.get(llave)
+            if cubetas is None:
+                cubetas = self.histogramas[llave] = [0] * (len(BUCKETS) + 1) + [0.0]
+            cubetas[bisect_left(BUCKETS, valor)] += 1
+            cubetas[-1] += valor
+
+    def datos(self):
+        with self.candado:
+            return {
+                'pid': os.getpid(),
+                'valores': [[n, list(e), v] for (n, e), v in self.valores.items()],
+                'histogramas': [[n, list(e), list(c)] for (n, e), c in self.histogramas.items()],
+            }
+
+    def limpiar(self):
+        with self.candado:
+            self.valores.clear()
+            self.histogramas.clear()
+
+
+registro = Registro()
+# nombre -> función que devuelve [(etiquetas, valor), ...] al exponer.
+_colectores = {}
+
+
+def incrementar(nombre, valor=1, **etiquetas):
+    """Suma ``valor`` a un contador o gauge (negativo para bajar un gauge)."""
+    if activas():
+        registro.sumar(nombre, valor, etiquetas)
+        escribir()
+
+
+def observar(nombre, valor, **etiquetas):
+    if activas():
+        registro.observar(nombre, valor, etiquetas)
+        escribir()
+
+
+def cache(nombre, acierto):
+    incrementar('iotic_cache_total', cache=nombre, resultado='acierto' if acierto else 'fallo')
+
+
+def colector(nombre, funcion):
+    """Registra ``funcion`` para calcular ``nombre`` al momento de exponer."""
+    _colectores[nombre] = funcion
+
+
+def _directorio():
+    return getattr(settings, 'METRICAS_DIR', '')
+
+
+def escribir(forzar=False):
+    """Vuelca el registro del proceso a ``METRICAS_DIR`` (como mucho cada intervalo)."""
+    directorio = _directorio()
+    if not directorio:
+        return
+    ahora = time.monotonic()
+    if not forzar and ahora - registro.escrito < getattr(settings, 'METRICAS_INTERVALO', 1.0):
+        return
+    registro.escrito = ahora
+    os.makedirs(directorio, exist_ok=True)
+    destino = os.path.join(directorio, f'metricas-{os.getpid()}.json')
+    temporal = f'{destino}.{threading.get_ident()}.tmp'
+    with open(temporal, 'w') as archivo:
+        json.dump(registro.datos(), archivo)
+    os.replace(temporal, destino)
+
+
+atexit.register(lambda: activas() and escribir(forzar=True))
+
+
+def _vivo(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _procesos():
+    """Registros de todos los procesos (o solo el propio sin ``METRICAS_DIR``)."""
+    directorio = _directorio()
+    if not directorio:
+        return [registro.datos()]
+    escribir(forzar=True)
+    procesos = []
+    for ruta in glob.glob(os.path.join(directorio, 'metricas-*.json')):
+        try:
+            with open(ruta) as archivo:
+                procesos.append(json.load(archivo))
+        except (OSError, ValueError):
+            # Borrado o reemplazado mientras se leía.
+            continue
+    return procesos
+
+
+def agregar(procesos):
+    """Suma los registros: ``(valores, histogramas)`` por (nombre, etiquetas)."""
+    valores, histogramas = defaultdict(float), {}
+    for datos in procesos:
+        vivo = datos['pid'] == os.getpid() or _vivo(datos['pid'])
+        for nombre, etiquetas, valor in datos['valores']:
+            if METRICAS.get(nombre, (GAUGE,))[0] == GAUGE and not vivo:
+                continue
+            valores[nombre, tuple(map(tuple, etiquetas))] += valor
+        for nombre, etiquetas, cubetas in datos['histogramas']:
+            llave = (nombre, tuple(map(tuple, etiquetas)))
+            previas = histogramas.get(llave)
+            histogramas[llave] = cubetas if previas is None else [
+                a + b for a, b in zip(previas, cubetas)
+            ]
+    return valores, histogramas
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _etiquetas(pares):
+    if not pares:
+        return ''
+    return '{' + ','.join(f'{n}="{_escapar(v)}"' for n, v in pares) + '}'
+
+
+def _numero(valor):
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+def exponer(procesos=None):
+    """Texto de exposición de Prometheus con todas las métricas."""
+    valores, histogramas = agregar(_procesos() if procesos is None else procesos)
+    for nombre, funcion in _colectores.items():
+        for etiquetas, valor in funcion():
+            valores[_llave(nombre, etiquetas)] = valor
+    lineas = []
+    for nombre, (tipo, ayuda) in METRICAS.items():
+        lineas += [f'# HELP {nombre} {ayuda}', f'# TYPE {nombre} {tipo}']
+        if tipo == HISTOGRAMA:
+            for (metrica, pares), cubetas in sorted(histogramas.items()):
+                if metrica != nombre:
+                    continue
+                acumulado = 0
+                for limite, cantidad in zip((*BUCKETS, '+Inf'), cubetas):
+                    acumulado += cantidad
+                    lineas.append(
+                        f'{nombre}_bucket{_etiquetas((*pares, ("le", limite)))} {acumulado}'
+                    )
+                lineas.append(f'{nombre}_sum{_etiquetas(pares)} {_numero(cubetas[-1])}')
+                lineas.append(f'{nombre}_count{_etiquetas(pares)} {acumulado}')
+        else:
+            for (metrica, pares), valor in sorted(valores.items()):
+                if metrica == nombre:
+                    lineas.append(f'{nombre}{_etiquetas(pares)} {_numero(valor)}')
+    return '\n'.join(lineas) + '\n'
+
+
+def vista(request):
+    if not activas():
+        raise Http404
+    token = getattr(settings, 'METRICAS_TOKEN', '')
+    if token and not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {token}'
+    ):
+        return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+    return HttpResponse(exponer(), content_type=CONTENT_TYPE)
+
+
+class MetricasMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not activas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        perfilado.instalar()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        inicio = time.perf_counter()
+        with perfilado.perfil_en_curso() as perfil:
+            antes = perfil.consultas, perfil.tiempos['sql']
+            respuesta = self.get_response(request)
+        self.registrar(request, respuesta, inicio, perfil, antes)
+        return respuesta
+
+    async def __acall__(self, request):
+        inicio = time.perf_counter()
+        with perfilado.perfil_en_curso() as perfil:
+            antes = perfil.consultas, perfil.tiempos['sql']
+            respuesta = await self.get_response(request)
+        self.registrar(request, respuesta, inicio, perfil, antes)
+        return respuesta
+
+    def registrar(self, request, respuesta, inicio, perfil, antes):
+        coincidencia = request.resolver_match
+        ruta = coincidencia.route if coincidencia is not None else '(sin ruta)'
+        metodo = request.method
+        registro.sumar(
+            'iotic_peticiones_total',
+            1,
+            {'ruta': ruta, 'metodo': metodo, 'estado': str(respuesta.status_code)},
+        )
+        if respuesta.status_code >= 500:
+            registro.sumar('iotic_errores_total', 1, {'ruta': ruta, 'metodo': metodo})
+        registro.observar(
+            'iotic_peticion_segundos',
+            time.perf_counter() - inicio,
+            {'ruta': ruta, 'metodo': metodo},
+        )
+        registro.sumar('iotic_db_consultas_total', perfil.consultas - antes[0], {'ruta': ruta})
+        registro.sumar(
+            'iotic_db_segundos_total', (perfil.tiempos['sql'] - antes[1]) / 1000, {'ruta': ruta}
+        )
+        escribir()
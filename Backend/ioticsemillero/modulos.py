@@ -0,0 +1,42 @@
+"""Apps de dominio que monta el proyecto y cómo se habilitan.
+
+Por defecto un proceso sirve todas. Con la variable ``IOTIC_APPS`` (lista
+separada por comas) un worker carga solo algunas, p. ej.
+``IOTIC_APPS=inventario`` para un despliegue separado del inventario; las
+dependencias (``requiere``) se agregan solas. Todas requieren ``usuarios``,
+que es donde vive la autenticación. Las apps que no se habilitan no
+se importan ni se montan en las URLs.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+# Nombre de la app -> prefijo de sus URLs y apps de las que depende.
+MODULOS = {
+    'usuarios': {'prefijo': 'api/usuarios/', 'requiere': ()},
+    'informacion': {'prefijo': 'api/informacion/', 'requiere': ('usuarios',)},
+    'inventario': {'prefijo': 'api/inventario/', 'requiere': ('usuarios',)},
+}
+
+
+def resolver(nombres=None):
+    """Apps a instalar, con sus dependencias, en el orden de ``MODULOS``."""
+    if not nombres:
+        return list(MODULOS)
+    pendientes = list(nombres)
+    elegidos = set()
+    while pendientes:
+        nombre = pendientes.pop()
+        if nombre not in MODULOS:
+            raise ImproperlyConfigured(
+                f'IOTIC_APPS: app desconocida {nombre!r}; opciones: {", ".join(MODULOS)}'
+            )
+        if nombre not in elegidos:
+            elegidos.add(nombre)
+            pendientes.extend(MODULOS[nombre]['requiere'])
+    return [nombre for nombre in MODULOS if nombre in elegidos]
+
+
+def rutas(modulos):
+    """``include`` de las URLs de cada app habilitada."""
+    from django.urls import include, path
+
+    return [path(MODULOS[nombre]['prefijo'], include(f'{nombre}.urls')) for nombre in modulos]
@@ -0,0 +1,54 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class PaginacionPorCursor(CursorPagination):
+    """Paginación por llave (keyset) sobre una columna indexada, a pedido.
+
+    Solo se pagina si la petición trae ``?cursor=`` o ``?page_size=``; sin
+    ellos se responde la lista completa, en el mismo orden, para los servicios
+    del frontend que esperan todos los elementos. Las pantallas de listas que
+    solo crecen (historial de préstamos, inventario) piden ``page_size`` y
+    siguen la cabecera ``Link`` con "Cargar más". El cuerpo es siempre
+    una lista; los enlaces a la página siguiente/anterior van en la cabecera
+    ``Link`` (``rel="next"``/``rel="prev"``).
+
+    Las vistas pueden cambiar la columna con ``cursor_ordering``; debe ser
+    única e inmutable (por defecto ``-id``).
+    """
+
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.completa = not (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
+        if self.completa:
+            return list(queryset.order_by(*self.get_ordering(request, queryset, view)))
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.completa:
+            return Response(data)
+        enlaces = [
+            f'<{url}>; rel="{rel}"'
+            for rel, url in (
+                ('next', self.get_next_link()),
+                ('prev', self.get_previous_link()),
+            )
+            if url
+        ]
+        headers = {'Link': ', '.join(enlaces)} if enlaces else None
+        return Response(data, headers=headers)
+
+    def get_paginated_response_schema(self, schema):
+        return schema
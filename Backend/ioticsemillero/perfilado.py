@@ -0,0 +1,240 @@
+"""Perfilado por petición: tiempo total, SQL, serialización y autenticación.
+
+Con ``PERFILADO=True`` el middleware mide cada petición y responde la
+cabecera ``Server-Timing`` (visible en la pestaña Network del navegador):
+
+    Server-Timing: total;dur=84.2, sql;dur=31.0;desc="12 consultas, 10 duplicadas",
+                   serializacion;dur=40.3, autenticacion;dur=2.1
+
+Las consultas se cuentan con un ``execute_wrapper`` que se agrega a cada
+conexión y busca el perfil en una ``ContextVar``, así también cuentan las que
+las vistas async hacen en hilos con ``sync_to_async``. Una consulta
+duplicada es la misma SQL con los mismos parámetros (síntoma de N+1). La
+serialización es el tiempo en ``serializer.data`` de DRF, incluidas las
+consultas perezosas que dispare.
+
+Las peticiones que pasan ``PERFILADO_LENTO_MS``, ``PERFILADO_CONSULTAS_MAX``
+o ``PERFILADO_DUPLICADAS_MAX`` se registran como una línea JSON en el logger
+``ioticsemillero.perfilado``. Con ``PERFILADO_CPROFILE_CADA=N`` una de cada N
+peticiones se corre bajo cProfile y se guarda en ``PERFILADO_CPROFILE_DIR``
+(``python -m pstats archivo.prof``); en ASGI solo ve el hilo del event loop.
+
+Desactivado, el middleware se retira al arrancar (``MiddlewareNotUsed``) y
+no se instala ningún envoltorio.
+"""
+import cProfile
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_actual = ContextVar('perfil', default=None)
+MEDIDAS = ('sql', 'serializacion', 'autenticacion')
+
+
+@dataclass
+class Perfil:
+    inicio: float = field(default_factory=time.perf_counter)
+    tiempos: dict = field(default_factory=lambda: dict.fromkeys(MEDIDAS, 0.0))
+    consultas: int = 0
+    sentencias: Counter = field(default_factory=Counter)
+    total: float = 0.0
+
+    @property
+    def duplicadas(self):
+        return sum(n - 1 for n in self.sentencias.values())
+
+    def terminar(self):
+        self.total = (time.perf_counter() - self.inicio) * 1000
+
+    def server_timing(self):
+        partes = [f'total;dur={self.total:.1f}']
+        for nombre in MEDIDAS:
+            parte = f'{nombre};dur={self.tiempos[nombre]:.1f}'
+            if nombre == 'sql':
+                parte += f';desc="{self.consultas} consultas, {self.duplicadas} duplicadas"'
+            partes.append(parte)
+        return ', '.join(partes)
+
+
+@contextmanager
+def medir(nombre):
+    """Suma a ``nombre`` el tiempo del bloque si la petición se está perfilando."""
+    perfil = _actual.get()
+    if perfil is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        perfil.tiempos[nombre] += (time.perf_counter() - inicio) * 1000
+
+
+@contextmanager
+def perfil_en_curso():
+    """El perfil de la petición en curso, o uno nuevo mientras dure el bloque."""
+    perfil = _actual.get()
+    if perfil is not None:
+        yield perfil
+        return
+    perfil = Perfil()
+    token = _actual.set(perfil)
+    try:
+        yield perfil
+    finally:
+        _actual.reset(token)
+
+
+def _medido(nombre, funcion):
+    @wraps(funcion)
+    def envuelta(*args, **kwargs):
+        with medir(nombre):
+            return funcion(*args, **kwargs)
+
+    return envuelta
+
+
+def _registrar_sql(execute, sql, params, many, context):
+    perfil = _actual.get()
+    if perfil is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        perfil.tiempos['sql'] += (time.perf_counter() - inicio) * 1000
+        perfil.consultas += 1
+        perfil.sentencias[sql, repr(params)] += 1
+
+
+def _envolver_conexion(connection, **kwargs):
+    if _registrar_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_registrar_sql)
+
+
+@lru_cache
+def instalar():
+    """Engancha SQL, serializadores y autenticación de DRF (una vez por proceso)."""
+    from rest_framework.request import Request
+    from rest_framework.serializers import BaseSerializer
+
+    connection_created.connect(_envolver_conexion, dispatch_uid='perfilado')
+    for conexion in connections.all(initialized_only=True):
+        _envolver_conexion(conexion)
+    BaseSerializer.data = property(_medido('serializacion', BaseSerializer.data.fget))
+    Request._authenticate = _medido('autenticacion', Request._authenticate)
+
+
+def _motivos(perfil):
+    limites = [
+        ('total_ms', perfil.total, getattr(settings, 'PERFILADO_LENTO_MS', 500)),
+        ('consultas', perfil.consultas, getattr(settings, 'PERFILADO_CONSULTAS_MAX', 50)),
+        ('duplicadas', perfil.duplicadas, getattr(settings, 'PERFILADO_DUPLICADAS_MAX', 5)),
+    ]
+    return [nombre for nombre, valor, limite in limites if valor > limite]
+
+
+def registrar_lenta(request, respuesta, perfil, motivos):
+    repetidas = [
+        {'sql': sql[:300], 'veces': n}
+        for (sql, _), n in perfil.sentencias.most_common(3)
+        if n > 1
+    ]
+    datos = {
+        'metodo': request.method,
+        'ruta': request.get_full_path(),
+        'estado': respuesta.status_code,
+        'motivos': motivos,
+        'total_ms': round(perfil.total, 2),
+        **{f'{nombre}_ms': round(perfil.tiempos[nombre], 2) for nombre in MEDIDAS},
+        'consultas': perfil.consultas,
+        'duplicadas': perfil.duplicadas,
+        'repetidas': repetidas,
+    }
+    logger.warning(
+        'Petición lenta %s', json.dumps(datos, ensure_ascii=False), extra={'perfil': datos}
+    )
+
+
+class PerfiladoMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFILADO', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.cprofile_cada = getattr(settings, 'PERFILADO_CPROFILE_CADA', 0)
+        self.cprofile_dir = str(getattr(settings, 'PERFILADO_CPROFILE_DIR', 'perfiles'))
+        self.contador = itertools.count(1)
+        instalar()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        perfil, token, perfilador = self.iniciar()
+        try:
+            respuesta = self.get_response(request)
+        finally:
+            _actual.reset(token)
+            if perfilador is not None:
+                perfilador.disable()
+        return self.terminar(request, respuesta, perfil, perfilador)
+
+    async def __acall__(self, request):
+        perfil, token, perfilador = self.iniciar()
+        try:
+            respuesta = await self.get_response(request)
+        finally:
+            _actual.reset(token)
+            if perfilador is not None:
+                perfilador.disable()
+        return self.terminar(request, respuesta, perfil, perfilador)
+
+    def iniciar(self):
+        perfil = Perfil()
+        token = _actual.set(perfil)
+        perfilador = None
+        if self.cprofile_cada and next(self.contador) % self.cprofile_cada == 0:
+            perfilador = cProfile.Profile()
+            try:
+                perfilador.enable()
+            except ValueError:
+                # Otro perfilador activo en el proceso (p. ej. petición concurrente).
+                perfilador = None
+        return perfil, token, perfilador
+
+    def terminar(self, request, respuesta, perfil, perfilador):
+        perfil.terminar()
+        if perfilador is not None:
+            self.guardar_cprofile(request, perfil, perfilador)
+        respuesta['Server-Timing'] = perfil.server_timing()
+        motivos = _motivos(perfil)
+        if motivos:
+            registrar_lenta(request, respuesta, perfil, motivos)
+        return respuesta
+
+    def guardar_cprofile(self, request, perfil, perfilador):
+        os.makedirs(self.cprofile_dir, exist_ok=True)
+        ruta = re.sub(r'[^A-Za-z0-9]+', '_', request.path).strip('_')[:80] or 'raiz'
+        nombre = f'{time.time_ns()}-{request.method}-{ruta}-{perfil.total:.0f}ms.prof'
+        perfilador.dump_stats(os.path.join(self.cprofile_dir, nombre))
@@ -0,0 +1,217 @@
+"""Benchmarks de los endpoints más usados con presupuesto de consultas.
+
+Cada ``Benchmark`` pide una ruta ``repeticiones`` veces dentro del proceso
+(cliente de pruebas de Django, sin red) y registra la latencia y el número de
+consultas SQL de cada petición. Una vista que pasa su ``consultas`` máximo
+tiene un N+1; en SQLite además se corre ``EXPLAIN QUERY PLAN`` sobre las
+consultas capturadas y se anotan las tablas recorridas completas (``SCAN``
+sin índice), que con el volumen de ``seed_synthetic`` son las que se notan.
+
+Las rutas públicas pasan por la cache de respuestas: cada petición agrega
+``_=<n>`` a la URL para que la cache no la encuentre y se mida la vista. Las
+del inventario piden sesión: el cliente se autentica como un administrador
+en memoria (no se guarda en la base).
+
+``comparar()`` contrasta dos reportes (JSON de ``manage.py run_benchmarks``)
+y lista latencias que empeoraron más de la tolerancia, consultas de más y
+escaneos nuevos.
+"""
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .carga import PERCENTILES, percentiles
+
+# Diferencia mínima en ms para contar una regresión de latencia (ruido).
+MARGEN_MS = 1.0
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    nombre: str
+    ruta: str
+    consultas: int
+    app: str
+
+
+BENCHMARKS = [
+    Benchmark('items_disponibles', '/api/inventario/items/reports/available/', 1, 'inventario'),
+    Benchmark('items_prestados', '/api/inventario/items/reports/loaned/', 1, 'inventario'),
+    Benchmark('items_resumen', '/api/inventario/items/reports/summary/', 1, 'inventario'),
+    Benchmark('prestamos_historial', '/api/inventario/prestamos/history/?page_size=100', 1, 'inventario'),
+    Benchmark('prestamos_vencidos', '/api/inventario/prestamos/overdue/?page_size=100', 1, 'inventario'),
+    Benchmark('prestamos_item', '/api/inventario/items/{item}/loans/?page_size=100', 1, 'inventario'),
+    Benchmark('publicaciones_ultimas', '/api/informacion/publicaciones/ultimas/', 1, 'informacion'),
+    Benchmark(
+        'publicaciones_usuario',
+        '/api/informacion/publicaciones/{usuario}/Publicaciones/',
+        2,
+        'informacion',
+    ),
+    Benchmark('publicaciones_libros', '/api/informacion/libros/?page_size=100', 1, 'informacion'),
+    Benchmark('busqueda', '/api/informacion/publicaciones/buscar/?q={q}', 2, 'informacion'),
+    Benchmark(
+        'estadisticas',
+        '/api/informacion/publicaciones/estadisticas/?agrupar=anio,tipo',
+        1,
+        'informacion',
+    ),
+]
+
+
+def disponibles(solo=None):
+    """Benchmarks de las apps cargadas, opcionalmente filtrados por nombre."""
+    modulos = getattr(settings, 'MODULOS_IOTIC', ())
+    return [
+        b for b in BENCHMARKS
+        if b.app in modulos and apps.is_installed(b.app) and (not solo or b.nombre in solo)
+    ]
+
+
+def parametros():
+    """Valores para las rutas: el item con más préstamos y el usuario con más publicaciones."""
+    valores = {'item': 0, 'usuario': 0, 'q': 'sensores'}
+    if apps.is_installed('inventario'):
+        Prestamo = apps.get_model('inventario', 'Prestamo')
+        fila = (
+            Prestamo.objects.order_by().values('item_id')
+            .annotate(n=Count('id')).order_by('-n').first()
+        )
+        valores['item'] = fila['item_id'] if fila else 0
+    if apps.is_installed('informacion'):
+        Productividad = apps.get_model('informacion', 'Productividad')
+        fila = (
+            Productividad.objects.filter(usuario__isnull=False).order_by()
+            .values('usuario_id').annotate(n=Count('id')).order_by('-n').first()
+        )
+        valores['usuario'] = fila['usuario_id'] if fila else 0
+    return valores
+
+
+def volumenes():
+    modelos = {
+        'usuarios': ('usuarios', 'Usuario'),
+        'items': ('inventario', 'Item'),
+        'prestamos': ('inventario', 'Prestamo'),
+        'publicaciones': ('informacion', 'Productividad'),
+    }
+    return {
+        nombre: apps.get_model(*modelo).objects.count()
+        for nombre, modelo in modelos.items()
+        if apps.is_installed(modelo[0])
+    }
+
+
+def escaneos(conexion, consultas):
+    """Tablas que el plan de ``consultas`` recorre completas, sin índice."""
+    tablas = set(conexion.introspection.table_names())
+    encontrados = set()
+    with conexion.cursor() as cursor:
+        for consulta in consultas:
+            sql = consulta['sql']
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            if conexion.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                for *_, detalle in cursor.fetchall():
+                    # "SCAN tabla" sin "USING ... INDEX"; FTS5 aparece como VIRTUAL TABLE.
+                    partes = detalle.split()
+                    if partes[0] != 'SCAN' or partes[1] not in tablas:
+                        continue
+                    if not {'USING', 'VIRTUAL'} & set(partes):
+                        encontrados.add(partes[1])
+            elif conexion.vendor == 'postgresql':
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+                pendientes = [cursor.fetchone()[0][0]['Plan']]
+                while pendientes:
+                    nodo = pendientes.pop()
+                    if nodo['Node Type'] == 'Seq Scan':
+                        encontrados.add(nodo['Relation Name'])
+                    pendientes.extend(nodo.get('Plans', ()))
+    return sorted(encontrados)
+
+
+def _host():
+    hosts = [h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+
+def cliente_con_sesion():
+    cliente = APIClient(HTTP_HOST=_host())
+    Usuario = apps.get_model('usuarios', 'Usuario')
+    cliente.force_authenticate(Usuario(nombre='Benchmarks', rol='admin'))
+    return cliente
+
+
+def medir(benchmark, valores, repeticiones, cliente=None):
+    """Resultado de un benchmark: estados, consultas, percentiles y escaneos."""
+    cliente = cliente or cliente_con_sesion()
+    conexion = connections['default']
+    ruta = benchmark.ruta.format(**valores)
+    separador = '&' if '?' in ruta else '?'
+    # La primera petición carga versiones, permisos y el índice en memoria.
+    cliente.get(f'{ruta}{separador}_=calentamiento')
+    latencias, consultas, estados, capturadas = [], [], Counter(), []
+    for i in range(repeticiones):
+        with CaptureQueriesContext(conexion) as contexto:
+            inicio = time.perf_counter()
+            respuesta = cliente.get(f'{ruta}{separador}_={i}')
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        consultas.append(len(contexto))
+        estados[respuesta.status_code] += 1
+        capturadas = contexto.captured_queries
+    return {
+        'nombre': benchmark.nombre,
+        'ruta': ruta,
+        'estados': {str(e): n for e, n in sorted(estados.items())},
+        'consultas': max(consultas, default=0),
+        'presupuesto': benchmark.consultas,
+        'excede': max(consultas, default=0) > benchmark.consultas,
+        **percentiles(latencias),
+        'escaneos': escaneos(conexion, capturadas),
+    }
+
+
+def ejecutar(repeticiones=20, solo=None):
+    """Corre los benchmarks disponibles y devuelve el reporte completo."""
+    valores = parametros()
+    cliente = cliente_con_sesion()
+    return {
+        'fecha': timezone.now().isoformat(),
+        'motor': connections['default'].vendor,
+        'repeticiones': repeticiones,
+        'volumenes': volumenes(),
+        'resultados': [medir(b, valores, repeticiones, cliente) for b in disponibles(solo)],
+    }
+
+
+def comparar(actual, anterior, tolerancia=0.25):
+    """Regresiones de ``actual`` frente a ``anterior`` (reportes de ``ejecutar``)."""
+    previos = {r['nombre']: r for r in anterior.get('resultados', [])}
+    regresiones = []
+    for resultado in actual['resultados']:
+        previo = previos.get(resultado['nombre'])
+        if previo is None:
+            continue
+        nombre = resultado['nombre']
+        if resultado['consultas'] > previo['consultas']:
+            regresiones.append(
+                f'{nombre}: {resultado["consultas"]} consultas (antes {previo["consultas"]})'
+            )
+        for p in PERCENTILES:
+            llave = f'p{p}'
+            antes, ahora = previo[llave], resultado[llave]
+            if ahora > antes * (1 + tolerancia) and ahora - antes > MARGEN_MS:
+                regresiones.append(f'{nombre}: {llave} {ahora:.2f} ms (antes {antes:.2f} ms)')
+        nuevos = sorted(set(resultado['escaneos']) - set(previo['escaneos']))
+        if nuevos:
+            regresiones.append(f'{nombre}: recorre completa(s) {", ".join(nuevos)}')
+    return regresiones
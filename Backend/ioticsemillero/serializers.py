@@ -0,0 +1,12 @@
+from .filters import campos_pedidos
+
+
+class CamposParcialesMixin:
+    """Serializador que respeta ``?fields=`` (sparse fieldsets) en los GET."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        pedidos = campos_pedidos(self.context.get('request'))
+        if pedidos:
+            for nombre in set(self.fields) - pedidos:
+                self.fields.pop(nombre)
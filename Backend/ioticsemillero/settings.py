@@ -10,22 +10,33 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
+
+from .modulos import resolver
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# La app usuarios vive dentro del proyecto roles; se expone como paquete de primer nivel.
+sys.path.insert(0, str(BASE_DIR / 'roles'))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-f-=z071ndpnkiovl%&qhkyur-ggua-v6+9l&z0(#ysima4)g!u'
+SECRET_KEY = config(
+    'SECRET_KEY', default='django-insecure-f-=z071ndpnkiovl%&qhkyur-ggua-v6+9l&z0(#ysima4)g!u'
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = config('DEBUG', default=True, cast=bool)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='', cast=Csv())
 
 
 # Application definition
@@ -37,11 +48,25 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'corsheaders',
+    'rest_framework',
+    'trabajos',
+    # Comandos del proyecto (seed_synthetic, run_benchmarks, load_test).
+    'ioticsemillero',
 ]
 
+# Apps de dominio que sirve este proceso (todas si IOTIC_APPS está vacía);
+# ver ioticsemillero/modulos.py.
+MODULOS_IOTIC = resolver(config('IOTIC_APPS', default='', cast=Csv()))
+INSTALLED_APPS += MODULOS_IOTIC
+
 MIDDLEWARE = [
+    # Primero para que sus tiempos incluyan al resto; apagados (PERFILADO, METRICAS) se retiran.
+    'ioticsemillero.perfilado.PerfiladoMiddleware',
+    'ioticsemillero.metricas.MetricasMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -67,18 +92,171 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'ioticsemillero.wsgi.application'
+ASGI_APPLICATION = 'ioticsemillero.asgi.application'
+
+# Con un servidor ASGI (uvicorn) las rutas que esperan E/S usan vistas
+# asíncronas; ver ioticsemillero/asincrono.py.
+IOTIC_ASGI = config('IOTIC_ASGI', default=False, cast=bool)
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-
-DATABASES = {
+# DB_ENGINE: sqlite (por defecto, archivo en DB_NAME) o postgresql (DB_NAME,
+# DB_USER, DB_PASSWORD, DB_HOST, DB_PORT).
+
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+# Un solo proceso para todas las apps: las conexiones se reutilizan entre
+# peticiones en vez de abrirse una por petición. Con ASGI cada petición puede
+# usar otro hilo: sin conexiones persistentes (use DB_POOL en PostgreSQL).
+CONN_MAX_AGE = config('CONN_MAX_AGE', default=0 if IOTIC_ASGI else 60, cast=int)
+
+if DB_ENGINE == 'sqlite':
+    # Cada conexión nueva: WAL (lectores y un escritor a la vez), fsync solo
+    # en los checkpoints, espera a que se libere el candado en vez de fallar
+    # con "database is locked" y lecturas por mmap. Las transacciones toman
+    # el candado de escritura al empezar (IMMEDIATE): así la espera ocurre en
+    # BEGIN y no al querer escribir a mitad de una transacción, donde SQLite
+    # no puede esperar y falla.
+    PRAGMAS_SQLITE = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': config('DB_BUSY_TIMEOUT', default=20_000, cast=int),
+        'mmap_size': config('DB_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),
+    }
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'init_command': ';'.join(f'PRAGMA {n}={v}' for n, v in PRAGMAS_SQLITE.items()),
+                'transaction_mode': config('DB_TRANSACTION_MODE', default='IMMEDIATE'),
+            },
+        }
+    }
+elif DB_ENGINE == 'postgresql':
+    # DB_POOL=True usa el pool de psycopg 3 (paquete psycopg[pool]); con pool
+    # Django no admite CONN_MAX_AGE, cada petición toma y devuelve conexiones.
+    DB_POOL = config('DB_POOL', default=False, cast=bool)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='iotic'),
+            'USER': config('DB_USER', default='iotic'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='127.0.0.1'),
+            'PORT': config('DB_PORT', default='5432'),
+            'CONN_MAX_AGE': 0 if DB_POOL else CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+            },
+        }
+    }
+    if DB_POOL:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+else:
+    raise ImproperlyConfigured(f'DB_ENGINE inválido: {DB_ENGINE!r} (use sqlite o postgresql)')
+
+
+# Cache compartida por todas las apps del proceso.
+# CACHE_BACKEND: locmem (por defecto, un proceso), file (directorio en
+# CACHE_LOCATION) o redis (URL en CACHE_LOCATION; requiere el paquete redis).
+# Con varios workers use file o redis para que las invalidaciones se vean
+# en todos.
+
+BACKENDS_CACHE = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'ioticsemillero'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+if CACHE_BACKEND not in BACKENDS_CACHE:
+    raise ImproperlyConfigured(
+        f'CACHE_BACKEND: {CACHE_BACKEND!r}; opciones: {", ".join(BACKENDS_CACHE)}'
+    )
+_backend_cache, _ubicacion_cache = BACKENDS_CACHE[CACHE_BACKEND]
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': _backend_cache,
+        'LOCATION': config('CACHE_LOCATION', default=_ubicacion_cache),
     }
 }
 
+# Respuestas de las lecturas públicas (ver ioticsemillero/cache.py). Se
+# invalidan al escribir, así que el tiempo de vida es solo un respaldo.
+RESPUESTAS_CACHE = 'default'
+RESPUESTAS_CACHE_TIMEOUT = config('RESPUESTAS_CACHE_TIMEOUT', default=600, cast=int)
+
+
+# Django REST framework
+# Las listas se paginan por cursor (enlaces en la cabecera Link) solo si se
+# pide ?cursor= o ?page_size= (PAGE_SIZE es el tamaño por defecto); sin ellos
+# van completas. Aceptan filtros declarados por vista y ?fields= para recortar
+# la respuesta.
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'usuarios.autenticacion.FirebaseAuthentication',
+    ],
+    # Escribir pide sesión y el permiso que declare la vista (permisos_requeridos).
+    # Leer es público salvo en las vistas que también declaran permiso para
+    # leer (usuarios, inventario y préstamos).
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.IsAuthenticatedOrReadOnly',
+        'usuarios.permisos.TienePermiso',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'ioticsemillero.pagination.PaginacionPorCursor',
+    'PAGE_SIZE': 100,
+    'DEFAULT_FILTER_BACKENDS': [
+        'ioticsemillero.filters.FiltroPorCampos',
+        'ioticsemillero.filters.SeleccionDeCampos',
+    ],
+}
+
+# Autenticación con ID tokens de Firebase (ver usuarios/autenticacion.py).
+
+FIREBASE_PROJECT_ID = config('FIREBASE_PROJECT_ID', default='')
+
+CORS_ALLOWED_ORIGINS = [
+    'http://localhost:4200',
+]
+
+CORS_EXPOSE_HEADERS = ['Link']
+
+# Perfilado por petición (ver ioticsemillero/perfilado.py); apagado no cuesta nada.
+
+PERFILADO = config('PERFILADO', default=False, cast=bool)
+PERFILADO_LENTO_MS = config('PERFILADO_LENTO_MS', default=500, cast=float)
+PERFILADO_CONSULTAS_MAX = config('PERFILADO_CONSULTAS_MAX', default=50, cast=int)
+PERFILADO_DUPLICADAS_MAX = config('PERFILADO_DUPLICADAS_MAX', default=5, cast=int)
+PERFILADO_CPROFILE_CADA = config('PERFILADO_CPROFILE_CADA', default=0, cast=int)
+PERFILADO_CPROFILE_DIR = config('PERFILADO_CPROFILE_DIR', default=str(BASE_DIR / 'perfiles'))
+
+# Métricas en /metrics para Prometheus (ver ioticsemillero/metricas.py). Con varios
+# workers, METRICAS_DIR es un directorio compartido donde cada proceso vuelca las suyas.
+
+METRICAS = config('METRICAS', default=False, cast=bool)
+METRICAS_DIR = config('METRICAS_DIR', default='')
+METRICAS_INTERVALO = config('METRICAS_INTERVALO', default=1.0, cast=float)
+METRICAS_TOKEN = config('METRICAS_TOKEN', default='')
+
+# Cola de trabajos en segundo plano en la base de datos (ver trabajos/cola.py); los
+# ejecuta `manage.py run_workers`. TRABAJOS_PERIODOS cambia el periodo en segundos
+# de una tarea periódica (0 la apaga), p. ej. {'inventario.tareas.marcar_vencidos': 60}.
+# Un trabajo en curso sin latido por TRABAJOS_VENCIMIENTO segundos se da por abandonado.
+
+TRABAJOS_VENCIMIENTO = config('TRABAJOS_VENCIMIENTO', default=300, cast=int)
+TRABAJOS_REINTENTO_BASE = config('TRABAJOS_REINTENTO_BASE', default=10, cast=float)
+TRABAJOS_REINTENTO_MAXIMO = config('TRABAJOS_REINTENTO_MAXIMO', default=3600, cast=float)
+TRABAJOS_PERIODOS = {}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -116,6 +294,21 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Subidas de imágenes y archivos (ver informacion/almacenamiento.py). Con
+# R2_BUCKET se firman URLs para el bucket R2/S3; sin él se guardan en
+# MEDIA_ROOT a través del propio backend (desarrollo).
+
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+R2_ENDPOINT = config('R2_ENDPOINT', default='')
+R2_BUCKET = config('R2_BUCKET', default='')
+R2_ACCESS_KEY_ID = config('R2_ACCESS_KEY_ID', default='')
+R2_SECRET_ACCESS_KEY = config('R2_SECRET_ACCESS_KEY', default='')
+R2_REGION = config('R2_REGION', default='auto')
+# Dominio público del bucket (p. ej. https://pub-xxx.r2.dev).
+R2_URL_PUBLICA = config('R2_URL_PUBLICA', default='')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
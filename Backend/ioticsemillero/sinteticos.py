@@ -0,0 +1,238 @@
+"""Datos sintéticos con volúmenes realistas para medir rendimiento.
+
+``sembrar()`` crea usuarios, items con su historial de préstamos y
+publicaciones de todos los tipos con una semilla fija, así dos corridas con
+los mismos parámetros producen los mismos datos. Se escribe con
+``bulk_create`` y al final se reconstruyen las tablas derivadas (resumen del
+inventario, préstamo activo de cada item, índice de búsqueda, últimas
+publicaciones y estadísticas) con las mismas funciones que usan los comandos
+``rebuild_*``.
+
+Pensado para una base aparte (``DB_NAME=bench.sqlite3``): los registros se
+reconocen por el prefijo ``sintetico`` y no se borran.
+"""
+import random
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+PREFIJO = 'sintetico'
+VOLUMENES = {'usuarios': 300, 'items': 5_000, 'prestamos': 100_000, 'publicaciones': 30_000}
+TAMANO_LOTE = 2_000
+
+NOMBRES = [
+    'Ana', 'Beto', 'Carla', 'Darío', 'Elena', 'Felipe', 'Gloria', 'Hugo', 'Irene', 'Julián',
+    'Karen', 'Luis', 'María', 'Nicolás', 'Olga', 'Pablo', 'Quintín', 'Rosa', 'Sergio', 'Tatiana',
+]
+APELLIDOS = [
+    'Arias', 'Bermúdez', 'Castro', 'Díaz', 'Escobar', 'Fajardo', 'Gómez', 'Hurtado', 'Ibarra',
+    'Jaramillo', 'López', 'Muñoz', 'Narváez', 'Ortiz', 'Patiño', 'Quintero', 'Rojas', 'Salazar',
+]
+COMPONENTES = [
+    'Arduino Uno', 'Arduino Mega', 'ESP32', 'ESP8266', 'Raspberry Pi 4', 'Raspberry Pi Pico',
+    'Sensor DHT22', 'Sensor ultrasónico HC-SR04', 'Sensor PIR', 'Módulo relé', 'Servomotor SG90',
+    'Motor paso a paso', 'Driver L298N', 'Pantalla OLED', 'Pantalla LCD 16x2', 'Módulo RFID',
+    'Módulo GPS', 'Módulo LoRa', 'Módulo Bluetooth HC-05', 'Protoboard', 'Multímetro',
+    'Fuente de laboratorio', 'Osciloscopio', 'Cautín', 'Kit de cables', 'Cámara OV7670',
+    'Acelerómetro MPU6050', 'Sensor de gas MQ-2', 'Sensor de humedad de suelo', 'Batería LiPo',
+]
+TEMAS = [
+    'internet de las cosas', 'sensores inalámbricos', 'agricultura de precisión',
+    'monitoreo ambiental', 'redes LoRaWAN', 'ciudades inteligentes', 'domótica',
+    'computación en el borde', 'aprendizaje automático', 'visión por computador',
+    'calidad del aire', 'energía solar', 'robótica educativa', 'telemedicina',
+    'seguridad en IoT', 'gemelos digitales', 'riego automatizado', 'trazabilidad',
+]
+ENFOQUES = ['Diseño de', 'Evaluación de', 'Prototipo para', 'Análisis de', 'Plataforma de']
+# País y peso relativo.
+PAISES = [('Colombia', 70), ('México', 8), ('España', 6), ('Perú', 5), ('Chile', 4), ('Brasil', 4),
+          ('Argentina', 3)]
+
+
+def _instalada(app):
+    return app in getattr(settings, 'MODULOS_IOTIC', ()) and apps.is_installed(app)
+
+
+def _lotes(objetos, tamano=TAMANO_LOTE):
+    lote = []
+    for objeto in objetos:
+        lote.append(objeto)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def ya_sembrado():
+    Usuario = apps.get_model('usuarios', 'Usuario')
+    return Usuario.objects.filter(uid_firebase__startswith=f'{PREFIJO}-').exists()
+
+
+def sembrar_usuarios(cantidad, azar):
+    Usuario = apps.get_model('usuarios', 'Usuario')
+    roles = ['estudiante'] * 8 + ['mentor', 'admin']
+    Usuario.objects.bulk_create(
+        (
+            Usuario(
+                uid_firebase=f'{PREFIJO}-{i}',
+                nombre=azar.choice(NOMBRES),
+                apellido=azar.choice(APELLIDOS),
+                email=f'{PREFIJO}{i}@iotic.test',
+                rol=azar.choice(roles),
+                estado=azar.random() > 0.05,
+            )
+            for i in range(cantidad)
+        ),
+        batch_size=500,
+    )
+    return list(
+        Usuario.objects.filter(uid_firebase__startswith=f'{PREFIJO}-').values_list('id', flat=True)
+    )
+
+
+def sembrar_inventario(items, prestamos, azar, ahora):
+    """Items y su historial; algunos quedan prestados (unos vencidos) y pocos sin prestar."""
+    from inventario.disponibilidad import reconstruir
+    from inventario.models import Item, Prestamo
+
+    for lote in _lotes(
+        Item(
+            serial=f'{PREFIJO.upper()}-{i:07d}',
+            descripcion=azar.choice(COMPONENTES),
+            estado_admin=Item.NO_PRESTAR if azar.random() < 0.03 else Item.DISPONIBLE,
+            estado_fisico=azar.choice(['Bueno'] * 6 + ['Regular', 'Dañado']),
+        )
+        for i in range(items)
+    ):
+        Item.objects.bulk_create(lote)
+    ids = list(
+        Item.objects.filter(serial__startswith=f'{PREFIJO.upper()}-', estado_admin=Item.DISPONIBLE)
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    if not ids or not prestamos:
+        reconstruir()
+        return
+
+    # El último préstamo de ~8 % de los items sigue activo; el resto está devuelto.
+    en_prestamo = set(azar.sample(ids, max(1, len(ids) // 12)))
+    pendientes = set(en_prestamo)
+    primero = None
+
+    def generar():
+        for i in range(prestamos):
+            restantes = prestamos - i
+            if restantes <= len(pendientes):
+                item_id, activo = pendientes.pop(), True
+            else:
+                item_id = azar.choice(ids)
+                activo = False
+            # Los más recientes del historial quedan al final (ids crecientes).
+            limite = ahora - timedelta(days=3 * 365 * restantes / prestamos) + timedelta(days=7)
+            if activo:
+                limite = ahora + timedelta(hours=azar.randint(-96, 240))
+            yield Prestamo(
+                item_id=item_id,
+                nombre_persona=f'{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}',
+                cedula=str(azar.randint(10_000_000, 1_999_999_999)),
+                correo=f'persona{azar.randint(1, 5_000)}@correo.test',
+                fecha_limite=limite,
+                fecha_devolucion=None if activo else limite - timedelta(hours=azar.randint(0, 72)),
+                estado=Prestamo.PRESTADO if activo else Prestamo.DEVUELTO,
+            )
+
+    for lote in _lotes(generar()):
+        creados = Prestamo.objects.bulk_create(lote)
+        primero = primero or creados[0].pk
+    # fecha_prestamo es auto_now_add: se corrige en una sola sentencia.
+    Prestamo.objects.filter(pk__gte=primero).update(
+        fecha_prestamo=F('fecha_limite') - timedelta(days=7)
+    )
+    Prestamo.objects.filter(
+        pk__gte=primero, estado=Prestamo.PRESTADO, fecha_limite__lt=ahora
+    ).update(estado=Prestamo.VENCIDO)
+    reconstruir()
+
+
+def _publicacion(modelo, azar, usuarios):
+    tema = azar.choice(TEMAS)
+    autores = azar.sample(NOMBRES, azar.randint(1, 4))
+    paises, pesos = zip(*PAISES)
+    return modelo(
+        titulo=f'{azar.choice(ENFOQUES)} {tema} {azar.randint(1, 999)}',
+        tipo=modelo.TIPO,
+        tipoProductividad=modelo.ETIQUETA,
+        pais=azar.choices(paises, pesos)[0],
+        anio=str(azar.randint(2010, 2025)),
+        autores=[f'{a} {azar.choice(APELLIDOS)}' for a in autores],
+        usuario_id=azar.choice(usuarios) if usuarios and azar.random() > 0.1 else None,
+    )
+
+
+def sembrar_publicaciones(cantidad, azar, usuarios):
+    """Publicaciones de todos los tipos, repartidas con pesos distintos."""
+    from informacion import estadisticas
+    from informacion.busqueda import obtener_indice
+    from informacion.models import TIPOS_PRODUCTIVIDAD, Productividad
+    from informacion.signals import recalcular_ultima
+    from informacion.versiones import incrementar
+
+    from .cache import invalidar
+
+    modelos = list(TIPOS_PRODUCTIVIDAD.values())
+    pesos = [len(modelos) - i for i in range(len(modelos))]
+    campos_padre = [f.attname for f in Productividad._meta.concrete_fields if not f.primary_key]
+    restantes = cantidad
+    while restantes:
+        lote = [
+            _publicacion(azar.choices(modelos, pesos)[0], azar, usuarios)
+            for _ in range(min(TAMANO_LOTE, restantes))
+        ]
+        restantes -= len(lote)
+        # bulk_create no admite herencia multitabla: la fila común va en bloque
+        # y la de cada tipo se inserta sola, sin señales (raw).
+        padres = Productividad.objects.bulk_create(
+            Productividad(**{c: getattr(p, c) for c in campos_padre}) for p in lote
+        )
+        for padre, hijo in zip(padres, lote):
+            hijo.pk = hijo.productividad_ptr_id = padre.pk
+            # raw no pasa por pre_save: las fechas automáticas se llenan aquí.
+            for campo in hijo._meta.local_concrete_fields:
+                if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False):
+                    campo.pre_save(hijo, True)
+            hijo.save_base(raw=True, force_insert=True)
+
+    indice = obtener_indice()
+    indice.vaciar()
+    for modelo in modelos:
+        for lote in _lotes(modelo.objects.order_by().iterator(chunk_size=TAMANO_LOTE), 500):
+            indice.indexar(lote)
+        recalcular_ultima(modelo.TIPO)
+    estadisticas.reconstruir()
+    recursos = ('publicaciones', *TIPOS_PRODUCTIVIDAD)
+    incrementar(*recursos)
+    invalidar(*recursos, 'usuarios')
+
+
+def sembrar(semilla=42, ahora=None, **volumenes):
+    """Crea los datos de las apps instaladas. Devuelve lo creado por tipo."""
+    volumenes = {**VOLUMENES, **{k: v for k, v in volumenes.items() if v is not None}}
+    azar = random.Random(semilla)
+    ahora = ahora or timezone.now()
+    creados = {}
+    with transaction.atomic():
+        usuarios = sembrar_usuarios(volumenes['usuarios'], azar)
+        creados['usuarios'] = len(usuarios)
+        if _instalada('inventario'):
+            sembrar_inventario(volumenes['items'], volumenes['prestamos'], azar, ahora)
+            creados['items'] = volumenes['items']
+            creados['prestamos'] = volumenes['prestamos']
+        if _instalada('informacion'):
+            sembrar_publicaciones(volumenes['publicaciones'], azar, usuarios)
+            creados['publicaciones'] = volumenes['publicaciones']
+    return creados
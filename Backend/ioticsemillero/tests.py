@@ -0,0 +1,382 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse, JsonResponse
+from django.core.management import call_command
+from django.db import connections
+from django.test import (
+    AsyncRequestFactory,
+    LiveServerTestCase,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from rest_framework.test import APIClient
+from ayudas_pruebas import iniciar_sesion
+from usuarios.models import Usuario
+
+from .cache import cache_publica, invalidar
+from .carga import ejecutar, rutas_sin_cache, separar_objetivo
+from . import metricas
+from .modulos import resolver
+from .perfilado import PerfiladoMiddleware
+from .rendimiento import comparar
+from .sinteticos import sembrar
+
+
+class ModulosTests(SimpleTestCase):
+    def test_por_defecto_todas(self):
+        self.assertEqual(resolver([]), ['usuarios', 'informacion', 'inventario'])
+
+    def test_agrega_dependencias(self):
+        self.assertEqual(resolver(['informacion']), ['usuarios', 'informacion'])
+        self.assertEqual(resolver(['inventario']), ['usuarios', 'inventario'])
+
+    def test_app_desconocida(self):
+        with self.assertRaises(ImproperlyConfigured):
+            resolver(['roles'])
+
+    def test_worker_con_un_subconjunto(self):
+        codigo = (
+            'import json, django; django.setup();'
+            'from django.apps import apps; from django.urls import get_resolver;'
+            'from trabajos.cola import TAREAS;'
+            'print(json.dumps({"apps": [a.label for a in apps.get_app_configs()],'
+            '"rutas": [str(p.pattern) for p in get_resolver().url_patterns],'
+            '"tareas": sorted(TAREAS)}))'
+        )
+        entorno = {**os.environ, 'IOTIC_APPS': 'inventario'}
+        salida = subprocess.run(
+            [sys.executable, '-c', codigo],
+            cwd=settings.BASE_DIR,
+            env=entorno,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        cargado = json.loads(salida.stdout)
+
+        self.assertIn('inventario', cargado['apps'])
+        self.assertNotIn('informacion', cargado['apps'])
+        self.assertEqual(
+            cargado['rutas'],
+            ['admin/', 'api/usuarios/', 'api/inventario/', 'api/trabajos/', 'metrics'],
+        )
+        # Los derivados de los items se encolan y corren sin la app informacion.
+        self.assertIn('informacion.tareas.generar_derivados', cargado['tareas'])
+
+
+class BaseDeDatosTests(SimpleTestCase):
+    databases = {'default'}
+
+    def test_sqlite_en_wal_con_espera(self):
+        base = connections['default']
+        if base.vendor != 'sqlite':
+            self.skipTest('solo SQLite')
+        with tempfile.TemporaryDirectory() as directorio:
+            ajustes = {**base.settings_dict, 'NAME': os.path.join(directorio, 'db.sqlite3')}
+            conexion = type(base)(ajustes)
+            try:
+                with conexion.cursor() as cursor:
+                    valores = {
+                        pragma: cursor.execute(f'PRAGMA {pragma}').fetchone()[0]
+                        for pragma in settings.PRAGMAS_SQLITE
+                    }
+            finally:
+                conexion.close()
+
+        self.assertEqual(valores['journal_mode'], 'wal')
+        self.assertEqual(valores['synchronous'], 1)  # NORMAL
+        self.assertEqual(valores['busy_timeout'], settings.PRAGMAS_SQLITE['busy_timeout'])
+        self.assertEqual(valores['mmap_size'], settings.PRAGMAS_SQLITE['mmap_size'])
+        self.assertEqual(conexion.transaction_mode, 'IMMEDIATE')
+
+
+class CacheRespuestasTests(SimpleTestCase):
+    databases = {'default'}
+
+    def setUp(self):
+        cache.clear()
+        self.llamadas = 0
+        self.factory = RequestFactory()
+
+        @cache_publica('noticia')
+        def vista(request):
+            self.llamadas += 1
+            respuesta = JsonResponse({'llamada': self.llamadas})
+            respuesta['ETag'] = f'"v{self.llamadas}"'
+            return respuesta
+
+        self.vista = vista
+
+    def get(self, **extra):
+        return self.vista(self.factory.get('/api/informacion/noticias/', **extra))
+
+    def test_repite_la_respuesta_hasta_invalidar(self):
+        self.assertEqual(json.loads(self.get().content), {'llamada': 1})
+        self.assertEqual(json.loads(self.get().content), {'llamada': 1})
+
+        invalidar('evento')
+        self.assertEqual(self.llamadas, 1)
+
+        invalidar('noticia')
+        self.assertEqual(json.loads(self.get().content), {'llamada': 2})
+
+    def test_respeta_if_none_match_desde_la_cache(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.llamadas, 1)
+
+    def test_no_cachea_peticiones_autenticadas(self):
+        self.get(HTTP_AUTHORIZATION='Bearer x')
+        self.get(HTTP_AUTHORIZATION='Bearer x')
+        self.assertEqual(self.llamadas, 2)
+
+    def test_la_consulta_es_parte_de_la_llave(self):
+        self.vista(self.factory.get('/api/informacion/noticias/', {'anio': 2024}))
+        self.get()
+        self.assertEqual(self.llamadas, 2)
+
+    def test_vistas_asincronas(self):
+        @cache_publica('noticia')
+        async def vista(request):
+            self.llamadas += 1
+            return JsonResponse({'llamada': self.llamadas})
+
+        obtener = async_to_sync(vista)
+        peticion = AsyncRequestFactory().get('/api/informacion/noticias/')
+        obtener(peticion)
+        self.assertEqual(json.loads(obtener(peticion).content), {'llamada': 1})
+
+        invalidar('noticia')
+        self.assertEqual(json.loads(obtener(peticion).content), {'llamada': 2})
+
+
+class PruebaCargaTests(LiveServerTestCase):
+    def test_mide_a_concurrencia_fija(self):
+        resultado = ejecutar(
+            self.live_server_url,
+            ['/api/informacion/publicaciones/ultimas/', '/no-existe/'],
+            concurrencia=4,
+            duracion=0.3,
+            calentamiento=0,
+        )
+
+        resumen = resultado.resumen()
+        self.assertGreater(resumen['peticiones'], 4)
+        self.assertEqual(set(resumen['estados']), {'200', '404'})
+        self.assertEqual(resumen['errores'], resultado.estados[404])
+        self.assertLessEqual(resumen['p50'], resumen['p99'])
+
+    def test_comando(self):
+        salida = io.StringIO()
+        call_command(
+            'load_test',
+            objetivo=[f'wsgi={self.live_server_url}'],
+            ruta=['/api/informacion/publicaciones/ultimas/'],
+            concurrencia=[2],
+            duracion=0.2,
+            calentamiento=0,
+            stdout=salida,
+        )
+
+        fila = salida.getvalue().splitlines()[1].split()
+        self.assertEqual(fila[:2], ['wsgi', '2'])
+        self.assertEqual(fila[-1], '0')
+
+
+class ObjetivosCargaTests(SimpleTestCase):
+    def test_separa_nombre_y_url(self):
+        self.assertEqual(
+            separar_objetivo('asgi=http://127.0.0.1:8001'), ('asgi', 'http://127.0.0.1:8001')
+        )
+        # Un "=" de la URL no se toma como nombre.
+        url = 'http://lb.local/?backend=asgi'
+        self.assertEqual(separar_objetivo(url), (url, url))
+        self.assertEqual(separar_objetivo(f'lb={url}'), ('lb', url))
+
+    def test_cada_peticion_evita_la_cache(self):
+        rutas = rutas_sin_cache(['/a/', '/b/?x=1'])
+
+        self.assertEqual(
+            [next(rutas) for _ in range(3)], ['/a/?_=0', '/b/?x=1&_=1', '/a/?_=2']
+        )
+
+
+class BenchmarksTests(TestCase):
+    def test_endpoints_dentro_del_presupuesto(self):
+        creados = sembrar(usuarios=5, items=40, prestamos=300, publicaciones=120)
+        self.assertEqual(creados['prestamos'], 300)
+        archivo = os.path.join(tempfile.mkdtemp(), 'bench.json')
+
+        call_command('run_benchmarks', repeticiones=2, json=archivo, stdout=io.StringIO())
+
+        with open(archivo) as entrada:
+            reporte = json.load(entrada)
+        self.assertEqual(reporte['volumenes']['publicaciones'], 120)
+        for resultado in reporte['resultados']:
+            self.assertEqual(resultado['estados'], {'200': 2}, resultado['nombre'])
+            self.assertFalse(resultado['excede'], resultado['nombre'])
+        self.assertEqual(comparar(reporte, reporte), [])
+
+    def test_compara_reportes(self):
+        anterior = {'resultados': [
+            {'nombre': 'a', 'consultas': 1, 'p50': 10.0, 'p90': 12.0, 'p99': 20.0, 'escaneos': []},
+        ]}
+        actual = {'resultados': [
+            {'nombre': 'a', 'consultas': 3, 'p50': 10.5, 'p90': 30.0, 'p99': 20.0,
+             'escaneos': ['inventario_prestamo']},
+            {'nombre': 'nuevo', 'consultas': 9, 'p50': 1, 'p90': 1, 'p99': 1, 'escaneos': []},
+        ]}
+
+        regresiones = comparar(actual, anterior, tolerancia=0.25)
+
+        self.assertEqual(len(regresiones), 3)
+        self.assertIn('3 consultas', regresiones[0])
+        self.assertIn('p90', regresiones[1])
+        self.assertIn('inventario_prestamo', regresiones[2])
+
+
+class PerfiladoTests(TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+
+    def perfilar(self, **ajustes):
+        return override_settings(
+            PERFILADO=True, PERFILADO_CPROFILE_DIR=self.directorio, **ajustes
+        )
+
+    def test_server_timing_log_y_cprofile(self):
+        call_command('seed_synthetic', usuarios=2, items=5, prestamos=10, publicaciones=0,
+                     stdout=io.StringIO())
+        self.client = APIClient()
+        # Los permisos del rol ya en memoria, como en un proceso en marcha.
+        iniciar_sesion(self.client).tiene_permiso('inventario.prestar')
+        with self.perfilar(PERFILADO_LENTO_MS=0, PERFILADO_CPROFILE_CADA=1):
+            with self.assertLogs('ioticsemillero.perfilado', 'WARNING') as registro:
+                respuesta = self.client.get('/api/inventario/prestamos/history/')
+
+        self.assertEqual(respuesta.status_code, 200)
+        timing = respuesta['Server-Timing']
+        for medida in ('total;dur=', 'sql;dur=', 'serializacion;dur=', 'autenticacion;dur='):
+            self.assertIn(medida, timing)
+        self.assertIn('1 consultas, 0 duplicadas', timing)
+        datos = json.loads(registro.records[0].getMessage().split(' ', 2)[2])
+        self.assertEqual(datos['motivos'], ['total_ms'])
+        self.assertEqual(datos['ruta'], '/api/inventario/prestamos/history/')
+        self.assertGreater(datos['serializacion_ms'], 0)
+        perfiles = os.listdir(self.directorio)
+        self.assertEqual(len(perfiles), 1)
+        self.assertIn('api_inventario_prestamos_history', perfiles[0])
+
+    def test_detecta_consultas_duplicadas(self):
+        def vista(request):
+            for _ in range(3):
+                Usuario.objects.filter(pk=1).exists()
+            return HttpResponse()
+
+        with self.perfilar(PERFILADO_DUPLICADAS_MAX=1):
+            with self.assertLogs('ioticsemillero.perfilado', 'WARNING') as registro:
+                respuesta = PerfiladoMiddleware(vista)(RequestFactory().get('/x/'))
+
+        self.assertIn('3 consultas, 2 duplicadas', respuesta['Server-Timing'])
+        datos = registro.records[0].perfil
+        self.assertEqual(datos['motivos'], ['duplicadas'])
+        self.assertEqual(datos['repetidas'][0]['veces'], 3)
+
+    def test_cuenta_consultas_de_vistas_async(self):
+        async def vista(request):
+            await sync_to_async(Usuario.objects.count)()
+            return HttpResponse()
+
+        with self.perfilar():
+            respuesta = async_to_sync(PerfiladoMiddleware(vista))(AsyncRequestFactory().get('/x/'))
+
+        self.assertIn('1 consultas', respuesta['Server-Timing'])
+
+    @override_settings(PERFILADO=False)
+    def test_desactivado_no_agrega_cabecera(self):
+        respuesta = self.client.get('/api/usuarios/roles/')
+
+        self.assertNotIn('Server-Timing', respuesta)
+
+
+@override_settings(METRICAS=True, METRICAS_DIR='')
+class MetricasTests(TestCase):
+    def setUp(self):
+        metricas.registro.limpiar()
+        cache.clear()
+        self.addCleanup(metricas.registro.limpiar)
+
+    def test_expone_peticiones_consultas_y_cache(self):
+        call_command('seed_synthetic', usuarios=2, items=3, prestamos=0, publicaciones=0,
+                     stdout=io.StringIO())
+        self.client = APIClient()
+        iniciar_sesion(self.client).tiene_permiso('inventario.prestar')
+        self.client.get('/api/inventario/items/3/')
+        self.client.get('/api/inventario/items/999999/')
+        self.client.get('/api/informacion/publicaciones/ultimas/')
+        self.client.get('/api/informacion/publicaciones/ultimas/')
+
+        respuesta = self.client.get('/metrics')
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertTrue(respuesta['Content-Type'].startswith('text/plain; version=0.0.4'))
+        texto = respuesta.content.decode()
+        ruta = 'metodo="GET",ruta="api/inventario/items/<int:pk>/"'
+        self.assertIn(f'iotic_peticiones_total{{estado="200",{ruta}}} 1', texto)
+        self.assertIn(f'iotic_peticiones_total{{estado="404",{ruta}}} 1', texto)
+        self.assertIn(f'iotic_peticion_segundos_count{{{ruta}}} 2', texto)
+        self.assertIn(f'iotic_peticion_segundos_bucket{{{ruta},le="+Inf"}} 2', texto)
+        self.assertIn('iotic_db_consultas_total{ruta="api/inventario/items/<int:pk>/"} 2', texto)
+        self.assertIn('iotic_cache_total{cache="respuestas",resultado="acierto"} 1', texto)
+        self.assertIn('iotic_cache_total{cache="respuestas",resultado="fallo"} 1', texto)
+        self.assertIn('# TYPE iotic_trabajos_en_cola gauge', texto)
+
+    def test_suma_procesos_y_descarta_gauges_de_procesos_muertos(self):
+        directorio = tempfile.mkdtemp()
+        vivo = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+        self.addCleanup(vivo.wait)
+        self.addCleanup(vivo.kill)
+        muerto = subprocess.Popen([sys.executable, '-c', 'pass'])
+        muerto.wait()
+        for pid in (vivo.pid, muerto.pid):
+            with open(os.path.join(directorio, f'metricas-{pid}.json'), 'w') as archivo:
+                json.dump({
+                    'pid': pid,
+                    'valores': [
+                        ['iotic_errores_total', [['metodo', 'GET'], ['ruta', 'x/']], 2],
+                        ['iotic_trabajos_en_cola', [['cola', 'derivados']], 3],
+                    ],
+                    'histogramas': [
+                        ['iotic_peticion_segundos', [['metodo', 'GET'], ['ruta', 'x/']],
+                         [1] + [0] * len(metricas.BUCKETS) + [0.004]],
+                    ],
+                }, archivo)
+
+        with self.settings(METRICAS_DIR=directorio):
+            texto = metricas.exponer()
+
+        self.assertIn('iotic_errores_total{metodo="GET",ruta="x/"} 4', texto)
+        self.assertIn('iotic_trabajos_en_cola{cola="derivados"} 3', texto)
+        self.assertIn('iotic_peticion_segundos_bucket{metodo="GET",ruta="x/",le="0.005"} 2', texto)
+        self.assertIn('iotic_peticion_segundos_sum{metodo="GET",ruta="x/"} 0.008', texto)
+
+    @override_settings(METRICAS_TOKEN='secreto')
+    def test_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        autorizada = self.client.get('/metrics', headers={'Authorization': 'Bearer secreto'})
+        self.assertEqual(autorizada.status_code, 200)
+
+    @override_settings(METRICAS=False)
+    def test_desactivadas(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
@@ -14,9 +14,21 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
+
+from . import metricas
+from .modulos import rutas
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    *rutas(settings.MODULOS_IOTIC),
+    path('api/trabajos/', include('trabajos.urls')),
+    path('metrics', metricas.vista, name='metricas'),
 ]
+
+if 'informacion' in settings.MODULOS_IOTIC:
+    # Solo con DEBUG: archivos del almacenamiento local de informacion.
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,3 +1,27 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Permiso, Rol, SincronizacionUsuarios, Usuario
+
+
+@admin.register(Usuario)
+class UsuarioAdmin(admin.ModelAdmin):
+    list_display = ('id', 'nombre', 'apellido', 'email', 'rol', 'estado')
+    search_fields = ('nombre', 'apellido', 'email', 'uid_firebase')
+
+
+@admin.register(SincronizacionUsuarios)
+class SincronizacionUsuariosAdmin(admin.ModelAdmin):
+    list_display = ('id', 'estado', 'procesados', 'creados', 'actualizados', 'creado_en')
+    list_filter = ('estado',)
+
+
+@admin.register(Rol)
+class RolAdmin(admin.ModelAdmin):
+    list_display = ('id', 'nombre')
+    filter_horizontal = ('permisos',)
+
+
+@admin.register(Permiso)
+class PermisoAdmin(admin.ModelAdmin):
+    list_display = ('codigo', 'descripcion')
+    search_fields = ('codigo',)
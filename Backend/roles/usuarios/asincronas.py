@@ -0,0 +1,26 @@
+"""Vistas asíncronas de la sincronización con Firebase (modo ASGI)."""
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework import status
+
+from ioticsemillero.asincrono import api_async, respuesta_json
+
+from .models import SincronizacionUsuarios
+from .serializers import SincronizacionUsuariosSerializer
+from .sincronizacion import iniciar
+
+
+@api_async('POST', permiso='usuarios.gestionar')
+async def sincronizar(request):
+    # iniciar() bloquea filas en una transacción: corre en el hilo de la BD.
+    mensaje, trabajo = await sync_to_async(iniciar)()
+    datos = SincronizacionUsuariosSerializer(trabajo).data
+    return respuesta_json({'message': mensaje, **datos}, status=status.HTTP_202_ACCEPTED)
+
+
+@api_async('GET', 'HEAD', permiso='usuarios.gestionar')
+async def sincronizacion(request, pk):
+    trabajo = await SincronizacionUsuarios.objects.filter(pk=pk).afirst()
+    if trabajo is None:
+        raise Http404
+    return respuesta_json(SincronizacionUsuariosSerializer(trabajo).data)
@@ -0,0 +1,316 @@
+"""Autenticación de DRF con los ID tokens de Firebase.
+
+El token se verifica localmente (firma RS256 con PyJWT) contra las claves
+públicas de Google. Las claves se guardan en memoria durante el ``max-age``
+que indica el endpoint, y cada token ya verificado queda en un LRU junto con
+su usuario hasta que expira, así una petición autenticada normalmente no sale
+a la red ni consulta la base de datos.
+
+Configuración:
+
+- ``FIREBASE_PROJECT_ID``: proyecto de Firebase (audiencia del token). Si está
+  vacío la autenticación queda desactivada y las cabeceras se ignoran.
+- ``FIREBASE_OBTENER_CLAVES``: ruta a la función que descarga las claves;
+  recibe la URL y devuelve ``(jwks, max_age)``. Las pruebas usan una local.
+- ``FIREBASE_CACHE_TOKENS``: tamaño del LRU de tokens verificados.
+
+Si Google no responde (o responde algo inválido) se siguen usando las últimas
+claves buenas aunque hayan vencido, reintentando cada ``ESPERA_RECARGA``
+segundos; sin claves previas la petición falla con 401, no con 500.
+
+Las vistas asíncronas (modo ASGI) usan ``aautenticar``: la recarga de
+claves no bloquea el event loop (httpx si está instalado; si no, la
+descarga va a un hilo) y el usuario se lee con el ORM asíncrono.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import urllib.request
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+
+import jwt
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from ioticsemillero import metricas
+
+from .models import Usuario
+from .permisos import version_actual
+
+logger = logging.getLogger(__name__)
+
+URL_CLAVES = (
+    'https://www.googleapis.com/service_accounts/v1/jwk/'
+    'securetoken@system.gserviceaccount.com'
+)
+# Sin max-age en la respuesta, las claves se vuelven a pedir a la hora.
+MAX_AGE_POR_DEFECTO = 3600
+# Un kid desconocido (rotación de claves) fuerza una recarga, como mucho cada minuto.
+ESPERA_RECARGA = 60
+# Los usuarios cacheados se vuelven a leer al menos cada 5 minutos.
+VIGENCIA_USUARIO = 300
+# Fallas al descargar o leer el JWKS (URLError y las de httpx son OSError).
+ERRORES_CLAVES = (OSError, ValueError, KeyError, jwt.PyJWKError)
+
+
+def obtener_claves_google(url):
+    """Descarga el JWKS y devuelve ``(jwks, max_age)`` según Cache-Control."""
+    with urllib.request.urlopen(url, timeout=5) as respuesta:
+        jwks = json.load(respuesta)
+        cache_control = respuesta.headers.get('Cache-Control', '')
+    return jwks, _max_age(cache_control)
+
+
+async def aobtener_claves_google(url):
+    """Versión asíncrona de ``obtener_claves_google`` (httpx es opcional)."""
+    try:
+        import httpx
+    except ImportError:
+        return await asyncio.to_thread(obtener_claves_google, url)
+    try:
+        async with httpx.AsyncClient(timeout=5) as cliente:
+            respuesta = await cliente.get(url)
+            respuesta.raise_for_status()
+    except httpx.HTTPError as error:
+        raise OSError(f'No se pudieron descargar las claves: {error}') from error
+    return respuesta.json(), _max_age(respuesta.headers.get('Cache-Control', ''))
+
+
+def _max_age(cache_control):
+    encontrado = re.search(r'max-age=(\d+)', cache_control)
+    return int(encontrado.group(1)) if encontrado else MAX_AGE_POR_DEFECTO
+
+
+class ClavesFirebase:
+    """Claves públicas por ``kid``, recargadas al vencer su max-age."""
+
+    def __init__(self, obtener_claves, url=URL_CLAVES, reloj=time.monotonic, aobtener_claves=None):
+        self.obtener_claves = obtener_claves
+        self.aobtener_claves = aobtener_claves or (
+            lambda url: asyncio.to_thread(obtener_claves, url)
+        )
+        self.url = url
+        self.reloj = reloj
+        self.claves = {}
+        self.vence = 0
+        self.ultima_recarga = None
+        self.candado = threading.Lock()
+        # Un asyncio.Lock por event loop (async_to_sync crea loops propios).
+        self.candados_async = weakref.WeakKeyDictionary()
+
+    def clave(self, kid):
+        if self.necesita_recarga(kid):
+            with self.candado:
+                if self.necesita_recarga(kid):
+                    try:
+                        self.recargar()
+                    except ERRORES_CLAVES as error:
+                        self.fallo_recarga(error)
+        return self.claves.get(kid)
+
+    async def aclave(self, kid):
+        if self.necesita_recarga(kid):
+            candado = self.candados_async.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+            async with candado:
+                if self.necesita_recarga(kid):
+                    try:
+                        self.cargar(*await self.aobtener_claves(self.url))
+                    except ERRORES_CLAVES as error:
+                        self.fallo_recarga(error)
+        return self.claves.get(kid)
+
+    def necesita_recarga(self, kid):
+        ahora = self.reloj()
+        if ahora >= self.vence:
+            return True
+        return kid not in self.claves and ahora - self.ultima_recarga >= ESPERA_RECARGA
+
+    def recargar(self):
+        self.cargar(*self.obtener_claves(self.url))
+
+    def fallo_recarga(self, error):
+        """Sigue con las claves que había o rechaza el token; reintenta en un minuto.
+
+        Sin claves previas también se espera ``ESPERA_RECARGA``: las peticiones
+        fallan de inmediato en vez de hacer fila en el candado tras otra descarga.
+        """
+        self.ultima_recarga = self.reloj()
+        self.vence = self.ultima_recarga + ESPERA_RECARGA
+        if not self.claves:
+            logger.error('No se pudieron obtener las claves de Firebase: %s', error)
+            raise AuthenticationFailed('No se pudieron verificar las credenciales') from error
+        logger.warning('Se siguen usando las claves anteriores de Firebase: %s', error)
+
+    def cargar(self, jwks, max_age):
+        self.claves = {
+            jwk['kid']: jwt.PyJWK(jwk, algorithm='RS256').key for jwk in jwks.get('keys', [])
+        }
+        self.ultima_recarga = self.reloj()
+        self.vence = self.ultima_recarga + max_age
+
+
+class CacheTokens:
+    """LRU de token verificado -> (usuario, claims), hasta que el token expira.
+
+    Las entradas se descartan cuando cambia la versión de ``permisos`` (un
+    usuario se editó o desactivó en cualquier worker).
+    """
+
+    def __init__(self, tamano, reloj=time.time):
+        self.tamano = tamano
+        self.reloj = reloj
+        self.entradas = OrderedDict()
+        self.candado = threading.Lock()
+
+    @staticmethod
+    def llave(token):
+        return hashlib.sha256(token.encode()).digest()
+
+    def obtener(self, token):
+        llave = self.llave(token)
+        with self.candado:
+            entrada = self.entradas.get(llave)
+            if entrada is not None and (
+                entrada[0] <= self.reloj() or entrada[1] != version_actual()
+            ):
+                del self.entradas[llave]
+                entrada = None
+            if entrada is not None:
+                self.entradas.move_to_end(llave)
+        metricas.cache('tokens', entrada is not None)
+        return None if entrada is None else entrada[2]
+
+    def guardar(self, token, usuario, claims):
+        vence = min(claims['exp'], self.reloj() + VIGENCIA_USUARIO)
+        with self.candado:
+            self.entradas[self.llave(token)] = (vence, version_actual(), (usuario, claims))
+            self.entradas.move_to_end(self.llave(token))
+            while len(self.entradas) > self.tamano:
+                self.entradas.popitem(last=False)
+
+    def limpiar(self):
+        with self.candado:
+            self.entradas.clear()
+
+
+class VerificadorFirebase:
+    def __init__(self, proyecto, claves, tokens):
+        self.proyecto = proyecto
+        self.claves = claves
+        self.tokens = tokens
+
+    def claims(self, token):
+        return self.decodificar(token, self.claves.clave(self.kid(token)))
+
+    async def aclaims(self, token):
+        return self.decodificar(token, await self.claves.aclave(self.kid(token)))
+
+    @staticmethod
+    def kid(token):
+        try:
+            return jwt.get_unverified_header(token).get('kid')
+        except jwt.InvalidTokenError as error:
+            raise AuthenticationFailed('Token inválido') from error
+
+    def decodificar(self, token, clave):
+        if clave is None:
+            raise AuthenticationFailed('Token firmado con una clave desconocida')
+        try:
+            return jwt.decode(
+                token,
+                clave,
+                algorithms=['RS256'],
+                audience=self.proyecto,
+                issuer=f'https://securetoken.google.com/{self.proyecto}',
+                options={'require': ['exp', 'iat', 'sub']},
+                leeway=10,
+            )
+        except jwt.ExpiredSignatureError as error:
+            raise AuthenticationFailed('El token expiró') from error
+        except jwt.InvalidTokenError as error:
+            raise AuthenticationFailed('Token inválido') from error
+
+    def autenticar(self, token):
+        cacheado = self.tokens.obtener(token)
+        if cacheado is not None:
+            return cacheado
+        claims = self.claims(token)
+        usuario = Usuario.objects.filter(uid_firebase=claims['sub']).first()
+        return self.aceptar(token, usuario, claims)
+
+    async def aautenticar(self, token):
+        cacheado = self.tokens.obtener(token)
+        if cacheado is not None:
+            return cacheado
+        claims = await self.aclaims(token)
+        usuario = await Usuario.objects.filter(uid_firebase=claims['sub']).afirst()
+        return self.aceptar(token, usuario, claims)
+
+    def aceptar(self, token, usuario, claims):
+        if usuario is None:
+            raise AuthenticationFailed('Usuario no registrado')
+        if not usuario.estado:
+            raise AuthenticationFailed('Usuario inactivo')
+        self.tokens.guardar(token, usuario, claims)
+        return usuario, claims
+
+
+@lru_cache(maxsize=None)
+def obtener_verificador():
+    """Verificador compartido por el proceso, o None si Firebase no está configurado."""
+    proyecto = getattr(settings, 'FIREBASE_PROJECT_ID', '')
+    if not proyecto:
+        logger.warning('FIREBASE_PROJECT_ID vacío: la autenticación con Firebase está desactivada')
+        return None
+    ruta = getattr(settings, 'FIREBASE_OBTENER_CLAVES', None)
+    if ruta:
+        claves = ClavesFirebase(import_string(ruta))
+    else:
+        claves = ClavesFirebase(obtener_claves_google, aobtener_claves=aobtener_claves_google)
+    return VerificadorFirebase(
+        proyecto,
+        claves,
+        CacheTokens(getattr(settings, 'FIREBASE_CACHE_TOKENS', 1024)),
+    )
+
+
+def token_bearer(request):
+    """Token de ``Authorization: Bearer``; None si no hay o Firebase no está configurado."""
+    partes = get_authorization_header(request).split()
+    if not partes or partes[0].lower() != b'bearer' or obtener_verificador() is None:
+        return None
+    if len(partes) != 2:
+        raise AuthenticationFailed('Cabecera Authorization mal formada')
+    try:
+        return partes[1].decode()
+    except UnicodeDecodeError as error:
+        raise AuthenticationFailed('Token inválido') from error
+
+
+async def aautenticar(request):
+    """Equivalente asíncrono de FirebaseAuthentication: ``(usuario, claims)`` o None."""
+    token = token_bearer(request)
+    if token is None:
+        return None
+    return await obtener_verificador().aautenticar(token)
+
+
+class FirebaseAuthentication(BaseAuthentication):
+    """``Authorization: Bearer <ID token de Firebase>`` -> ``request.user`` (Usuario)."""
+
+    def authenticate(self, request):
+        token = token_bearer(request)
+        if token is None:
+            return None
+        return obtener_verificador().autenticar(token)
+
+    def authenticate_header(self, request):
+        return 'Bearer'
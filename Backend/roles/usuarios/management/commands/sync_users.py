@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from usuarios.models import SincronizacionUsuarios
+from usuarios.sincronizacion import TAMANO_PAGINA, sincronizar
+
+
+class Command(BaseCommand):
+    help = 'Sincroniza las cuentas de Firebase con la tabla de usuarios (en línea, para cron).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pagina', type=int, default=TAMANO_PAGINA, help='Cuentas por página.')
+
+    def handle(self, *args, **options):
+        trabajo = sincronizar(SincronizacionUsuarios.objects.create(), tamano=options['pagina'])
+        for error in trabajo.errores:
+            self.stderr.write(str(error))
+        mensaje = (
+            f'{trabajo.procesados} cuentas revisadas: {trabajo.creados} creadas, '
+            f'{trabajo.actualizados} actualizadas, {trabajo.desactivados} desactivadas.'
+        )
+        if trabajo.estado == SincronizacionUsuarios.FALLIDA:
+            self.stderr.write(self.style.ERROR(mensaje))
+        else:
+            self.stdout.write(self.style.SUCCESS(mensaje))
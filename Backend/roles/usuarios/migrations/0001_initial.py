@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Usuario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uid_firebase', models.CharField(max_length=128, unique=True)),
+                ('nombre', models.CharField(max_length=100)),
+                ('apellido', models.CharField(blank=True, max_length=100)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('fechaRegistro', models.DateTimeField(auto_now_add=True)),
+                ('estado', models.BooleanField(default=True)),
+                ('rol', models.CharField(default='estudiante', max_length=30)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:50
+
+from django.db import migrations, models
+
+PERMISOS = {
+    'usuarios.gestionar': 'Crear, editar y desactivar usuarios',
+    'informacion.publicar': 'Crear y editar publicaciones',
+    'inventario.gestionar': 'Registrar y editar items del inventario',
+    'inventario.prestar': 'Registrar préstamos y devoluciones',
+}
+
+ROLES = {
+    'admin': list(PERMISOS),
+    'mentor': ['informacion.publicar', 'inventario.prestar'],
+    'estudiante': [],
+}
+
+
+def crear_roles(apps, schema_editor):
+    Permiso = apps.get_model('usuarios', 'Permiso')
+    Rol = apps.get_model('usuarios', 'Rol')
+    permisos = {
+        codigo: Permiso.objects.get_or_create(codigo=codigo, defaults={'descripcion': texto})[0]
+        for codigo, texto in PERMISOS.items()
+    }
+    for nombre, codigos in ROLES.items():
+        rol, _ = Rol.objects.get_or_create(nombre=nombre)
+        rol.permisos.add(*(permisos[c] for c in codigos))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0002_sincronizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Permiso',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.CharField(max_length=100, unique=True)),
+                ('descripcion', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'ordering': ['codigo'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Rol',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=30, unique=True)),
+                ('permisos', models.ManyToManyField(blank=True, related_name='roles', to='usuarios.permiso')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RunPython(crear_roles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# Permisos que piden las vistas de escritura además de los de 0003_roles.
+PERMISOS = {
+    'informacion.institucional': 'Editar misión, visión, historia, objetivos y valores',
+    'almacenamiento.subir': 'Pedir URLs firmadas para subir imágenes y archivos',
+}
+
+ROLES = {
+    'admin': list(PERMISOS),
+    'mentor': ['almacenamiento.subir'],
+}
+
+
+def agregar_permisos(apps, schema_editor):
+    Permiso = apps.get_model('usuarios', 'Permiso')
+    Rol = apps.get_model('usuarios', 'Rol')
+    permisos = {
+        codigo: Permiso.objects.get_or_create(codigo=codigo, defaults={'descripcion': texto})[0]
+        for codigo, texto in PERMISOS.items()
+    }
+    for nombre, codigos in ROLES.items():
+        rol, _ = Rol.objects.get_or_create(nombre=nombre)
+        rol.permisos.add(*(permisos[c] for c in codigos))
+
+
+def quitar_permisos(apps, schema_editor):
+    apps.get_model('usuarios', 'Permiso').objects.filter(codigo__in=PERMISOS).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0003_roles'),
+    ]
+
+    operations = [
+        migrations.RunPython(agregar_permisos, quitar_permisos),
+    ]
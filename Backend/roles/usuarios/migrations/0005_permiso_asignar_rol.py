@@ -0,0 +1,27 @@
+from django.db import migrations
+
+CODIGO = 'usuarios.asignar_rol'
+
+
+def agregar_permiso(apps, schema_editor):
+    Permiso = apps.get_model('usuarios', 'Permiso')
+    Rol = apps.get_model('usuarios', 'Rol')
+    permiso, _ = Permiso.objects.get_or_create(
+        codigo=CODIGO, defaults={'descripcion': 'Cambiar el rol de un usuario'}
+    )
+    Rol.objects.get_or_create(nombre='admin')[0].permisos.add(permiso)
+
+
+def quitar_permiso(apps, schema_editor):
+    apps.get_model('usuarios', 'Permiso').objects.filter(codigo=CODIGO).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0004_permisos_escritura'),
+    ]
+
+    operations = [
+        migrations.RunPython(agregar_permiso, quitar_permiso),
+    ]
@@ -1,3 +1,86 @@
 from django.db import models
 
-# Create your models here.
+
+class Permiso(models.Model):
+    """Acción que un rol puede realizar, p. ej. ``inventario.prestar``."""
+
+    codigo = models.CharField(max_length=100, unique=True)
+    descripcion = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ['codigo']
+
+    def __str__(self):
+        return self.codigo
+
+
+class Rol(models.Model):
+    """Rol del semillero; ``Usuario.rol`` guarda su nombre."""
+
+    nombre = models.CharField(max_length=30, unique=True)
+    permisos = models.ManyToManyField(Permiso, blank=True, related_name='roles')
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return self.nombre
+
+
+class Usuario(models.Model):
+    """Miembro del semillero, reflejo local de la cuenta de Firebase."""
+
+    uid_firebase = models.CharField(max_length=128, unique=True)
+    nombre = models.CharField(max_length=100)
+    apellido = models.CharField(max_length=100, blank=True)
+    email = models.EmailField(unique=True)
+    fechaRegistro = models.DateTimeField(auto_now_add=True)
+    estado = models.BooleanField(default=True)
+    rol = models.CharField(max_length=30, default='estudiante')
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.nombre} {self.apellido}'.strip()
+
+    # DRF y los permisos de Django esperan estos atributos en request.user.
+    is_authenticated = True
+    is_anonymous = False
+
+    def tiene_permiso(self, codigo):
+        from .permisos import permisos_del_rol
+
+        return codigo in permisos_del_rol(self.rol)
+
+
+class SincronizacionUsuarios(models.Model):
+    """Corrida de la sincronización con Firebase y su avance."""
+
+    PENDIENTE = 'pendiente'
+    EN_CURSO = 'en_curso'
+    TERMINADA = 'terminada'
+    FALLIDA = 'fallida'
+    ESTADOS = [
+        (PENDIENTE, PENDIENTE),
+        (EN_CURSO, EN_CURSO),
+        (TERMINADA, TERMINADA),
+        (FALLIDA, FALLIDA),
+    ]
+
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    paginas = models.PositiveIntegerField(default=0)
+    procesados = models.PositiveIntegerField(default=0)
+    creados = models.PositiveIntegerField(default=0)
+    actualizados = models.PositiveIntegerField(default=0)
+    desactivados = models.PositiveIntegerField(default=0)
+    errores = models.JSONField(default=list, blank=True)
+    creado_en = models.DateTimeField(auto_now_add=True)
+    iniciado_en = models.DateTimeField(null=True, blank=True)
+    terminado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-id']
+
+    def __str__(self):
+        return f'Sincronización {self.pk} ({self.estado})'
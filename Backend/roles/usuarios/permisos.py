@@ -0,0 +1,105 @@
+"""Resolución de permisos por rol con cache en memoria del proceso.
+
+Los permisos efectivos de cada rol se guardan en un diccionario local; así
+revisar un permiso no consulta la base de datos. Para que varios workers
+vean los cambios, la cache lleva una versión guardada en la cache de Django
+(``usuarios:version``). Las señales de Rol, Permiso y Usuario la incrementan
+y cada proceso la vuelve a leer como mucho cada ``REVISION_VERSION`` segundos.
+La misma versión invalida la cache de tokens de ``autenticacion``.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+from rest_framework.permissions import BasePermission
+
+from .models import Rol
+
+LLAVE_VERSION = 'usuarios:version'
+METODOS_ESCRITURA = ('POST', 'PUT', 'PATCH', 'DELETE')
+# Segundos entre lecturas de la versión compartida.
+REVISION_VERSION = 2
+
+_local = {'version': None, 'revisada': 0.0, 'roles': {}}
+_candado = threading.Lock()
+
+
+def _version_inicial():
+    # Si la cache perdió la llave no se vuelve a 1: coincidiría con versiones
+    # que los procesos ya tienen guardadas junto a datos viejos.
+    return time.time_ns()
+
+
+def version_actual():
+    """Versión compartida de roles/usuarios, leída de la cache de Django con throttle."""
+    ahora = time.monotonic()
+    if _local['version'] is None or ahora - _local['revisada'] >= REVISION_VERSION:
+        version = cache.get(LLAVE_VERSION)
+        if version is None:
+            cache.add(LLAVE_VERSION, _version_inicial(), timeout=None)
+            version = cache.get(LLAVE_VERSION)
+        with _candado:
+            if version != _local['version']:
+                _local['roles'] = {}
+            _local['version'] = version
+            _local['revisada'] = ahora
+    return _local['version']
+
+
+def invalidar():
+    """Incrementa la versión compartida y vacía la cache de este proceso."""
+    try:
+        cache.incr(LLAVE_VERSION)
+    except ValueError:
+        cache.add(LLAVE_VERSION, _version_inicial(), timeout=None)
+    with _candado:
+        _local['version'] = None
+        _local['roles'] = {}
+
+
+def permisos_del_rol(nombre):
+    """Conjunto de códigos de permiso del rol ``nombre`` (vacío si no existe)."""
+    version_actual()
+    permisos = _local['roles'].get(nombre)
+    if permisos is None:
+        permisos = frozenset(
+            Rol.objects.filter(nombre=nombre).values_list('permisos__codigo', flat=True)
+        ) - {None}
+        with _candado:
+            _local['roles'][nombre] = permisos
+    return permisos
+
+
+def escritura(codigo, lectura=None):
+    """``permisos_requeridos`` que exige ``codigo`` para crear, editar y borrar.
+
+    Con ``lectura`` también las lecturas piden sesión y ese permiso.
+    """
+    requeridos = dict.fromkeys(METODOS_ESCRITURA, codigo)
+    if lectura is not None:
+        requeridos['*'] = lectura
+    return requeridos
+
+
+def autorizado(usuario, codigo):
+    return bool(usuario and usuario.is_authenticated and usuario.tiene_permiso(codigo))
+
+
+class TienePermiso(BasePermission):
+    """Exige el permiso que la vista declara para el método de la petición.
+
+    La vista define ``permisos_requeridos = {'POST': 'inventario.prestar', ...}``
+    (o ``'*'`` para todos los métodos, o ``escritura(codigo, lectura)``). Sin
+    entrada para el método, se permite; junto con ``IsAuthenticatedOrReadOnly``
+    (en ``DEFAULT_PERMISSION_CLASSES``) las escrituras piden al menos sesión y
+    las lecturas quedan públicas, como las de ``informacion``.
+    """
+
+    message = 'No tiene permiso para realizar esta acción'
+
+    def has_permission(self, request, view):
+        requeridos = getattr(view, 'permisos_requeridos', {})
+        codigo = requeridos.get(request.method, requeridos.get('*'))
+        if codigo is None:
+            return True
+        return autorizado(request.user, codigo)
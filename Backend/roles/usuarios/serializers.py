@@ -0,0 +1,83 @@
+from rest_framework import serializers
+
+from ioticsemillero.serializers import CamposParcialesMixin
+
+from .models import Rol, SincronizacionUsuarios, Usuario
+
+
+class UsuarioSerializer(CamposParcialesMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Usuario
+        fields = [
+            'id',
+            'uid_firebase',
+            'nombre',
+            'apellido',
+            'email',
+            'fechaRegistro',
+            'estado',
+            'rol',
+        ]
+        # El rol cambia solo por RolUsuarioView y el estado por EstadoUsuarioView
+        # (o con la sincronización).
+        read_only_fields = ['uid_firebase', 'fechaRegistro', 'estado', 'rol']
+
+
+class RolUsuarioSerializer(serializers.ModelSerializer):
+    rol = serializers.SlugRelatedField(slug_field='nombre', queryset=Rol.objects.all())
+
+    class Meta:
+        model = Usuario
+        fields = ['rol']
+
+    def update(self, instance, validated_data):
+        instance.rol = validated_data['rol'].nombre
+        instance.save(update_fields=['rol'])
+        return instance
+
+    def to_representation(self, instance):
+        return UsuarioSerializer(instance, context=self.context).data
+
+
+class EstadoUsuarioSerializer(serializers.ModelSerializer):
+    """Activa o desactiva; sin ``estado`` en el cuerpo lo invierte."""
+
+    estado = serializers.BooleanField(required=False)
+
+    class Meta:
+        model = Usuario
+        fields = ['estado']
+
+    def update(self, instance, validated_data):
+        instance.estado = validated_data.get('estado', not instance.estado)
+        instance.save(update_fields=['estado'])
+        return instance
+
+    def to_representation(self, instance):
+        return UsuarioSerializer(instance, context=self.context).data
+
+
+class SincronizacionUsuariosSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SincronizacionUsuarios
+        fields = [
+            'id',
+            'estado',
+            'paginas',
+            'procesados',
+            'creados',
+            'actualizados',
+            'desactivados',
+            'errores',
+            'creado_en',
+            'iniciado_en',
+            'terminado_en',
+        ]
+
+
+class RolSerializer(serializers.ModelSerializer):
+    permisos = serializers.SlugRelatedField(slug_field='codigo', many=True, read_only=True)
+
+    class Meta:
+        model = Rol
+        fields = ['id', 'nombre', 'permisos']
@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from ioticsemillero.cache import invalidar as invalidar_respuestas
+
+from .models import Permiso, Rol, Usuario
+from .permisos import invalidar
+
+
+def _invalidar():
+    # Ya y al confirmar: otro proceso podría volver a leer los datos viejos
+    # mientras la transacción sigue abierta.
+    invalidar()
+    transaction.on_commit(invalidar)
+
+
+@receiver(post_save, sender=Rol)
+@receiver(post_delete, sender=Rol)
+@receiver(post_save, sender=Permiso)
+@receiver(post_delete, sender=Permiso)
+def invalidar_roles(sender, **kwargs):
+    _invalidar()
+
+
+@receiver(m2m_changed, sender=Rol.permisos.through)
+def invalidar_permisos_de_rol(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _invalidar()
+
+
+@receiver(post_save, sender=Usuario)
+@receiver(post_delete, sender=Usuario)
+def invalidar_usuario(sender, created=False, raw=False, **kwargs):
+    # Un usuario nuevo no está en ninguna cache; los cambios de rol o estado sí.
+    if not created and not raw:
+        _invalidar()
+
+
+@receiver(post_delete, sender=Usuario)
+def invalidar_respuestas_usuario(sender, **kwargs):
+    # Las publicaciones por usuario cacheadas dejan de existir con él.
+    invalidar_respuestas('usuarios')
@@ -0,0 +1,286 @@
+"""Sincronización de las cuentas de Firebase con la tabla de usuarios.
+
+Las cuentas llegan por páginas desde un proveedor de identidad; cada página
+se compara con las filas locales (búsqueda por el índice único de
+``uid_firebase``) y solo lo que cambió se escribe, con ``bulk_create`` y
+``bulk_update``. Al final se desactivan las cuentas locales que ya no están
+en Firebase, salvo que el proveedor no haya devuelto cuentas o que sobren
+demasiadas (``USUARIOS_DESACTIVAR_MAXIMO``, fracción de los activos): eso
+suele ser un error del proveedor y no una baja masiva. El avance queda en
+SincronizacionUsuarios; una corrida pendiente o en curso cuyo trabajo falló o
+que pasó ``USUARIOS_SINCRONIZACION_VENCIMIENTO`` segundos se da por
+abandonada y no impide lanzar otra.
+
+El proveedor se elige con ``USUARIOS_PROVEEDOR_IDENTIDAD`` (ruta a una clase
+con ``paginas(tamano)``); las pruebas usan uno falso.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from trabajos.models import Trabajo
+
+from .models import SincronizacionUsuarios, Usuario
+from .permisos import invalidar
+
+logger = logging.getLogger(__name__)
+
+TAMANO_PAGINA = 500
+MAXIMO_ERRORES = 200
+VENCIMIENTO = 2 * 3600
+DESACTIVAR_MAXIMO = 0.5
+CAMPOS_SINCRONIZADOS = ('email', 'nombre', 'apellido', 'rol', 'estado')
+
+
+@dataclass
+class Cuenta:
+    """Cuenta tal como la entrega el proveedor de identidad."""
+
+    uid: str
+    email: str
+    nombre: str = ''
+    apellido: str = ''
+    # None conserva el rol local (la cuenta no tiene el claim).
+    rol: str | None = None
+    activo: bool = True
+
+
+class FirebaseAdminProveedor:
+    """Lista las cuentas con el SDK ``firebase-admin`` (dependencia opcional)."""
+
+    def __init__(self):
+        try:
+            import firebase_admin
+            from firebase_admin import auth
+        except ImportError as error:
+            raise ImproperlyConfigured(
+                'La sincronización con Firebase requiere el paquete firebase-admin'
+            ) from error
+        if not firebase_admin._apps:
+            firebase_admin.initialize_app()
+        self.auth = auth
+
+    def paginas(self, tamano):
+        pagina = self.auth.list_users(max_results=tamano)
+        while pagina:
+            yield [self.cuenta(usuario) for usuario in pagina.users]
+            pagina = pagina.get_next_page()
+
+    @staticmethod
+    def cuenta(usuario):
+        nombre, _, apellido = (usuario.display_name or '').partition(' ')
+        return Cuenta(
+            uid=usuario.uid,
+            email=(usuario.email or '').lower(),
+            nombre=nombre,
+            apellido=apellido,
+            rol=(usuario.custom_claims or {}).get('role'),
+            activo=not usuario.disabled,
+        )
+
+
+def obtener_proveedor():
+    ruta = getattr(
+        settings,
+        'USUARIOS_PROVEEDOR_IDENTIDAD',
+        'usuarios.sincronizacion.FirebaseAdminProveedor',
+    )
+    return import_string(ruta)()
+
+
+def aplicar_pagina(cuentas):
+    """Crea o actualiza los usuarios de una página. Devuelve (creados, actualizados, errores)."""
+    por_uid = {c.uid: c for c in cuentas if c.uid and c.email}
+    errores = [
+        {'uid': c.uid, 'error': 'Cuenta sin correo'} for c in cuentas if c.uid and not c.email
+    ]
+    existentes = {
+        u.uid_firebase: u
+        for u in Usuario.objects.filter(uid_firebase__in=por_uid).only(
+            'id', 'uid_firebase', *CAMPOS_SINCRONIZADOS
+        )
+    }
+
+    cambios = []
+    for uid, usuario in existentes.items():
+        cuenta = por_uid[uid]
+        valores = {
+            'email': cuenta.email,
+            'nombre': cuenta.nombre or usuario.nombre,
+            'apellido': cuenta.apellido or usuario.apellido,
+            'rol': cuenta.rol or usuario.rol,
+            'estado': cuenta.activo,
+        }
+        if any(getattr(usuario, campo) != valor for campo, valor in valores.items()):
+            cambios.append((usuario, valores))
+
+    nuevas = [c for uid, c in por_uid.items() if uid not in existentes]
+    # Un correo ya usado por otra cuenta local rompería el índice único: esas
+    # cuentas se reportan y se saltan (la próxima corrida las retoma).
+    correos = [v['email'] for u, v in cambios if v['email'] != u.email]
+    correos += [c.email for c in nuevas]
+    ocupados = (
+        set(Usuario.objects.filter(email__in=correos).values_list('email', flat=True))
+        if correos
+        else set()
+    )
+    cambiados = []
+    for usuario, valores in cambios:
+        if valores['email'] != usuario.email:
+            if valores['email'] in ocupados:
+                errores.append(
+                    {
+                        'uid': usuario.uid_firebase,
+                        'error': f'El correo {valores["email"]} ya está en uso',
+                    }
+                )
+                continue
+            ocupados.add(valores['email'])
+        for campo, valor in valores.items():
+            setattr(usuario, campo, valor)
+        cambiados.append(usuario)
+
+    creados = []
+    for cuenta in nuevas:
+        if cuenta.email in ocupados:
+            errores.append({'uid': cuenta.uid, 'error': f'El correo {cuenta.email} ya está en uso'})
+            continue
+        ocupados.add(cuenta.email)
+        creados.append(
+            Usuario(
+                uid_firebase=cuenta.uid,
+                email=cuenta.email,
+                nombre=cuenta.nombre or cuenta.email.split('@')[0],
+                apellido=cuenta.apellido,
+                rol=cuenta.rol or Usuario._meta.get_field('rol').default,
+                estado=cuenta.activo,
+            )
+        )
+
+    with transaction.atomic():
+        Usuario.objects.bulk_create(creados, batch_size=TAMANO_PAGINA)
+        Usuario.objects.bulk_update(cambiados, CAMPOS_SINCRONIZADOS, batch_size=TAMANO_PAGINA)
+    return len(creados), len(cambiados), errores
+
+
+def desactivar_ausentes(vistos):
+    """Marca inactivos los usuarios locales que ya no existen en el proveedor.
+
+    Devuelve ``(desactivados, error)``; con ``error`` no se desactivó nadie.
+    """
+    activos = Usuario.objects.filter(estado=True).values_list('id', 'uid_firebase')
+    ausentes = [pk for pk, uid in activos if uid not in vistos]
+    if not ausentes:
+        return 0, None
+    maximo = getattr(settings, 'USUARIOS_DESACTIVAR_MAXIMO', DESACTIVAR_MAXIMO)
+    if not vistos or len(ausentes) > maximo * len(activos):
+        return 0, (
+            f'No se desactivaron {len(ausentes)} de {len(activos)} usuarios activos: '
+            'el proveedor devolvió muy pocas cuentas'
+        )
+    total = 0
+    for inicio in range(0, len(ausentes), TAMANO_PAGINA):
+        total += Usuario.objects.filter(pk__in=ausentes[inicio:inicio + TAMANO_PAGINA]).update(
+            estado=False
+        )
+    return total, None
+
+
+def sincronizar(trabajo, proveedor=None, tamano=TAMANO_PAGINA):
+    """Ejecuta la corrida ``trabajo`` y va guardando su avance."""
+    filas = SincronizacionUsuarios.objects.filter(pk=trabajo.pk)
+    filas.update(estado=SincronizacionUsuarios.EN_CURSO, iniciado_en=timezone.now())
+    vistos = set()
+    errores = []
+    try:
+        proveedor = proveedor or obtener_proveedor()
+        for numero, cuentas in enumerate(proveedor.paginas(tamano), start=1):
+            creados, actualizados, errores_pagina = aplicar_pagina(cuentas)
+            vistos.update(c.uid for c in cuentas)
+            errores.extend(errores_pagina)
+            trabajo.paginas = numero
+            trabajo.procesados += len(cuentas)
+            trabajo.creados += creados
+            trabajo.actualizados += actualizados
+            filas.update(
+                paginas=trabajo.paginas,
+                procesados=trabajo.procesados,
+                creados=trabajo.creados,
+                actualizados=trabajo.actualizados,
+                errores=errores[:MAXIMO_ERRORES],
+            )
+        trabajo.desactivados, error = desactivar_ausentes(vistos)
+        if error:
+            logger.warning('Sincronización %s: %s', trabajo.pk, error)
+            errores.append({'error': error})
+        trabajo.estado = SincronizacionUsuarios.TERMINADA
+        if trabajo.actualizados or trabajo.desactivados:
+            # bulk_update no emite señales: se invalidan aquí las caches de usuarios.
+            invalidar()
+    except Exception as error:
+        logger.exception('Falló la sincronización de usuarios %s', trabajo.pk)
+        errores.append({'error': str(error)})
+        trabajo.estado = SincronizacionUsuarios.FALLIDA
+    trabajo.errores = errores[:MAXIMO_ERRORES]
+    trabajo.terminado_en = timezone.now()
+    filas.update(
+        estado=trabajo.estado,
+        desactivados=trabajo.desactivados,
+        errores=trabajo.errores,
+        terminado_en=trabajo.terminado_en,
+    )
+    return trabajo
+
+
+def lanzar(trabajo):
+    """Encola la sincronización para ``manage.py run_workers``.
+
+    Con ``USUARIOS_SINCRONIZAR_EN_SEGUNDO_PLANO = False`` corre en línea.
+    """
+    if getattr(settings, 'USUARIOS_SINCRONIZAR_EN_SEGUNDO_PLANO', True):
+        from .tareas import sincronizar_usuarios
+
+        sincronizar_usuarios.encolar(trabajo.pk, llave=llave(trabajo))
+    else:
+        sincronizar(trabajo)
+
+
+def llave(trabajo):
+    return f'sincronizacion:{trabajo.pk}'
+
+
+def abandonada(trabajo, ahora):
+    """La corrida no va a terminar: venció o su trabajo en la cola falló."""
+    vencimiento = getattr(settings, 'USUARIOS_SINCRONIZACION_VENCIMIENTO', VENCIMIENTO)
+    if (trabajo.iniciado_en or trabajo.creado_en) < ahora - timedelta(seconds=vencimiento):
+        return True
+    return Trabajo.objects.filter(llave=llave(trabajo), estado=Trabajo.FALLIDO).exists()
+
+
+def iniciar():
+    """Lanza una sincronización salvo que ya haya una en curso: ``(mensaje, trabajo)``."""
+    ahora = timezone.now()
+    with transaction.atomic():
+        for en_curso in SincronizacionUsuarios.objects.select_for_update().filter(
+            estado__in=[SincronizacionUsuarios.PENDIENTE, SincronizacionUsuarios.EN_CURSO]
+        ):
+            if not abandonada(en_curso, ahora):
+                return 'Ya hay una sincronización en curso', en_curso
+            logger.warning('Sincronización %s abandonada; se lanza otra', en_curso.pk)
+            SincronizacionUsuarios.objects.filter(pk=en_curso.pk).update(
+                estado=SincronizacionUsuarios.FALLIDA,
+                terminado_en=ahora,
+                errores=[*en_curso.errores, {'error': 'Abandonada: venció o su trabajo falló'}][
+                    :MAXIMO_ERRORES
+                ],
+            )
+        trabajo = SincronizacionUsuarios.objects.create()
+        lanzar(trabajo)
+    trabajo.refresh_from_db()
+    return 'Sincronización iniciada', trabajo
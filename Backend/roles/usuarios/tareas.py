@@ -0,0 +1,13 @@
+"""Trabajos en segundo plano de usuarios (ver trabajos/cola.py)."""
+from trabajos.cola import tarea
+
+from . import sincronizacion
+from .models import SincronizacionUsuarios
+
+
+# Una sincronización fallida queda registrada en SincronizacionUsuarios y se
+# relanza a mano; la cola no la repite.
+@tarea(max_intentos=1)
+def sincronizar_usuarios(trabajo_id):
+    trabajo = sincronizacion.sincronizar(SincronizacionUsuarios.objects.get(pk=trabajo_id))
+    return {'estado': trabajo.estado, 'desactivados': trabajo.desactivados}
@@ -1,3 +1,538 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import json
+import time
+import urllib.error
+from unittest import mock
 
-# Create your tests here.
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+
+from ayudas_pruebas import iniciar_sesion, sesion_async
+from trabajos import cola
+from trabajos.models import Trabajo
+
+from . import asincronas, permisos
+from .autenticacion import (
+    ClavesFirebase,
+    FirebaseAuthentication,
+    aautenticar,
+    obtener_verificador,
+)
+from .models import Permiso, Rol, SincronizacionUsuarios, Usuario
+from .sincronizacion import Cuenta, sincronizar
+
+PROYECTO = 'iotic-pruebas'
+CLAVE_PRIVADA = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+OTRA_CLAVE = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+DESCARGAS = []
+
+
+def claves_de_prueba(url):
+    """Reemplazo local del endpoint de claves de Google."""
+    DESCARGAS.append(url)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(CLAVE_PRIVADA.public_key()))
+    jwk['kid'] = 'clave-1'
+    return {'keys': [jwk]}, 3600
+
+
+def firmar(uid, clave=CLAVE_PRIVADA, kid='clave-1', **extra):
+    ahora = int(time.time())
+    claims = {
+        'iss': f'https://securetoken.google.com/{PROYECTO}',
+        'aud': PROYECTO,
+        'sub': uid,
+        'iat': ahora,
+        'exp': ahora + 3600,
+        **extra,
+    }
+    return jwt.encode(claims, clave, algorithm='RS256', headers={'kid': kid})
+
+
+@override_settings(
+    FIREBASE_PROJECT_ID=PROYECTO,
+    FIREBASE_OBTENER_CLAVES='usuarios.tests.claves_de_prueba',
+)
+class FirebaseAuthenticationTests(TestCase):
+    def setUp(self):
+        obtener_verificador.cache_clear()
+        self.addCleanup(obtener_verificador.cache_clear)
+        DESCARGAS.clear()
+        self.usuario = Usuario.objects.create(
+            uid_firebase='uid-ana', nombre='Ana', email='ana@example.com'
+        )
+        self.fabrica = APIRequestFactory()
+
+    def autenticar(self, token):
+        peticion = self.fabrica.get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return FirebaseAuthentication().authenticate(peticion)
+
+    def test_token_valido_y_cache(self):
+        token = firmar('uid-ana')
+
+        usuario, claims = self.autenticar(token)
+        self.assertEqual(usuario, self.usuario)
+        self.assertEqual(claims['sub'], 'uid-ana')
+
+        # Segunda vez: sin consultas ni descargas de claves.
+        with self.assertNumQueries(0):
+            self.assertEqual(self.autenticar(token)[0], self.usuario)
+        self.autenticar(firmar('uid-ana', extra='otro token'))
+        self.assertEqual(len(DESCARGAS), 1)
+
+    def test_rechaza_tokens_invalidos(self):
+        ahora = int(time.time())
+        invalidos = [
+            firmar('uid-ana', clave=OTRA_CLAVE),
+            firmar('uid-ana', aud='otro-proyecto'),
+            firmar('uid-ana', iat=ahora - 7200, exp=ahora - 3600),
+            firmar('uid-ana', kid='desconocida'),
+            firmar('uid-nadie'),
+            'no-es-un-jwt',
+        ]
+        for token in invalidos:
+            with self.subTest(token=token[:20]), self.assertRaises(AuthenticationFailed):
+                self.autenticar(token)
+
+    def test_usuario_inactivo(self):
+        Usuario.objects.filter(pk=self.usuario.pk).update(estado=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.autenticar(firmar('uid-ana'))
+
+    def test_desactivar_al_usuario_invalida_su_token(self):
+        token = firmar('uid-ana')
+        self.autenticar(token)
+
+        self.usuario.estado = False
+        self.usuario.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.autenticar(token)
+
+    def test_sin_cabecera_es_anonimo(self):
+        self.assertIsNone(FirebaseAuthentication().authenticate(self.fabrica.get('/')))
+
+    def test_api_responde_401_con_token_invalido(self):
+        cliente = APIClient()
+        cliente.credentials(HTTP_AUTHORIZATION='Bearer no-es-un-jwt')
+
+        respuesta = cliente.get('/api/usuarios/')
+
+        self.assertEqual(respuesta.status_code, 401)
+        self.assertEqual(respuesta['WWW-Authenticate'], 'Bearer')
+
+    async def test_autenticacion_asincrona(self):
+        fabrica = AsyncRequestFactory()
+        peticion = fabrica.get('/', headers={'Authorization': f'Bearer {firmar("uid-ana")}'})
+
+        usuario, claims = await aautenticar(peticion)
+
+        self.assertEqual(usuario.pk, self.usuario.pk)
+        self.assertEqual(claims['sub'], 'uid-ana')
+        self.assertIsNone(await aautenticar(fabrica.get('/')))
+        with self.assertRaises(AuthenticationFailed):
+            token = firmar('uid-nadie')
+            await aautenticar(fabrica.get('/', headers={'Authorization': f'Bearer {token}'}))
+
+    async def test_vista_asincrona_responde_401(self):
+        peticion = AsyncRequestFactory().get('/', headers={'Authorization': 'Bearer no-es-un-jwt'})
+
+        respuesta = await asincronas.sincronizacion(peticion, pk=1)
+
+        self.assertEqual(respuesta.status_code, 401)
+        self.assertEqual(respuesta['WWW-Authenticate'], 'Bearer')
+        self.assertEqual(json.loads(respuesta.content), {'detail': 'Token inválido'})
+
+
+class ClavesFirebaseTests(TestCase):
+    def test_respeta_max_age(self):
+        ahora = [0]
+        claves = ClavesFirebase(claves_de_prueba, reloj=lambda: ahora[0])
+        DESCARGAS.clear()
+
+        claves.clave('clave-1')
+        ahora[0] = 30
+        claves.clave('desconocida')  # un kid desconocido recarga a lo más cada minuto
+        ahora[0] = 3599
+        claves.clave('clave-1')
+        self.assertEqual(len(DESCARGAS), 1)
+
+        ahora[0] = 3600
+        self.assertIsNotNone(claves.clave('clave-1'))
+        self.assertEqual(len(DESCARGAS), 2)
+
+    def test_sin_red_sigue_con_las_claves_anteriores(self):
+        ahora = [0]
+        caida = [False]
+
+        def obtener(url):
+            if caida[0]:
+                raise urllib.error.URLError('sin red')
+            return claves_de_prueba(url)
+
+        claves = ClavesFirebase(obtener, reloj=lambda: ahora[0])
+        caida[0] = True
+        with self.assertRaises(AuthenticationFailed):
+            claves.clave('clave-1')
+
+        caida[0] = False
+        ahora[0] = 60
+        clave = claves.clave('clave-1')
+        caida[0] = True
+        ahora[0] = 4000
+        with self.assertLogs('usuarios.autenticacion', 'WARNING'):
+            self.assertIs(claves.clave('clave-1'), clave)
+        # Reintenta al minuto, no en cada petición.
+        self.assertFalse(claves.necesita_recarga('clave-1'))
+        ahora[0] = 4060
+        self.assertTrue(claves.necesita_recarga('clave-1'))
+
+    def test_sin_claves_previas_no_reintenta_en_cada_peticion(self):
+        ahora = [0]
+        intentos = []
+
+        def obtener(url):
+            intentos.append(ahora[0])
+            raise urllib.error.URLError('sin red')
+
+        claves = ClavesFirebase(obtener, reloj=lambda: ahora[0])
+        with self.assertRaises(AuthenticationFailed):
+            claves.clave('clave-1')
+
+        # Durante la espera se rechaza sin descargar (ni esperar el candado).
+        ahora[0] = 59
+        self.assertIsNone(claves.clave('clave-1'))
+        self.assertEqual(intentos, [0])
+
+        ahora[0] = 60
+        with self.assertRaises(AuthenticationFailed):
+            claves.clave('clave-1')
+        self.assertEqual(intentos, [0, 60])
+
+    async def test_respuesta_invalida_en_la_recarga_asincrona(self):
+        async def descargar(url):
+            raise json.JSONDecodeError('no es JSON', '<html>', 0)
+
+        claves = ClavesFirebase(claves_de_prueba, aobtener_claves=descargar)
+
+        with self.assertRaises(AuthenticationFailed):
+            await claves.aclave('clave-1')
+
+    async def test_recarga_asincrona_una_sola_vez(self):
+        async def descargar(url):
+            await asyncio.sleep(0.01)
+            return claves_de_prueba(url)
+
+        claves = ClavesFirebase(claves_de_prueba, aobtener_claves=descargar)
+        DESCARGAS.clear()
+
+        encontradas = await asyncio.gather(*(claves.aclave('clave-1') for _ in range(10)))
+
+        self.assertTrue(all(encontradas))
+        self.assertEqual(len(DESCARGAS), 1)
+
+
+class ProveedorFalso:
+    """Proveedor de identidad en memoria para las pruebas de sincronización."""
+
+    cuentas = []
+
+    def paginas(self, tamano):
+        for inicio in range(0, len(self.cuentas), tamano):
+            yield self.cuentas[inicio:inicio + tamano]
+
+
+@override_settings(
+    USUARIOS_PROVEEDOR_IDENTIDAD='usuarios.tests.ProveedorFalso',
+    USUARIOS_SINCRONIZAR_EN_SEGUNDO_PLANO=False,
+)
+class SincronizacionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.addCleanup(setattr, ProveedorFalso, 'cuentas', [])
+
+    def test_crea_actualiza_y_desactiva(self):
+        ana = Usuario.objects.create(
+            uid_firebase='u-1', nombre='Ana', email='ana@viejo.com', rol='admin'
+        )
+        self.client.force_authenticate(ana)
+        Usuario.objects.create(uid_firebase='u-borrado', nombre='Beto', email='beto@example.com')
+        ProveedorFalso.cuentas = [
+            Cuenta(uid='u-1', email='ana@nuevo.com', nombre='Ana'),
+            Cuenta(uid='u-2', email='carla@example.com', nombre='Carla', rol='mentor'),
+            Cuenta(uid='u-3', email='dario@example.com', activo=False),
+            Cuenta(uid='u-4', email='beto@example.com'),
+        ]
+
+        respuesta = self.client.post('/api/usuarios/sincronizar/')
+
+        self.assertEqual(respuesta.status_code, 202)
+        self.assertIn('message', respuesta.data)
+        trabajo = SincronizacionUsuarios.objects.get(pk=respuesta.data['id'])
+        self.assertEqual(trabajo.estado, SincronizacionUsuarios.TERMINADA)
+        self.assertEqual((trabajo.creados, trabajo.actualizados, trabajo.desactivados), (2, 1, 1))
+        self.assertEqual([e['uid'] for e in trabajo.errores], ['u-4'])
+        ana = Usuario.objects.get(uid_firebase='u-1')
+        self.assertEqual((ana.email, ana.rol), ('ana@nuevo.com', 'admin'))
+        self.assertEqual(Usuario.objects.get(uid_firebase='u-2').rol, 'mentor')
+        self.assertFalse(Usuario.objects.get(uid_firebase='u-3').estado)
+        self.assertFalse(Usuario.objects.get(uid_firebase='u-borrado').estado)
+
+        avance = self.client.get(f'/api/usuarios/sincronizar/{trabajo.id}/')
+        self.assertEqual(avance.data['procesados'], 4)
+
+    def test_correo_de_otra_cuenta_se_reporta_sin_abortar(self):
+        Usuario.objects.create(uid_firebase='u-1', nombre='Ana', email='ana@example.com')
+        Usuario.objects.create(uid_firebase='u-2', nombre='Beto', email='beto@example.com')
+        ProveedorFalso.cuentas = [
+            Cuenta(uid='u-1', email='beto@example.com', nombre='Ana María'),
+            Cuenta(uid='u-2', email='beto@example.com', nombre='Beto'),
+            Cuenta(uid='u-3', email='carla@example.com', nombre='Carla'),
+        ]
+
+        trabajo = sincronizar(SincronizacionUsuarios.objects.create(), ProveedorFalso())
+
+        self.assertEqual(trabajo.estado, SincronizacionUsuarios.TERMINADA)
+        self.assertEqual([e['uid'] for e in trabajo.errores], ['u-1'])
+        ana = Usuario.objects.get(uid_firebase='u-1')
+        self.assertEqual((ana.nombre, ana.email), ('Ana', 'ana@example.com'))
+        self.assertTrue(Usuario.objects.filter(uid_firebase='u-3').exists())
+
+    def test_no_desactiva_a_todos_si_el_proveedor_falla(self):
+        for i in range(4):
+            Usuario.objects.create(uid_firebase=f'u-{i}', nombre='U', email=f'u{i}@example.com')
+
+        vacio = sincronizar(SincronizacionUsuarios.objects.create(), ProveedorFalso())
+        ProveedorFalso.cuentas = [Cuenta(uid='u-0', email='u0@example.com')]
+        parcial = sincronizar(SincronizacionUsuarios.objects.create(), ProveedorFalso())
+
+        for trabajo in (vacio, parcial):
+            self.assertEqual(trabajo.estado, SincronizacionUsuarios.TERMINADA)
+            self.assertEqual(trabajo.desactivados, 0)
+            self.assertIn('No se desactivaron', trabajo.errores[-1]['error'])
+        self.assertEqual(Usuario.objects.filter(estado=True).count(), 4)
+        ProveedorFalso.cuentas += [Cuenta(uid=f'u-{i}', email=f'u{i}@example.com') for i in (1, 2)]
+        self.assertEqual(
+            sincronizar(SincronizacionUsuarios.objects.create(), ProveedorFalso()).desactivados, 1
+        )
+
+    @override_settings(USUARIOS_SINCRONIZAR_EN_SEGUNDO_PLANO=True)
+    def test_una_corrida_abandonada_no_bloquea(self):
+        iniciar_sesion(self.client)
+        vieja = SincronizacionUsuarios.objects.create(estado=SincronizacionUsuarios.EN_CURSO)
+        SincronizacionUsuarios.objects.filter(pk=vieja.pk).update(
+            iniciado_en=timezone.now() - datetime.timedelta(days=1)
+        )
+
+        primera = self.client.post('/api/usuarios/sincronizar/').data
+        self.assertNotEqual(primera['id'], vieja.pk)
+        vieja.refresh_from_db()
+        self.assertEqual(vieja.estado, SincronizacionUsuarios.FALLIDA)
+        self.assertEqual(self.client.post('/api/usuarios/sincronizar/').data['id'], primera['id'])
+
+        # El trabajador murió y la cola dio el trabajo por fallido.
+        Trabajo.objects.filter(llave=f'sincronizacion:{primera["id"]}').update(
+            estado=Trabajo.FALLIDO
+        )
+        segunda = self.client.post('/api/usuarios/sincronizar/').data
+        self.assertNotIn(segunda['id'], (vieja.pk, primera['id']))
+        self.assertEqual(segunda['estado'], SincronizacionUsuarios.PENDIENTE)
+
+    def test_consultas_por_pagina(self):
+        ProveedorFalso.cuentas = [
+            Cuenta(uid=f'u-{i}', email=f'u{i}@example.com', nombre=f'U{i}') for i in range(300)
+        ]
+        trabajo = SincronizacionUsuarios.objects.create()
+
+        # Por página: lectura por uid, correos en uso, inserción (SQLite la parte
+        # en dos por su límite de parámetros) y avance; más inicio y cierre.
+        with self.assertNumQueries(17):
+            sincronizar(trabajo, ProveedorFalso(), tamano=150)
+
+        self.assertEqual(Usuario.objects.count(), 300)
+        # Una segunda corrida sin cambios no escribe nada.
+        self.assertEqual(sincronizar(trabajo, ProveedorFalso()).actualizados, 0)
+
+    @override_settings(USUARIOS_SINCRONIZAR_EN_SEGUNDO_PLANO=True)
+    def test_no_corre_en_el_hilo_de_la_peticion(self):
+        ProveedorFalso.cuentas = [Cuenta(uid='u-1', email='ana@example.com', nombre='Ana')]
+        iniciar_sesion(self.client)
+        respuesta = self.client.post('/api/usuarios/sincronizar/')
+
+        self.assertEqual(respuesta.data['estado'], SincronizacionUsuarios.PENDIENTE)
+        segunda = self.client.post('/api/usuarios/sincronizar/')
+        self.assertEqual(segunda.data['id'], respuesta.data['id'])
+        # Queda en la cola de trabajos hasta que la toma un trabajador.
+        trabajo = cola.tomar('prueba')
+        self.assertEqual(trabajo.argumentos, [respuesta.data['id']])
+        self.assertIsNone(cola.tomar('prueba'))
+        self.assertTrue(cola.ejecutar(trabajo))
+        avance = self.client.get(f'/api/usuarios/sincronizar/{respuesta.data["id"]}/')
+        self.assertEqual(avance.data['estado'], SincronizacionUsuarios.TERMINADA)
+
+    async def test_vistas_asincronas(self):
+        ProveedorFalso.cuentas = [Cuenta(uid='u-1', email='ana@example.com', nombre='Ana')]
+        fabrica = AsyncRequestFactory()
+        admin = await Usuario.objects.acreate(
+            uid_firebase='u-admin', nombre='Eva', email='eva@example.com', rol='admin'
+        )
+        estudiante = await Usuario.objects.acreate(
+            uid_firebase='u-estudiante', nombre='Beto', email='beto@example.com'
+        )
+
+        self.assertEqual((await asincronas.sincronizar(fabrica.post('/'))).status_code, 401)
+        with sesion_async(estudiante):
+            self.assertEqual((await asincronas.sincronizar(fabrica.post('/'))).status_code, 403)
+        with sesion_async(admin):
+            respuesta = await asincronas.sincronizar(fabrica.post('/'))
+
+        self.assertEqual(respuesta.status_code, 202)
+        datos = json.loads(respuesta.content)
+        self.assertEqual((datos['message'], datos['creados']), ('Sincronización iniciada', 1))
+        with sesion_async(admin):
+            avance = await asincronas.sincronizacion(fabrica.get('/'), pk=datos['id'])
+            inexistente = await asincronas.sincronizacion(fabrica.get('/'), pk=0)
+            self.assertEqual((await asincronas.sincronizar(fabrica.get('/'))).status_code, 405)
+        self.assertEqual(json.loads(avance.content)['estado'], SincronizacionUsuarios.TERMINADA)
+        self.assertEqual(inexistente.status_code, 404)
+
+
+class PermisosTests(TestCase):
+    def setUp(self):
+        permisos.invalidar()
+        self.addCleanup(permisos.invalidar)
+        self.mentor = Usuario.objects.create(
+            uid_firebase='uid-m', nombre='Marta', email='marta@example.com', rol='mentor'
+        )
+
+    def test_roles_iniciales_y_sin_consultas_en_caliente(self):
+        self.assertTrue(self.mentor.tiene_permiso('inventario.prestar'))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.mentor.tiene_permiso('informacion.publicar'))
+            self.assertFalse(self.mentor.tiene_permiso('usuarios.gestionar'))
+
+    def test_cambios_de_permisos_invalidan(self):
+        self.assertFalse(self.mentor.tiene_permiso('usuarios.gestionar'))
+
+        Rol.objects.get(nombre='mentor').permisos.add(Permiso.objects.get(codigo='usuarios.gestionar'))
+
+        self.assertTrue(self.mentor.tiene_permiso('usuarios.gestionar'))
+
+    def test_version_compartida_entre_procesos(self):
+        self.assertFalse(self.mentor.tiene_permiso('usuarios.gestionar'))
+        # Otro worker cambió los permisos: aquí solo se ve la versión nueva.
+        Rol.permisos.through.objects.create(
+            rol=Rol.objects.get(nombre='mentor'),
+            permiso=Permiso.objects.get(codigo='usuarios.gestionar'),
+        )
+        cache.incr(permisos.LLAVE_VERSION)
+
+        with mock.patch.object(permisos, 'REVISION_VERSION', 0):
+            self.assertTrue(self.mentor.tiene_permiso('usuarios.gestionar'))
+
+    def test_lista_de_roles(self):
+        cliente = APIClient()
+        iniciar_sesion(cliente).tiene_permiso('usuarios.gestionar')
+        with self.assertNumQueries(2):
+            respuesta = cliente.get('/api/usuarios/roles/')
+
+        self.assertEqual([r['nombre'] for r in respuesta.data], ['admin', 'mentor', 'estudiante'])
+        self.assertIn('inventario.prestar', respuesta.data[1]['permisos'])
+
+    def test_permiso_en_vistas(self):
+        vista = mock.Mock(permisos_requeridos={'POST': 'usuarios.gestionar'})
+        peticion = mock.Mock(method='POST', user=self.mentor)
+
+        self.assertFalse(permisos.TienePermiso().has_permission(peticion, vista))
+        peticion.method = 'GET'
+        self.assertTrue(permisos.TienePermiso().has_permission(peticion, vista))
+
+    def test_escrituras_anonimas_o_sin_permiso(self):
+        cliente = APIClient()
+        url = f'/api/usuarios/{self.mentor.pk}/'
+
+        anonima = cliente.put(url, {'nombre': 'Marta', 'email': 'marta@example.com', 'rol': 'admin'})
+        self.assertEqual(anonima.status_code, 401)
+        self.assertEqual(cliente.post('/api/usuarios/sincronizar/').status_code, 401)
+        self.assertEqual(cliente.post('/api/inventario/items/', {'descripcion': 'x'}).status_code, 401)
+        cliente.force_authenticate(self.mentor)
+        self.assertEqual(cliente.delete(url).status_code, 403)
+        self.assertEqual(cliente.post('/api/usuarios/sincronizar/').status_code, 403)
+        self.mentor.refresh_from_db()
+        self.assertEqual(self.mentor.rol, 'mentor')
+
+    def test_lecturas_anonimas_o_sin_permiso(self):
+        cliente = APIClient()
+        privadas = [
+            '/api/usuarios/',
+            f'/api/usuarios/{self.mentor.pk}/',
+            '/api/usuarios/roles/',
+            '/api/inventario/items/',
+            '/api/inventario/items/reports/summary/',
+            '/api/inventario/prestamos/history/',
+            '/api/inventario/prestamos/history/export/',
+            '/api/inventario/prestamos/active/',
+        ]
+
+        for url in privadas:
+            self.assertEqual(cliente.get(url).status_code, 401, url)
+        self.assertEqual(cliente.get('/api/informacion/libros/').status_code, 200)
+        cliente.force_authenticate(self.mentor)
+        self.assertEqual(cliente.get('/api/usuarios/').status_code, 403)
+        self.assertEqual(cliente.get('/api/inventario/prestamos/history/').status_code, 200)
+        iniciar_sesion(cliente, rol='estudiante')
+        self.assertEqual(cliente.get('/api/inventario/items/').status_code, 403)
+        self.assertEqual(cliente.get('/api/inventario/prestamos/history/').status_code, 403)
+
+    def test_filtro_por_estado(self):
+        Usuario.objects.create(uid_firebase='uid-i', nombre='Iván', email='ivan@example.com', estado=False)
+        cliente = APIClient()
+        iniciar_sesion(cliente)
+
+        activos = cliente.get('/api/usuarios/', {'estado': 'true'})
+        self.assertEqual([u['nombre'] for u in activos.data], ['Marta', 'Admin'])
+        self.assertEqual([u['nombre'] for u in cliente.get('/api/usuarios/?estado=0').data], ['Iván'])
+        self.assertEqual(cliente.get('/api/usuarios/', {'estado': 'quizas'}).status_code, 400)
+
+    def test_el_rol_cambia_solo_con_su_permiso(self):
+        coordinador = Rol.objects.create(nombre='coordinador')
+        coordinador.permisos.add(Permiso.objects.get(codigo='usuarios.gestionar'))
+        cliente = APIClient()
+        iniciar_sesion(cliente, rol='coordinador')
+        datos = {'nombre': 'Marta', 'email': 'marta@example.com', 'rol': 'admin', 'estado': False}
+
+        edicion = cliente.put(f'/api/usuarios/{self.mentor.pk}/', datos)
+        self.assertEqual(edicion.status_code, 200)
+        self.assertEqual((edicion.data['rol'], edicion.data['estado']), ('mentor', True))
+        url = f'/api/usuarios/{self.mentor.pk}/rol/'
+        self.assertEqual(cliente.patch(url, {'rol': 'admin'}).status_code, 403)
+
+        iniciar_sesion(cliente)
+        self.assertEqual(cliente.patch(url, {'rol': 'jefe'}).status_code, 400)
+        cambio = cliente.patch(url, {'rol': 'estudiante'})
+        self.assertEqual((cambio.status_code, cambio.data['rol']), (200, 'estudiante'))
+        self.assertFalse(Usuario.objects.get(pk=self.mentor.pk).tiene_permiso('inventario.prestar'))
+
+    def test_activar_y_desactivar(self):
+        cliente = APIClient()
+        url = f'/api/usuarios/{self.mentor.pk}/estado/'
+
+        self.assertEqual(cliente.patch(url, {}).status_code, 401)
+        cliente.force_authenticate(self.mentor)
+        self.assertEqual(cliente.patch(url, {}).status_code, 403)
+        iniciar_sesion(cliente)
+        # Sin cuerpo se invierte, como el interruptor de la administración.
+        desactivado = cliente.patch(url, {})
+        self.assertEqual((desactivado.status_code, desactivado.data['estado']), (200, False))
+        self.assertTrue(cliente.patch(url, {}).data['estado'])
+        self.assertTrue(cliente.patch(url, {'estado': True}).data['estado'])
+        self.assertEqual(cliente.patch(url, {'estado': 'quizas'}).status_code, 400)
+        self.assertEqual(cliente.patch('/api/usuarios/0/estado/', {}).status_code, 404)
+        self.assertTrue(Usuario.objects.get(pk=self.mentor.pk).estado)
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.urls import path
+
+from . import asincronas
+from .views import (
+    EstadoUsuarioView,
+    RolListView,
+    RolUsuarioView,
+    SincronizacionDetalleView,
+    SincronizacionView,
+    UsuarioViewSet,
+)
+
+if settings.IOTIC_ASGI:
+    sincronizar = asincronas.sincronizar
+    sincronizacion = asincronas.sincronizacion
+else:
+    sincronizar = SincronizacionView.as_view()
+    sincronizacion = SincronizacionDetalleView.as_view()
+
+urlpatterns = [
+    path('', UsuarioViewSet.as_view({'get': 'list'}), name='usuario-list'),
+    path('roles/', RolListView.as_view(), name='rol-list'),
+    path('sincronizar/', sincronizar, name='usuario-sincronizar'),
+    path('sincronizar/<int:pk>/', sincronizacion, name='usuario-sincronizacion'),
+    path(
+        '<int:pk>/',
+        UsuarioViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update'}),
+        name='usuario-detail',
+    ),
+    path('<int:pk>/rol/', RolUsuarioView.as_view(), name='usuario-rol'),
+    path('<int:pk>/estado/', EstadoUsuarioView.as_view(), name='usuario-estado'),
+]
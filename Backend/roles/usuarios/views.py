@@ -1,3 +1,70 @@
-from django.shortcuts import render
+from rest_framework import generics, status, viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from .models import Rol, SincronizacionUsuarios, Usuario
+from .serializers import (
+    EstadoUsuarioSerializer,
+    RolSerializer,
+    RolUsuarioSerializer,
+    SincronizacionUsuariosSerializer,
+    UsuarioSerializer,
+)
+from .permisos import escritura
+from .sincronizacion import iniciar
+
+
+class UsuarioViewSet(viewsets.ModelViewSet):
+    queryset = Usuario.objects.all()
+    serializer_class = UsuarioSerializer
+    # Correos y uid de Firebase: leer la lista también pide gestionar usuarios.
+    permisos_requeridos = {'*': 'usuarios.gestionar'}
+    cursor_ordering = 'id'
+    filtros = {
+        'estado': 'estado',
+        'rol': 'rol',
+        'email': 'email__iexact',
+    }
+
+
+class RolUsuarioView(generics.UpdateAPIView):
+    """Cambia el rol de un usuario; aparte de la edición para exigir otro permiso."""
+
+    queryset = Usuario.objects.all()
+    serializer_class = RolUsuarioSerializer
+    permisos_requeridos = escritura('usuarios.asignar_rol')
+
+
+class EstadoUsuarioView(generics.UpdateAPIView):
+    """Activa o desactiva un usuario; la próxima sincronización usa el estado de Firebase."""
+
+    queryset = Usuario.objects.all()
+    serializer_class = EstadoUsuarioSerializer
+    permisos_requeridos = escritura('usuarios.gestionar')
+
+
+class SincronizacionView(APIView):
+    """Lanza la sincronización con Firebase en segundo plano (202 + id para consultar el avance)."""
+
+    permisos_requeridos = {'POST': 'usuarios.gestionar'}
+
+    def post(self, request):
+        mensaje, trabajo = iniciar()
+        datos = SincronizacionUsuariosSerializer(trabajo).data
+        return Response({'message': mensaje, **datos}, status=status.HTTP_202_ACCEPTED)
+
+
+class SincronizacionDetalleView(generics.RetrieveAPIView):
+    queryset = SincronizacionUsuarios.objects.all()
+    serializer_class = SincronizacionUsuariosSerializer
+    # El avance incluye los errores de cada cuenta (correos).
+    permisos_requeridos = {'*': 'usuarios.gestionar'}
+
+
+class RolListView(generics.ListAPIView):
+    """Roles con sus permisos; la lista es corta y va completa, sin paginar."""
+
+    queryset = Rol.objects.prefetch_related('permisos')
+    serializer_class = RolSerializer
+    pagination_class = None
+    permisos_requeridos = {'*': 'usuarios.gestionar'}
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Trabajo
+
+
+@admin.register(Trabajo)
+class TrabajoAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tarea', 'estado', 'intentos', 'disponible_en', 'terminado_en')
+    list_filter = ('estado', 'tarea')
+    search_fields = ('tarea', 'llave')
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TrabajosConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'trabajos'
+
+    def ready(self):
+        # Cada app declara sus tareas en tareas.py.
+        autodiscover_modules('tareas')
+        from . import cola
+
+        cola.registrar_metricas()
@@ -0,0 +1,280 @@
+"""Cola de trabajos en segundo plano sobre la base de datos del proyecto.
+
+Las apps declaran tareas en su ``tareas.py``:
+
+    @tarea(max_intentos=3)
+    def generar_derivados(etiqueta, pk): ...
+
+    generar_derivados.encolar('informacion.Libro', 7, llave='derivados:...')
+
+``encolar`` inserta una fila en Trabajo dentro de la transacción en curso: si
+la petición hace rollback, el trabajo no existe. Los procesos de ``manage.py
+run_workers`` toman trabajos con ``tomar()``:
+
+- PostgreSQL: ``SELECT ... FOR UPDATE SKIP LOCKED``; cada trabajador salta
+  las filas que otro está reclamando.
+- SQLite (sin bloqueos por fila): ``UPDATE ... WHERE id = ? AND estado = ?
+  AND intentos = ?`` sobre el candidato; si otro lo tomó primero el UPDATE
+  no cambia filas y se prueba el siguiente. SQLite serializa las escrituras,
+  así que dos trabajadores nunca toman el mismo.
+
+Un trabajo que falla vuelve a la cola con espera exponencial (``REINTENTO_BASE
+* 2**(intentos-1)`` con variación aleatoria, hasta ``REINTENTO_MAXIMO``)
+hasta agotar ``max_intentos``. Mientras corre, el trabajador renueva
+``tomado_en`` (``latido``) cada tercio de ``TRABAJOS_VENCIMIENTO``; uno
+``en_curso`` sin renovar por más de ``TRABAJOS_VENCIMIENTO`` segundos (el
+trabajador murió) se vuelve a tomar si le quedan intentos, o queda fallido si
+no. Las tareas con ``cada=segundos`` se encolan solas con una llave, una
+pendiente a la vez.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+from ioticsemillero import metricas
+
+from .models import Trabajo
+
+logger = logging.getLogger(__name__)
+
+REINTENTO_BASE = 10
+REINTENTO_MAXIMO = 3600
+VENCIMIENTO = 300
+# Candidatos a probar por llamada a tomar() en SQLite.
+CANDIDATOS = 10
+
+TAREAS = {}
+
+
+@dataclass(frozen=True)
+class Tarea:
+    nombre: str
+    funcion: object
+    max_intentos: int = 5
+    cada: int = 0
+
+    def __call__(self, *args, **kwargs):
+        return self.funcion(*args, **kwargs)
+
+    def encolar(self, *args, llave='', retraso=0, **kwargs):
+        return encolar(self.nombre, args, kwargs, llave=llave, retraso=retraso)
+
+
+def tarea(max_intentos=5, cada=0, nombre=None):
+    """Registra la función como tarea; ``cada`` (segundos) la vuelve periódica."""
+
+    def decorador(funcion):
+        registrada = Tarea(
+            nombre or f'{funcion.__module__}.{funcion.__name__}', funcion, max_intentos, cada
+        )
+        TAREAS[registrada.nombre] = registrada
+        return registrada
+
+    return decorador
+
+
+def encolar(nombre, args=(), kwargs=None, llave='', retraso=0, disponible_en=None):
+    """Agrega un trabajo (o devuelve el pendiente con la misma ``llave``)."""
+    if nombre not in TAREAS:
+        raise LookupError(f'Tarea desconocida: {nombre}')
+    trabajo = Trabajo(
+        tarea=nombre,
+        argumentos=list(args),
+        argumentos_nombrados=kwargs or {},
+        llave=llave,
+        max_intentos=TAREAS[nombre].max_intentos,
+        disponible_en=disponible_en or timezone.now() + timedelta(seconds=retraso),
+    )
+    if not llave:
+        trabajo.save()
+        return trabajo
+    Trabajo.objects.bulk_create([trabajo], ignore_conflicts=True)
+    return Trabajo.objects.filter(llave=llave).order_by('-id').first()
+
+
+def nombre_trabajador():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+
+def vencimiento():
+    return getattr(settings, 'TRABAJOS_VENCIMIENTO', VENCIMIENTO)
+
+
+def _abandonados(ahora):
+    return Q(estado=Trabajo.EN_CURSO, tomado_en__lt=ahora - timedelta(seconds=vencimiento()))
+
+
+def _listos(ahora):
+    return Q(estado=Trabajo.PENDIENTE, disponible_en__lte=ahora) | (
+        _abandonados(ahora) & Q(intentos__lt=F('max_intentos'))
+    )
+
+
+def fallar_agotados(ahora=None):
+    """Da por fallidos los abandonados que ya usaron todos sus intentos."""
+    ahora = ahora or timezone.now()
+    return Trabajo.objects.filter(_abandonados(ahora), intentos__gte=F('max_intentos')).update(
+        estado=Trabajo.FALLIDO,
+        terminado_en=ahora,
+        error='El trabajador dejó de responder en el último intento',
+    )
+
+
+def tomar(trabajador=None, ahora=None):
+    """Reclama el próximo trabajo listo para ``trabajador``; None si no hay."""
+    ahora = ahora or timezone.now()
+    trabajador = trabajador or nombre_trabajador()
+    fallar_agotados(ahora)
+    candidatos = Trabajo.objects.filter(_listos(ahora)).order_by('disponible_en', 'id')
+    tomado = {
+        'estado': Trabajo.EN_CURSO,
+        'tomado_en': ahora,
+        'trabajador': trabajador,
+        'intentos': F('intentos') + 1,
+    }
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            trabajo = candidatos.select_for_update(skip_locked=True).first()
+            if trabajo is None:
+                return None
+            Trabajo.objects.filter(pk=trabajo.pk).update(**tomado)
+    else:
+        for trabajo in candidatos[:CANDIDATOS]:
+            reclamado = Trabajo.objects.filter(
+                _listos(ahora), pk=trabajo.pk, estado=trabajo.estado, intentos=trabajo.intentos
+            ).update(**tomado)
+            if reclamado:
+                break
+        else:
+            return None
+    trabajo.refresh_from_db()
+    return trabajo
+
+
+def latido(trabajo, ahora=None):
+    """Renueva ``tomado_en`` del trabajo en curso; False si ya no es de este trabajador."""
+    ahora = ahora or timezone.now()
+    renovado = Trabajo.objects.filter(
+        pk=trabajo.pk,
+        estado=Trabajo.EN_CURSO,
+        trabajador=trabajo.trabajador,
+        intentos=trabajo.intentos,
+    ).update(tomado_en=ahora)
+    return bool(renovado)
+
+
+def espera_reintento(intentos):
+    base = getattr(settings, 'TRABAJOS_REINTENTO_BASE', REINTENTO_BASE)
+    maximo = getattr(settings, 'TRABAJOS_REINTENTO_MAXIMO', REINTENTO_MAXIMO)
+    return min(base * 2 ** (intentos - 1), maximo) * random.uniform(0.75, 1.25)
+
+
+def _terminar(trabajo, **campos):
+    """Guarda el final solo si el trabajo sigue siendo de este trabajador e intento."""
+    actualizados = Trabajo.objects.filter(
+        pk=trabajo.pk, trabajador=trabajo.trabajador, intentos=trabajo.intentos
+    ).update(**campos)
+    for campo, valor in campos.items():
+        setattr(trabajo, campo, valor)
+    return bool(actualizados)
+
+
+def ejecutar(trabajo):
+    """Corre un trabajo ya tomado y deja su estado final o el reintento."""
+    registrada = TAREAS.get(trabajo.tarea)
+    try:
+        if registrada is None:
+            raise LookupError(f'Tarea desconocida: {trabajo.tarea}')
+        resultado = registrada(*trabajo.argumentos, **trabajo.argumentos_nombrados)
+    except Exception as error:
+        ahora = timezone.now()
+        descripcion = f'{type(error).__name__}: {error}'
+        if trabajo.intentos < trabajo.max_intentos and registrada is not None:
+            logger.warning('Trabajo %s falló (intento %s): %s', trabajo, trabajo.intentos, error)
+            try:
+                with transaction.atomic():
+                    _terminar(
+                        trabajo,
+                        estado=Trabajo.PENDIENTE,
+                        disponible_en=ahora + timedelta(seconds=espera_reintento(trabajo.intentos)),
+                        error=descripcion,
+                    )
+            except IntegrityError:
+                # Mientras corría se encoló otro con la misma llave; ese lo reemplaza.
+                _terminar(
+                    trabajo,
+                    estado=Trabajo.FALLIDO,
+                    terminado_en=ahora,
+                    error=f'{descripcion} (reemplazado por un trabajo pendiente)',
+                )
+        else:
+            logger.exception('Trabajo %s falló definitivamente', trabajo)
+            _terminar(trabajo, estado=Trabajo.FALLIDO, terminado_en=ahora, error=descripcion)
+        metricas.incrementar('iotic_trabajos_total', tarea=trabajo.tarea, resultado='error')
+        return False
+    _terminar(
+        trabajo,
+        estado=Trabajo.COMPLETADO,
+        terminado_en=timezone.now(),
+        resultado=resultado,
+        error='',
+    )
+    metricas.incrementar('iotic_trabajos_total', tarea=trabajo.tarea, resultado='ok')
+    return True
+
+
+def periodo(registrada):
+    return getattr(settings, 'TRABAJOS_PERIODOS', {}).get(registrada.nombre, registrada.cada)
+
+
+def programar_periodicas(ahora=None):
+    """Encola la próxima corrida de cada tarea periódica que no tenga una pendiente."""
+    ahora = ahora or timezone.now()
+    encoladas = 0
+    for registrada in TAREAS.values():
+        cada = periodo(registrada)
+        if not cada:
+            continue
+        llave = f'periodica:{registrada.nombre}'
+        trabajos = Trabajo.objects.filter(llave=llave)
+        if trabajos.filter(estado__in=(Trabajo.PENDIENTE, Trabajo.EN_CURSO)).exists():
+            continue
+        ultima = trabajos.aggregate(ultima=Max('terminado_en'))['ultima']
+        siguiente = max(ahora, ultima + timedelta(seconds=cada)) if ultima else ahora
+        encolar(registrada.nombre, llave=llave, disponible_en=siguiente)
+        encoladas += 1
+    return encoladas
+
+
+def resumen():
+    """Trabajos por estado, con ceros para los estados sin trabajos."""
+    conteo = dict(
+        Trabajo.objects.order_by().values_list('estado').annotate(n=Count('id'))
+    )
+    return {estado: conteo.get(estado, 0) for estado, _ in Trabajo.ESTADOS}
+
+
+def _en_cola():
+    try:
+        pendientes = list(
+            Trabajo.objects.filter(estado=Trabajo.PENDIENTE).order_by()
+            .values_list('tarea').annotate(n=Count('id'))
+        )
+    except DatabaseError:
+        # /metrics no debe caerse si la base no responde o falta la migración.
+        logger.warning('No se pudo leer la profundidad de la cola', exc_info=True)
+        return []
+    return [({'cola': nombre}, n) for nombre, n in pendientes]
+
+
+def registrar_metricas():
+    metricas.colector('iotic_trabajos_en_cola', _en_cola)
@@ -0,0 +1,82 @@
+import signal
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from trabajos.trabajador import Trabajador
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta los trabajos en segundo plano de la cola (tabla trabajos_trabajo) '
+        'con un grupo de hilos y, con --procesos, varios procesos. Termina el '
+        'trabajo en curso al recibir SIGTERM o Ctrl+C.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=2, help='Hilos por proceso.')
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=1,
+            help='Procesos trabajadores; con más de uno este proceso solo los supervisa.',
+        )
+        parser.add_argument(
+            '--espera',
+            type=float,
+            default=1.0,
+            help='Segundos entre consultas a la cola cuando no hay trabajos listos.',
+        )
+        parser.add_argument(
+            '--vaciar',
+            action='store_true',
+            help='Termina cuando no quedan trabajos listos (útil en cron o pruebas).',
+        )
+        parser.add_argument(
+            '--sin-periodicas',
+            action='store_true',
+            help='No programa las tareas periódicas (si otro proceso ya lo hace).',
+        )
+
+    def handle(self, *args, **options):
+        if options['hilos'] < 1 or options['procesos'] < 1:
+            raise CommandError('--hilos y --procesos deben ser al menos 1.')
+        if options['procesos'] > 1:
+            return self.supervisar(options)
+
+        trabajador = Trabajador(
+            hilos=options['hilos'],
+            espera=options['espera'],
+            vaciar=options['vaciar'],
+            periodicas=not options['sin_periodicas'],
+        )
+        for senal in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(senal, lambda *_: trabajador.detener.set())
+        ejecutados = trabajador.correr()
+        self.stdout.write(self.style.SUCCESS(f'{ejecutados} trabajos ejecutados.'))
+
+    def supervisar(self, options):
+        comando = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'run_workers',
+            '--hilos', str(options['hilos']), '--espera', str(options['espera']),
+        ]
+        if options['vaciar']:
+            comando.append('--vaciar')
+        procesos = [
+            # Solo el primero programa las periódicas.
+            subprocess.Popen(comando + ([] if i == 0 and not options['sin_periodicas']
+                                        else ['--sin-periodicas']))
+            for i in range(options['procesos'])
+        ]
+
+        def reenviar(senal, _):
+            for proceso in procesos:
+                proceso.send_signal(senal)
+
+        for senal in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(senal, reenviar)
+        codigos = [proceso.wait() for proceso in procesos]
+        if any(codigos):
+            raise CommandError(f'Un proceso trabajador terminó con error: {codigos}')
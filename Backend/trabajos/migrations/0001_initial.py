@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Trabajo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarea', models.CharField(max_length=150)),
+                ('argumentos', models.JSONField(blank=True, default=list)),
+                ('argumentos_nombrados', models.JSONField(blank=True, default=dict)),
+                ('llave', models.CharField(blank=True, max_length=200)),
+                ('estado', models.CharField(choices=[('pendiente', 'pendiente'), ('en_curso', 'en_curso'), ('completado', 'completado'), ('fallido', 'fallido')], default='pendiente', max_length=20)),
+                ('intentos', models.PositiveIntegerField(default=0)),
+                ('max_intentos', models.PositiveIntegerField(default=5)),
+                ('disponible_en', models.DateTimeField()),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('tomado_en', models.DateTimeField(blank=True, null=True)),
+                ('terminado_en', models.DateTimeField(blank=True, null=True)),
+                ('trabajador', models.CharField(blank=True, max_length=100)),
+                ('resultado', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['estado', 'disponible_en'], name='trabajo_listo'), models.Index(fields=['llave', 'estado'], name='trabajo_llave')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('estado', 'pendiente'), models.Q(('llave', ''), _negated=True)), fields=('llave',), name='trabajo_pendiente_unico')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+CODIGO = 'trabajos.ver'
+
+
+def agregar_permiso(apps, schema_editor):
+    Permiso = apps.get_model('usuarios', 'Permiso')
+    Rol = apps.get_model('usuarios', 'Rol')
+    permiso, _ = Permiso.objects.get_or_create(
+        codigo=CODIGO, defaults={'descripcion': 'Consultar los trabajos en segundo plano'}
+    )
+    Rol.objects.get_or_create(nombre='admin')[0].permisos.add(permiso)
+
+
+def quitar_permiso(apps, schema_editor):
+    apps.get_model('usuarios', 'Permiso').objects.filter(codigo=CODIGO).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trabajos', '0001_initial'),
+        ('usuarios', '0003_roles'),
+    ]
+
+    operations = [
+        migrations.RunPython(agregar_permiso, quitar_permiso),
+    ]
@@ -0,0 +1,50 @@
+from django.db import models
+from django.db.models import Q
+
+
+class Trabajo(models.Model):
+    """Tarea en segundo plano y su estado; la base de datos hace de cola."""
+
+    PENDIENTE = 'pendiente'
+    EN_CURSO = 'en_curso'
+    COMPLETADO = 'completado'
+    FALLIDO = 'fallido'
+    ESTADOS = [
+        (PENDIENTE, PENDIENTE),
+        (EN_CURSO, EN_CURSO),
+        (COMPLETADO, COMPLETADO),
+        (FALLIDO, FALLIDO),
+    ]
+
+    tarea = models.CharField(max_length=150)
+    argumentos = models.JSONField(default=list, blank=True)
+    argumentos_nombrados = models.JSONField(default=dict, blank=True)
+    # Con llave, no se encola otro igual mientras haya uno pendiente.
+    llave = models.CharField(max_length=200, blank=True)
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    intentos = models.PositiveIntegerField(default=0)
+    max_intentos = models.PositiveIntegerField(default=5)
+    disponible_en = models.DateTimeField()
+    creado_en = models.DateTimeField(auto_now_add=True)
+    tomado_en = models.DateTimeField(null=True, blank=True)
+    terminado_en = models.DateTimeField(null=True, blank=True)
+    trabajador = models.CharField(max_length=100, blank=True)
+    resultado = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['estado', 'disponible_en'], name='trabajo_listo'),
+            models.Index(fields=['llave', 'estado'], name='trabajo_llave'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['llave'],
+                condition=Q(estado='pendiente') & ~Q(llave=''),
+                name='trabajo_pendiente_unico',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.tarea} #{self.pk} ({self.estado})'
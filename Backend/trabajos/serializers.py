@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+from .models import Trabajo
+
+
+class TrabajoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Trabajo
+        fields = [
+            'id',
+            'tarea',
+            'estado',
+            'intentos',
+            'max_intentos',
+            'disponible_en',
+            'creado_en',
+            'tomado_en',
+            'terminado_en',
+            'resultado',
+            'error',
+        ]
@@ -0,0 +1,218 @@
+import datetime
+import io
+import time
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ayudas_pruebas import iniciar_sesion
+from ioticsemillero import metricas
+
+from . import cola
+from .models import Trabajo
+
+LLAMADAS = []
+
+
+@cola.tarea(nombre='pruebas.sumar')
+def sumar(a, b=0):
+    LLAMADAS.append((a, b))
+    return {'total': a + b}
+
+
+@cola.tarea(nombre='pruebas.fallar', max_intentos=3)
+def fallar():
+    raise ConnectionError('sin red')
+
+
+@cola.tarea(nombre='pruebas.esperar')
+def esperar(segundos):
+    time.sleep(segundos)
+
+
+@override_settings(TRABAJOS_REINTENTO_BASE=10, TRABAJOS_REINTENTO_MAXIMO=3600)
+class ColaTests(TestCase):
+    def setUp(self):
+        LLAMADAS.clear()
+
+    def test_encola_toma_y_ejecuta(self):
+        trabajo = sumar.encolar(2, b=3)
+
+        self.assertEqual(trabajo.estado, Trabajo.PENDIENTE)
+        self.assertEqual(LLAMADAS, [])
+        tomado = cola.tomar('prueba')
+        self.assertEqual((tomado.pk, tomado.estado, tomado.intentos), (trabajo.pk, 'en_curso', 1))
+        self.assertIsNone(cola.tomar('otro'))
+        self.assertTrue(cola.ejecutar(tomado))
+
+        trabajo.refresh_from_db()
+        self.assertEqual(LLAMADAS, [(2, 3)])
+        self.assertEqual(trabajo.estado, Trabajo.COMPLETADO)
+        self.assertEqual(trabajo.resultado, {'total': 5})
+        self.assertIsNotNone(trabajo.terminado_en)
+
+    def test_respeta_el_orden_y_el_retraso(self):
+        despues = sumar.encolar(1, retraso=60)
+        primero = sumar.encolar(2)
+
+        self.assertEqual(cola.tomar('prueba').pk, primero.pk)
+        self.assertIsNone(cola.tomar('prueba'))
+        futuro = timezone.now() + datetime.timedelta(seconds=61)
+        self.assertEqual(cola.tomar('prueba', ahora=futuro).pk, despues.pk)
+
+    def test_reintenta_con_espera_creciente_y_luego_falla(self):
+        trabajo = fallar.encolar()
+        ahora = timezone.now()
+        esperas = []
+        for _ in range(3):
+            tomado = cola.tomar('prueba', ahora=ahora)
+            antes = timezone.now()
+            self.assertFalse(cola.ejecutar(tomado))
+            tomado.refresh_from_db()
+            if tomado.estado == Trabajo.PENDIENTE:
+                esperas.append((tomado.disponible_en - antes).total_seconds())
+                ahora = tomado.disponible_en
+
+        trabajo.refresh_from_db()
+        self.assertEqual(trabajo.estado, Trabajo.FALLIDO)
+        self.assertEqual(trabajo.intentos, 3)
+        self.assertEqual(trabajo.error, 'ConnectionError: sin red')
+        # 10 s y 20 s, con variación de ±25 %.
+        self.assertEqual(len(esperas), 2)
+        self.assertTrue(7 <= esperas[0] <= 13 and 14 <= esperas[1] <= 26, esperas)
+
+    def test_la_llave_funde_trabajos_pendientes(self):
+        primero = sumar.encolar(1, llave='sumar:1')
+        segundo = sumar.encolar(1, llave='sumar:1')
+
+        self.assertEqual(primero.pk, segundo.pk)
+        # En curso ya no cuenta: un cambio posterior necesita otra corrida.
+        cola.tomar('prueba')
+        tercero = sumar.encolar(1, llave='sumar:1')
+        self.assertNotEqual(tercero.pk, primero.pk)
+        self.assertEqual(Trabajo.objects.count(), 2)
+
+    @override_settings(TRABAJOS_VENCIMIENTO=60)
+    def test_retoma_trabajos_de_un_trabajador_caido(self):
+        trabajo = sumar.encolar(4)
+        cola.tomar('caido')
+
+        self.assertIsNone(cola.tomar('vivo'))
+        despues = timezone.now() + datetime.timedelta(seconds=61)
+        retomado = cola.tomar('vivo', ahora=despues)
+        self.assertEqual(
+            (retomado.pk, retomado.trabajador, retomado.intentos), (trabajo.pk, 'vivo', 2)
+        )
+        self.assertTrue(cola.ejecutar(retomado))
+
+    @override_settings(TRABAJOS_VENCIMIENTO=60)
+    def test_el_latido_evita_que_lo_retomen(self):
+        trabajo = sumar.encolar(4)
+        tomado = cola.tomar('vivo')
+        despues = timezone.now() + datetime.timedelta(seconds=61)
+
+        self.assertTrue(cola.latido(tomado, ahora=despues - datetime.timedelta(seconds=30)))
+        self.assertIsNone(cola.tomar('otro', ahora=despues))
+        self.assertTrue(cola.ejecutar(tomado))
+        # Terminado ya no se renueva.
+        self.assertFalse(cola.latido(tomado))
+        trabajo.refresh_from_db()
+        self.assertEqual(trabajo.estado, Trabajo.COMPLETADO)
+
+    @override_settings(TRABAJOS_VENCIMIENTO=60)
+    def test_abandonado_sin_intentos_queda_fallido(self):
+        trabajo = fallar.encolar()
+        Trabajo.objects.filter(pk=trabajo.pk).update(
+            estado=Trabajo.EN_CURSO, intentos=3, tomado_en=timezone.now(), trabajador='caido'
+        )
+        despues = timezone.now() + datetime.timedelta(seconds=61)
+
+        self.assertIsNone(cola.tomar('vivo'))
+        self.assertIsNone(cola.tomar('vivo', ahora=despues))
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.intentos), (Trabajo.FALLIDO, 3))
+        self.assertIn('dejó de responder', trabajo.error)
+
+    @override_settings(TRABAJOS_PERIODOS={'inventario.tareas.marcar_vencidos': 120})
+    def test_programa_las_periodicas_una_a_la_vez(self):
+        ahora = timezone.now()
+        llave = 'periodica:inventario.tareas.marcar_vencidos'
+
+        cola.programar_periodicas(ahora)
+        cola.programar_periodicas(ahora)
+        self.assertEqual(Trabajo.objects.filter(llave=llave).count(), 1)
+        self.assertFalse(Trabajo.objects.filter(tarea='informacion.tareas.recolectar_almacenamiento'))
+
+        trabajo = cola.tomar('prueba', ahora=ahora)
+        self.assertTrue(cola.ejecutar(trabajo))
+        self.assertEqual(trabajo.resultado, {'vencidos': 0})
+        cola.programar_periodicas(ahora)
+        siguiente = Trabajo.objects.get(llave=llave, estado=Trabajo.PENDIENTE)
+        self.assertAlmostEqual(
+            (siguiente.disponible_en - trabajo.terminado_en).total_seconds(), 120, delta=1
+        )
+
+    def test_endpoint_de_estado(self):
+        cliente = APIClient()
+        trabajo = sumar.encolar(1)
+        fallar.encolar()
+
+        self.assertEqual(cliente.get(f'/api/trabajos/{trabajo.pk}/').status_code, 401)
+        iniciar_sesion(cliente, rol='mentor')
+        self.assertEqual(cliente.get('/api/trabajos/resumen/').status_code, 403)
+        iniciar_sesion(cliente)
+        respuesta = cliente.get(f'/api/trabajos/{trabajo.pk}/')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.data['estado'], Trabajo.PENDIENTE)
+        self.assertNotIn('argumentos', respuesta.data)
+        cola.ejecutar(cola.tomar('prueba'))
+        self.assertEqual(cliente.get(f'/api/trabajos/{trabajo.pk}/').data['estado'], 'completado')
+
+        lista = cliente.get('/api/trabajos/', {'tarea': 'pruebas.fallar'})
+        self.assertEqual([t['tarea'] for t in lista.data], ['pruebas.fallar'])
+        resumen = cliente.get('/api/trabajos/resumen/').data
+        self.assertEqual(resumen, {'pendiente': 1, 'en_curso': 0, 'completado': 1, 'fallido': 0})
+        self.assertEqual(cliente.get('/api/trabajos/0/').status_code, 404)
+
+    @override_settings(METRICAS=True)
+    def test_profundidad_en_metricas(self):
+        sumar.encolar(1)
+        sumar.encolar(2)
+
+        self.assertIn('iotic_trabajos_en_cola{cola="pruebas.sumar"} 2', metricas.exponer())
+
+
+class RunWorkersTests(TransactionTestCase):
+    def setUp(self):
+        LLAMADAS.clear()
+
+    def test_vacia_la_cola(self):
+        for i in range(20):
+            sumar.encolar(i)
+        fallar.encolar()
+        salida = io.StringIO()
+
+        # Un hilo: la base en memoria de las pruebas no espera a otros escritores.
+        call_command('run_workers', hilos=1, vaciar=True, sin_periodicas=True, stdout=salida)
+
+        self.assertEqual(sorted(a for a, _ in LLAMADAS), list(range(20)))
+        self.assertEqual(Trabajo.objects.filter(estado=Trabajo.COMPLETADO).count(), 20)
+        # El que falla queda esperando su reintento.
+        fallido = Trabajo.objects.get(tarea='pruebas.fallar')
+        self.assertEqual((fallido.estado, fallido.intentos), (Trabajo.PENDIENTE, 1))
+        self.assertIn('21 trabajos ejecutados', salida.getvalue())
+
+    @override_settings(TRABAJOS_VENCIMIENTO=0.3)
+    def test_renueva_los_trabajos_largos(self):
+        trabajo = esperar.encolar(1)
+
+        call_command(
+            'run_workers', hilos=1, vaciar=True, sin_periodicas=True, stdout=io.StringIO()
+        )
+
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.intentos), (Trabajo.COMPLETADO, 1))
+        # Sin latidos tomado_en sería el momento en que se tomó.
+        self.assertGreater((trabajo.tomado_en - trabajo.creado_en).total_seconds(), 0.5)
@@ -0,0 +1,104 @@
+"""Hilos que toman y ejecutan trabajos de la cola (``manage.py run_workers``)."""
+import logging
+import threading
+
+from django.db import close_old_connections
+
+from . import cola
+
+logger = logging.getLogger(__name__)
+
+
+class Trabajador:
+    """``hilos`` consumidores, uno que renueva los trabajos en curso y otro que
+    programa las tareas periódicas.
+
+    Sin trabajos listos cada hilo espera ``espera`` segundos antes de volver a
+    consultar. ``detener`` (un ``threading.Event``) termina los hilos al acabar
+    el trabajo en curso; con ``vaciar=True`` terminan solos cuando no queda
+    nada listo.
+    """
+
+    def __init__(self, hilos=2, espera=1.0, vaciar=False, periodicas=True):
+        self.hilos = hilos
+        self.espera = espera
+        self.vaciar = vaciar
+        self.periodicas = periodicas
+        self.detener = threading.Event()
+        self.ejecutados = 0
+        self.en_curso = {}
+        self._candado = threading.Lock()
+
+    def consumir(self):
+        nombre = cola.nombre_trabajador()
+        while not self.detener.is_set():
+            close_old_connections()
+            try:
+                trabajo = cola.tomar(nombre)
+            except Exception:
+                # La base puede estar bloqueada o caída: se reintenta luego.
+                logger.exception('No se pudo tomar un trabajo')
+                trabajo = None
+            if trabajo is None:
+                if self.vaciar:
+                    break
+                self.detener.wait(self.espera)
+                continue
+            with self._candado:
+                self.en_curso[trabajo.pk] = trabajo
+            try:
+                cola.ejecutar(trabajo)
+            except Exception:
+                # No se pudo guardar el resultado: queda en curso y otro lo
+                # retoma al pasar TRABAJOS_VENCIMIENTO.
+                logger.exception('No se pudo cerrar el trabajo %s', trabajo)
+            with self._candado:
+                del self.en_curso[trabajo.pk]
+                self.ejecutados += 1
+        close_old_connections()
+
+    def latir(self):
+        """Renueva ``tomado_en`` de los trabajos en curso para que nadie los retome."""
+        while not self.detener.wait(cola.vencimiento() / 3):
+            close_old_connections()
+            with self._candado:
+                trabajos = list(self.en_curso.values())
+            for trabajo in trabajos:
+                try:
+                    cola.latido(trabajo)
+                except Exception:
+                    logger.exception('No se pudo renovar el trabajo %s', trabajo)
+        close_old_connections()
+
+    def programar(self):
+        while not self.detener.is_set():
+            close_old_connections()
+            try:
+                cola.programar_periodicas()
+            except Exception:
+                logger.exception('No se pudieron programar las tareas periódicas')
+            self.detener.wait(max(self.espera, 5.0))
+        close_old_connections()
+
+    def correr(self):
+        """Bloquea hasta que ``detener`` se active (o la cola se vacíe)."""
+        if self.periodicas and self.vaciar:
+            cola.programar_periodicas()
+        consumidores = [
+            threading.Thread(target=self.consumir, name=f'trabajador-{i}')
+            for i in range(self.hilos)
+        ]
+        auxiliares = [threading.Thread(target=self.latir, name='trabajador-latidos')]
+        if self.periodicas and not self.vaciar:
+            auxiliares.append(threading.Thread(target=self.programar, name='trabajador-periodicas'))
+        for hilo in consumidores + auxiliares:
+            hilo.start()
+        try:
+            while any(hilo.is_alive() for hilo in consumidores):
+                for hilo in consumidores:
+                    hilo.join(timeout=0.5)
+        finally:
+            self.detener.set()
+            for hilo in auxiliares:
+                hilo.join()
+        return self.ejecutados
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import TrabajoViewSet
+
+urlpatterns = [
+    path('', TrabajoViewSet.as_view({'get': 'list'}), name='trabajo-list'),
+    path('resumen/', TrabajoViewSet.as_view({'get': 'resumen'}), name='trabajo-resumen'),
+    path('<int:pk>/', TrabajoViewSet.as_view({'get': 'retrieve'}), name='trabajo-detail'),
+]
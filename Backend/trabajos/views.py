@@ -0,0 +1,22 @@
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+from . import cola
+from .models import Trabajo
+from .serializers import TrabajoSerializer
+
+
+class TrabajoViewSet(viewsets.ReadOnlyModelViewSet):
+    """Estado de los trabajos en segundo plano, para que los administradores revisen la cola."""
+
+    queryset = Trabajo.objects.all()
+    serializer_class = TrabajoSerializer
+    # Los errores y resultados pueden incluir datos de otros usuarios.
+    permisos_requeridos = {'*': 'trabajos.ver'}
+    filtros = {
+        'estado': 'estado',
+        'tarea': 'tarea',
+    }
+
+    def resumen(self, request, *args, **kwargs):
+        return Response(cola.resumen())
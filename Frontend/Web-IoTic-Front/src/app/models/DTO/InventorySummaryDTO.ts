@@ -0,0 +1,7 @@
+export interface InventorySummaryDTO {
+  descripcion: string;
+  disponibles: number;
+  prestados: number;
+  no_prestar: number;
+  total: number;
+}
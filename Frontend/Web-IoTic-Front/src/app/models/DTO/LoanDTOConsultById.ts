@@ -11,5 +11,5 @@ export interface LoanDTOConsultById {
   fecha_prestamo: string;      
   fecha_limite: string;        
   fecha_devolucion: string | null;  
-  estado: 'Prestado' | 'Devuelto' | 'No prestado'; 
+  estado: 'Prestado' | 'Vencido' | 'Devuelto' | 'No prestado'; 
 }
@@ -48,8 +48,8 @@ export class AddLoan implements OnInit {
 
 loadAvailableItems(): void {
   this.inventoryService.getElectronicComponent().subscribe({
-    next: (items) => {
-      this.availableItems = items;
+    next: (page) => {
+      this.availableItems = page.items;
     },
     error: (error: unknown) => {
       console.error('Error al cargar los items:', error);
@@ -8,6 +8,8 @@ import { Route, RouterLink, RouterModule } from '@angular/router';
 import { Router } from '@angular/router';
 import { LoadingService } from '../../../../services/loading.service';
 import { LoadingPage } from '../../components/loading-page/loading-page';
+import { Page } from '../../../../services/common/pagination';
+import { InventorySummaryDTO } from '../../../../models/DTO/InventorySummaryDTO';
 
 
 @Component({
@@ -24,7 +26,7 @@ export class InventoryPageComponent implements OnInit {
     total_items: 0,
     disponibles: 0,
     prestados: 0,
-    dañados: 0
+    no_prestar: 0
   };
   public options = [
     {
@@ -41,6 +43,9 @@ export class InventoryPageComponent implements OnInit {
     },
   ];
   public inventoryData: ItemDTO[] = [];
+  /** URL de la página siguiente de items; null si ya se cargaron todos. */
+  public nextPage: string | null = null;
+  public loadingMore: boolean = false;
 
   constructor(private inventoryService: InventoryService,
     public loadingService: LoadingService,
@@ -51,41 +56,57 @@ export class InventoryPageComponent implements OnInit {
     this.loadInventoryData();
   }
   /**
-   * Carga los datos del inventario desde el servicio y actualiza el resumen.
+   * Carga la primera página del inventario y el resumen desde el servicio.
    */
   loadInventoryData() {
     this.loadingService.show();
     console.log('Cargando datos del inventario desde el componente.');
     this.inventoryService.getElectronicComponent().subscribe({
-      next: (data: ItemDTO[]) => {
-        this.inventoryData = data;
-        this.updateResume();
+      next: (page: Page<ItemDTO>) => {
+        this.inventoryData = page.items;
+        this.nextPage = page.next;
         this.loadingService.hide();
       },
       error: (err) => {
         console.error('Error al cargar los datos del inventario:', err);
+        this.loadingService.hide();
+      }
+    });
+    this.inventoryService.getInventorySummary().subscribe({
+      next: (summary: InventorySummaryDTO[]) => this.updateResume(summary),
+      error: (err) => {
+        console.error('Error al cargar el resumen del inventario:', err);
       }
     });
   }
   /**
-   * Actualiza el resumen del inventario basado en los datos cargados.
+   * Agrega la página siguiente de items a la tabla.
    */
- updateResume() {
-  // Total de ítems en el inventario
-  this.resume.total_items = this.inventoryData.length;
-
-  // Contadores según estado
-  this.resume.disponibles = this.inventoryData.filter(
-    item => item.estado_admin.toLowerCase() === 'disponible'
-  ).length;
-
-  this.resume.prestados = this.inventoryData.filter(
-    item => item.estado_admin.toLowerCase() === 'prestado'
-  ).length;
-
-  this.resume.dañados = this.inventoryData.filter(
-    item => item.estado_fisico === 'Dañado'
-  ).length;
+  loadMore() {
+    if (!this.nextPage || this.loadingMore) {
+      return;
+    }
+    this.loadingMore = true;
+    this.inventoryService.getElectronicComponent(this.nextPage).subscribe({
+      next: (page: Page<ItemDTO>) => {
+        this.inventoryData = [...this.inventoryData, ...page.items];
+        this.nextPage = page.next;
+        this.loadingMore = false;
+      },
+      error: (err) => {
+        console.error('Error al cargar más items del inventario:', err);
+        this.loadingMore = false;
+      }
+    });
+  }
+  /**
+   * Actualiza el resumen con los contadores del backend (no depende de las páginas cargadas).
+   */
+ updateResume(summary: InventorySummaryDTO[]) {
+  this.resume.total_items = summary.reduce((total, row) => total + row.total, 0);
+  this.resume.disponibles = summary.reduce((total, row) => total + row.disponibles, 0);
+  this.resume.prestados = summary.reduce((total, row) => total + row.prestados, 0);
+  this.resume.no_prestar = summary.reduce((total, row) => total + row.no_prestar, 0);
 }
 
   /**
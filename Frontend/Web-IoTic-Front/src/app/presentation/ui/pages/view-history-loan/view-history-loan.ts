@@ -8,6 +8,8 @@ import { LoadingService } from '../../../../services/loading.service';
 import { LoanService } from '../../../../services/Loan.service';
 import { LoanDTO } from '../../../../models/DTO/LoanDTO';
 import { LoanHistoryDTO } from '../../../../models/DTO/LoanHistoryDTO';
+import { Page } from '../../../../services/common/pagination';
+import { Observable } from 'rxjs';
 
 @Component({
   selector: 'app-view-history-loan',
@@ -20,6 +22,9 @@ export class ViewHistoryLoan implements OnInit {
   public displayedLoans: LoanDTO[] = [];
   public searchText: string = '';
   public activeFilter: FilterType = 'vigentes';
+  /** URL de la página siguiente del filtro activo; null si ya se cargó todo. */
+  public nextPage: string | null = null;
+  public loadingMore: boolean = false;
 
   constructor(
     public loadingService: LoadingService,
@@ -49,43 +54,63 @@ export class ViewHistoryLoan implements OnInit {
    *  CARGA SEGÚN FILTRO
    * ========================== */
   private loadLoansByFilter(filter: FilterType): void {
+    const request$ = this.requestByFilter(filter);
+    if (!request$) {
+      return;
+    }
     this.loadingService.show();
 
-    let request$;
-
-    switch (filter) {
-      case 'vigentes':
-        request$ = this.loanService.getLoansCurrent();
-        break;
-
-      case 'atrasados':
-        request$ = this.loanService.getOverdueLoans();
-        break;
-
-      case 'devueltos':
-        request$ = this.loanService.getLoansReturned();
-        break;
-
-      case 'todos':
-        request$ = this.loanService.getLoans();
-        break;
+    request$.subscribe({
+      next: (page: Page<LoanDTO>) => {
+        this.displayedLoans = page.items;
+        this.nextPage = page.next;
+        this.loadingService.hide();
+      },
+      error: (err) => {
+        console.error('Error loading loans:', err);
+        this.loadingService.hide();
+      }
+    });
+  }
 
-      default:
-        return;
+  /** ==========================
+   *  SIGUIENTE PÁGINA
+   * ========================== */
+  loadMore(): void {
+    const request$ = this.nextPage ? this.requestByFilter(this.activeFilter, this.nextPage) : null;
+    if (!request$ || this.loadingMore) {
+      return;
     }
+    this.loadingMore = true;
 
     request$.subscribe({
-      next: (loans: LoanDTO[]) => {
-        this.displayedLoans = loans;
-        this.loadingService.hide();
+      next: (page: Page<LoanDTO>) => {
+        this.displayedLoans = [...this.displayedLoans, ...page.items];
+        this.nextPage = page.next;
+        this.loadingMore = false;
       },
       error: (err) => {
         console.error('Error loading loans:', err);
-        this.loadingService.hide();
+        this.loadingMore = false;
       }
     });
   }
 
+  private requestByFilter(filter: FilterType, next?: string): Observable<Page<LoanDTO>> | null {
+    switch (filter) {
+      case 'vigentes':
+        return this.loanService.getLoansCurrent(next);
+      case 'atrasados':
+        return this.loanService.getOverdueLoans(next);
+      case 'devueltos':
+        return this.loanService.getLoansReturned(next);
+      case 'todos':
+        return this.loanService.getLoans(next);
+      default:
+        return null;
+    }
+  }
+
 
 
 }
@@ -188,6 +188,6 @@ export class ViewLoanItem implements OnInit {
    * Consultar si el préstamo está activo
    */
   isLoanActive(): boolean {
-    return this.loanData?.estado === 'Prestado';
+    return this.loanData?.estado === 'Prestado' || this.loanData?.estado === 'Vencido';
   }
 }
@@ -6,6 +6,7 @@ import { LoanDTO } from '../models/DTO/LoanDTO';
 import { LoanPeticion } from '../models/Peticion/LoanPeticion';
 import { LoanDTOConsultById } from '../models/DTO/LoanDTOConsultById';
 import { AppConfigService } from './common/app-config.service';
+import { Page, getPage, withPageSize } from './common/pagination';
 
 @Injectable({
   providedIn: 'root'
@@ -21,15 +22,11 @@ export class LoanService {
 
   /**
    * Consultar todos los préstamos
-   * @returns Observable<LoanDTO[]> Lista de préstamos
+   * @param next URL de la página siguiente; sin ella se pide la primera
+   * @returns Observable<Page<LoanDTO>> Página de préstamos
    */
-  getLoans(): Observable<LoanDTO[]> {
-      return this.http.get<LoanDTO[]>(`${this.config.apiUrlBackend}inventario/prestamos/history/`).pipe(
-        catchError(error => {
-          console.error('Error al obtener préstamos:', error);
-          return throwError(() => error);
-        })
-      );
+  getLoans(next?: string): Observable<Page<LoanDTO>> {
+    return this.getLoanPage('inventario/prestamos/history/', 'Error al obtener préstamos:', next);
   }
     /**
    * Obtener préstamo por ID
@@ -47,53 +44,37 @@ export class LoanService {
   }
   /**
    * Obtener préstamos todos los préstamos activos 
-   * @returns Observable<LoanDTO[]> Préstamos activos
+   * @param next URL de la página siguiente; sin ella se pide la primera
+   * @returns Observable<Page<LoanDTO>> Página de préstamos activos
    */
-  getLoansCurrent(): Observable<LoanDTO[]> {
-      return  this.http.get<LoanDTO[]>(`${this.config.apiUrlBackend}inventario/prestamos/active/`).pipe(
-      catchError(error => {
-        console.error('Error al obtener préstamos activos:', error);
-        return throwError(() => error);
-      })
-    );
+  getLoansCurrent(next?: string): Observable<Page<LoanDTO>> {
+    return this.getLoanPage('inventario/prestamos/active/', 'Error al obtener préstamos activos:', next);
   }
   /**
    * Retorna los préstamos que han sido devueltos
-   * @returns Observable<LoanDTO[]> Obtener préstamos devueltos
+   * @param next URL de la página siguiente; sin ella se pide la primera
+   * @returns Observable<Page<LoanDTO>> Página de préstamos devueltos
    */
-  getLoansReturned(): Observable<LoanDTO[]> {
-      return this.http.get<LoanDTO[]>(`${this.config.apiUrlBackend}inventario/prestamos/returned/`).pipe(
-      catchError(error => {
-        console.error('Error al obtener préstamos devueltos:', error);
-        return throwError(() => error);
-      })
-    );
+  getLoansReturned(next?: string): Observable<Page<LoanDTO>> {
+    return this.getLoanPage('inventario/prestamos/returned/', 'Error al obtener préstamos devueltos:', next);
   }
 
 
   /**
    * Obtener préstamos vencidos
-   * @returns Observable<LoanDTO[]> Préstamos vencidos
+   * @param next URL de la página siguiente; sin ella se pide la primera
+   * @returns Observable<Page<LoanDTO>> Página de préstamos vencidos
    */
-  getOverdueLoans(): Observable<LoanDTO[]> {
-    return this.http.get<LoanDTO[]>(`${this.config.apiUrlBackend}inventario/prestamos/overdue/`).pipe(
-      catchError(error => {
-        console.error('Error al obtener préstamos vencidos:', error);
-        return throwError(() => error);
-      })
-    );
+  getOverdueLoans(next?: string): Observable<Page<LoanDTO>> {
+    return this.getLoanPage('inventario/prestamos/overdue/', 'Error al obtener préstamos vencidos:', next);
   }
   /**
    * Obtener préstamos por vencer dentro de 48 horas antes de su fecha de devolución
-   * @returns Observable<LoanDTO[]> Préstamos por vencer
+   * @param next URL de la página siguiente; sin ella se pide la primera
+   * @returns Observable<Page<LoanDTO>> Página de préstamos por vencer
    */
-  getLoansAboutToExpire(): Observable<LoanDTO[]> {
-    return this.http.get<LoanDTO[]>(`${this.config.apiUrlBackend}inventario/prestamos/por-vencer/`).pipe(
-      catchError(error => {
-        console.error('Error al obtener préstamos por vencer:', error);
-        return throwError(() => error);
-      })
-    );
+  getLoansAboutToExpire(next?: string): Observable<Page<LoanDTO>> {
+    return this.getLoanPage('inventario/prestamos/por-vencer/', 'Error al obtener préstamos por vencer:', next);
   }
 
     /**
@@ -151,6 +132,18 @@ export class LoanService {
       })
     );
   }
-  
-  
+
+  /**
+   * Consulta una página de una lista de préstamos.
+   * El historial solo crece: se pide por páginas y se sigue la cabecera Link.
+   */
+  private getLoanPage(path: string, errorMessage: string, next?: string): Observable<Page<LoanDTO>> {
+    const url = next ?? withPageSize(`${this.config.apiUrlBackend}${path}`);
+    return getPage<LoanDTO>(this.http, url).pipe(
+      catchError(error => {
+        console.error(errorMessage, error);
+        return throwError(() => error);
+      })
+    );
+  }
 }
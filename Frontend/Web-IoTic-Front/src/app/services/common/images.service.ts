@@ -75,6 +75,18 @@ export class ImagesService {
     });
   }
 
+  /**
+   * Solicita varias URLs firmadas en una sola petición (galerías)
+   * @param archivos extensión y tipo MIME de cada imagen, en orden
+   * @returns Observable con una lista de { upload_url, file_path, key }
+   *  en el mismo orden que los archivos
+   */
+  getPresignedUrls(archivos: { extension: string; content_type: string }[]): Observable<any[]> {
+    return this.http.post<any[]>(`${this.config.apiUrlBackend}informacion/urlfirmada/images/lote/`, {
+      archivos
+    });
+  }
+
   /**
    * Sube un archivo a R2 usando la URL firmada proporcionada
    * @param uploadUrl URL firmada para subir el archivo
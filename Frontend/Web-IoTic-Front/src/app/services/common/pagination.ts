@@ -0,0 +1,41 @@
+import { HttpClient, HttpResponse } from '@angular/common/http';
+import { Observable, map } from 'rxjs';
+
+/** Elementos por página que se piden a las listas paginadas del backend. */
+export const PAGE_SIZE = 50;
+
+/**
+ * Una página de una lista del backend.
+ * `next` es la URL de la página siguiente (cabecera `Link`), o null si no hay más.
+ */
+export interface Page<T> {
+  items: T[];
+  next: string | null;
+}
+
+/**
+ * Agrega `page_size` a la URL para que el backend responda por páginas.
+ */
+export function withPageSize(url: string, size: number = PAGE_SIZE): string {
+  return `${url}${url.includes('?') ? '&' : '?'}page_size=${size}`;
+}
+
+/**
+ * Extrae la URL con rel="next" de una cabecera `Link`.
+ */
+export function nextLink(link: string | null): string | null {
+  const match = link?.match(/<([^>]+)>;\s*rel="next"/);
+  return match ? match[1] : null;
+}
+
+/**
+ * Consulta una página de una lista y devuelve sus elementos junto al enlace siguiente.
+ */
+export function getPage<T>(http: HttpClient, url: string): Observable<Page<T>> {
+  return http.get<T[]>(url, { observe: 'response' }).pipe(
+    map((response: HttpResponse<T[]>) => ({
+      items: response.body ?? [],
+      next: nextLink(response.headers.get('Link')),
+    }))
+  );
+}
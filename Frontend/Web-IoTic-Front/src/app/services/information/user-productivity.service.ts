@@ -1,21 +1,8 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { Observable, forkJoin, of, throwError } from 'rxjs';
+import { Observable, of } from 'rxjs';
 import { map, catchError } from 'rxjs/operators';
 import { BaseProductivityDTO } from '../../models/Common/BaseProductivityDTO';
-import { BooksService } from './books.service';
-import { CapBookService } from './cap-book.service';
-import { CursoService } from './curso.service';
-import { EventoService } from './evento.service';
-import { RevistaService } from './revista.service';
-import { SoftwareService } from './software.service';
-import { TutoriaConcluidaService } from './tutoria-concluida.service';
-import { TutoriaEnMarchaService } from './tutoria-en-marcha.service';
-import { TrabajoEventosService } from './trabajo-eventos.service';
-import { ParticipacionComitesEvService } from './participacion-comites-ev.service';
-import { MaterialDidacticoService } from './material-didactico.service';
-import { JuradoService } from './jurado.service';
-import { ProcesoTecnicaService } from './proceso-tecnica.service';
 import { AppConfigService } from '../common/app-config.service';
 
 export interface UserProductivityItem extends BaseProductivityDTO {
@@ -42,6 +29,23 @@ interface PublicacionesBackendResponse {
   'tutorias en marcha': BaseProductivityDTO[];
 }
 
+// Dimensiones por las que el backend agrupa las estadísticas de publicaciones
+export type StatisticsDimension = 'anio' | 'tipo' | 'pais' | 'usuario';
+
+export interface StatisticsGroup {
+  anio?: string;
+  tipo?: string;
+  pais?: string;
+  usuario?: number | null;
+  total: number;
+}
+
+export interface StatisticsResponse {
+  agrupar: StatisticsDimension[];
+  total: number;
+  grupos: StatisticsGroup[];
+}
+
 @Injectable({
   providedIn: 'root'
 })
@@ -85,20 +89,7 @@ export class UserProductivityService {
 
   constructor(
     private http: HttpClient,
-    private config: AppConfigService,
-    private booksService: BooksService,
-    private capBookService: CapBookService,
-    private cursoService: CursoService,
-    private eventoService: EventoService,
-    private revistaService: RevistaService,
-    private softwareService: SoftwareService,
-    private tutoriaConcluidaService: TutoriaConcluidaService,
-    private tutoriaEnMarchaService: TutoriaEnMarchaService,
-    private trabajoEventosService: TrabajoEventosService,
-    private participacionComitesEvService: ParticipacionComitesEvService,
-    private materialDidacticoService: MaterialDidacticoService,
-    private juradoService: JuradoService,
-    private procesoTecnicaService: ProcesoTecnicaService
+    private config: AppConfigService
   ) {}
 
   /**
@@ -191,70 +182,24 @@ export class UserProductivityService {
 
   /**
    * Obtiene la última publicación de cada tipo de productividad
+   * El backend mantiene un índice con la más reciente de cada tipo y la entrega en una sola respuesta
    * @returns Observable con un objeto que contiene la última publicación de cada tipo
    */
   getLatestPublicationsByType(): Observable<Record<string, UserProductivityItem | null>> {
-    console.log('Cargando últimas publicaciones de cada tipo...');
-    // Consultar todos los tipos de productividad en paralelo
-    return forkJoin({
-      libros: this.booksService.getBooks().pipe(catchError((err) => { console.error('Error al obtener libros:', err); return of([]); })),
-      capitulos: this.capBookService.getCapBooks().pipe(catchError((err) => { console.error('Error al obtener capítulos:', err); return of([]); })),
-      cursos: this.cursoService.getAll().pipe(catchError((err) => { console.error('Error al obtener cursos:', err); return of([]); })),
-      eventos: this.eventoService.getAll().pipe(catchError((err) => { console.error('Error al obtener eventos:', err); return of([]); })),
-      revistas: this.revistaService.getAll().pipe(catchError((err) => { console.error('Error al obtener revistas:', err); return of([]); })),
-      software: this.softwareService.getAll().pipe(catchError((err) => { console.error('Error al obtener software:', err); return of([]); })),
-      tutoriasConcluidas: this.tutoriaConcluidaService.getAll().pipe(catchError((err) => { console.error('Error al obtener tutorías concluidas:', err); return of([]); })),
-      tutoriasEnMarcha: this.tutoriaEnMarchaService.getAll().pipe(catchError((err) => { console.error('Error al obtener tutorías en marcha:', err); return of([]); })),
-      trabajosEventos: this.trabajoEventosService.getAll().pipe(catchError((err) => { console.error('Error al obtener trabajos en eventos:', err); return of([]); })),
-      participacionComites: this.participacionComitesEvService.getAll().pipe(catchError((err) => { console.error('Error al obtener participación en comités:', err); return of([]); })),
-      materialDidactico: this.materialDidacticoService.getAll().pipe(catchError((err) => { console.error('Error al obtener material didáctico:', err); return of([]); })),
-      jurados: this.juradoService.getAll().pipe(catchError((err) => { console.error('Error al obtener jurados:', err); return of([]); })),
-      procesosTecnicas: this.procesoTecnicaService.getAll().pipe(catchError((err) => { console.error('Error al obtener procesos o técnicas:', err); return of([]); }))
-    }).pipe(
-      map(results => {
-        console.log('Resultados de forkJoin recibidos:', {
-          libros: (results.libros as BaseProductivityDTO[])?.length || 0,
-          capitulos: (results.capitulos as BaseProductivityDTO[])?.length || 0,
-          cursos: (results.cursos as BaseProductivityDTO[])?.length || 0,
-          eventos: (results.eventos as BaseProductivityDTO[])?.length || 0,
-          revistas: (results.revistas as BaseProductivityDTO[])?.length || 0,
-          software: (results.software as BaseProductivityDTO[])?.length || 0,
-          tutoriasConcluidas: (results.tutoriasConcluidas as BaseProductivityDTO[])?.length || 0,
-          tutoriasEnMarcha: (results.tutoriasEnMarcha as BaseProductivityDTO[])?.length || 0,
-          trabajosEventos: (results.trabajosEventos as BaseProductivityDTO[])?.length || 0,
-          participacionComites: (results.participacionComites as BaseProductivityDTO[])?.length || 0,
-          materialDidactico: (results.materialDidactico as BaseProductivityDTO[])?.length || 0,
-          jurados: (results.jurados as BaseProductivityDTO[])?.length || 0,
-          procesosTecnicas: (results.procesosTecnicas as BaseProductivityDTO[])?.length || 0
-        });
-        
-        const latestPublications: Record<string, UserProductivityItem | null> = {};
+    const url = `${this.config.apiUrlBackend}informacion/publicaciones/ultimas/`;
 
-        // Función auxiliar para obtener la última publicación de un array
-        const getLatest = (items: BaseProductivityDTO[], tipo: string, tipoDisplay: string): UserProductivityItem | null => {
-          if (!items || items.length === 0) return null;
-          // Ordenar por ID descendente (asumiendo que IDs más altos son más recientes)
-          const sorted = [...items].sort((a, b) => b.id - a.id);
-          const latest = sorted[0];
-          return { ...latest, tipo, tipoDisplay };
-        };
+    return this.http.get<Record<string, BaseProductivityDTO | null>>(url).pipe(
+      map(response => {
+        const latestPublications: Record<string, UserProductivityItem | null> = {};
 
-        // Obtener la última publicación de cada tipo
-        latestPublications['libro'] = getLatest(results.libros as BaseProductivityDTO[], 'libro', this.tipoDisplayMap['libro']);
-        latestPublications['capitulo'] = getLatest(results.capitulos as BaseProductivityDTO[], 'capitulo', this.tipoDisplayMap['capitulo'] || 'Capítulo de libro');
-        latestPublications['curso'] = getLatest(results.cursos as BaseProductivityDTO[], 'curso', this.tipoDisplayMap['curso']);
-        latestPublications['evento'] = getLatest(results.eventos as BaseProductivityDTO[], 'evento', this.tipoDisplayMap['evento']);
-        latestPublications['revista'] = getLatest(results.revistas as BaseProductivityDTO[], 'revista', this.tipoDisplayMap['revista'] || 'Revista');
-        latestPublications['software'] = getLatest(results.software as BaseProductivityDTO[], 'software', this.tipoDisplayMap['software']);
-        latestPublications['tutoria_concluida'] = getLatest(results.tutoriasConcluidas as BaseProductivityDTO[], 'tutoria-concluida', this.tipoDisplayMap['tutoria_concluida']);
-        latestPublications['tutoria_en_marcha'] = getLatest(results.tutoriasEnMarcha as BaseProductivityDTO[], 'tutoria-en-marcha', this.tipoDisplayMap['tutoria_en_marcha']);
-        latestPublications['trabajo_eventos'] = getLatest(results.trabajosEventos as BaseProductivityDTO[], 'trabajo-eventos', this.tipoDisplayMap['trabajo_eventos']);
-        latestPublications['participacion_comites'] = getLatest(results.participacionComites as BaseProductivityDTO[], 'participacion-comites', this.tipoDisplayMap['participacion_comites']);
-        latestPublications['material_didactico'] = getLatest(results.materialDidactico as BaseProductivityDTO[], 'material-didactico', this.tipoDisplayMap['material_didactico']);
-        latestPublications['jurado'] = getLatest(results.jurados as BaseProductivityDTO[], 'jurado', this.tipoDisplayMap['jurado']);
-        latestPublications['proceso_tecnica'] = getLatest(results.procesosTecnicas as BaseProductivityDTO[], 'proceso-tecnica', this.tipoDisplayMap['proceso_tecnica']);
+        Object.keys(this.tipoDisplayMap).forEach(key => {
+          if (key === 'capitulos') return;
+          const latest = response?.[key];
+          latestPublications[key] = latest
+            ? { ...latest, tipo: key.replace(/_/g, '-'), tipoDisplay: this.tipoDisplayMap[key] }
+            : null;
+        });
 
-        console.log('Últimas publicaciones procesadas:', Object.keys(latestPublications).filter(k => latestPublications[k] !== null).length, 'tipos con publicaciones');
         return latestPublications;
       }),
       catchError(error => {
@@ -263,5 +208,22 @@ export class UserProductivityService {
       })
     );
   }
-}
 
+  /**
+   * Conteo de publicaciones agrupado por las dimensiones pedidas (reportes de acreditación)
+   * El backend responde desde una tabla de totales precalculados, sin recorrer las publicaciones
+   * @param groupBy Dimensiones a agrupar, p. ej. ['anio', 'tipo']
+   * @param filters Filtros por dimensión; varios valores separados por comas
+   */
+  getStatistics(
+    groupBy: StatisticsDimension[],
+    filters: Partial<Record<StatisticsDimension, string | number>> = {}
+  ): Observable<StatisticsResponse> {
+    const url = `${this.config.apiUrlBackend}informacion/publicaciones/estadisticas/`;
+    const params: Record<string, string> = { agrupar: groupBy.join(',') };
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== undefined && value !== '') params[key] = String(value);
+    });
+    return this.http.get<StatisticsResponse>(url, { params });
+  }
+}
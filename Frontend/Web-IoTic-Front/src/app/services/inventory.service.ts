@@ -1,10 +1,12 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { Observable, catchError, throwError } from 'rxjs';
+import { Observable, catchError, of, switchMap, throwError } from 'rxjs';
 import { environment } from '../environment/environment';
 import { ItemDTO } from '../models/DTO/ItemDTO';
 import { ItemDTOPeticion } from '../models/Peticion/ItemDTOPeticion';
 import { AppConfigService } from './common/app-config.service';
+import { Page, getPage, withPageSize } from './common/pagination';
+import { InventorySummaryDTO } from '../models/DTO/InventorySummaryDTO';
 
 @Injectable({ providedIn: 'root' })
 export class InventoryService {
@@ -13,12 +15,14 @@ export class InventoryService {
   constructor(private http: HttpClient, private config: AppConfigService) {}
 
   /**
-   * Consulta la lista de del invetario disponibles en el inventario.
-   * @returns Observable<ItemDTO[]> Lista de componentes electrónicos
+   * Consulta una página de los items del inventario.
+   * @param next URL de la página siguiente (cabecera Link); sin ella se pide la primera
+   * @returns Observable<Page<ItemDTO>> Página de componentes electrónicos
    */
 
-  getElectronicComponent(): Observable<ItemDTO[]> {
-    return this.http.get<ItemDTO[]>(`${this.config.apiUrlBackend}inventario/items`).pipe(
+  getElectronicComponent(next?: string): Observable<Page<ItemDTO>> {
+    const url = next ?? withPageSize(`${this.config.apiUrlBackend}inventario/items/`);
+    return getPage<ItemDTO>(this.http, url).pipe(
       catchError(error => {
         console.error('Error al obtener componentes:', error);
         return throwError(() => error);
@@ -49,7 +53,22 @@ export class InventoryService {
    * @returns item actualizado en el backend
    */
   updateElectronicComponent(id: number, updatedElectronicComponent: ItemDTOPeticion): Observable<ItemDTO> {
-    return this.http.put<ItemDTO>(`${this.config.apiUrlBackend}inventario/items/${id}/`, updatedElectronicComponent).pipe(
+    // El backend no edita estado_admin con los datos: se activa o desactiva aparte.
+    const url = `${this.config.apiUrlBackend}inventario/items/${id}/`;
+    const { estado_admin, ...datos } = updatedElectronicComponent;
+    return this.http.put<ItemDTO>(url, datos).pipe(
+      switchMap(item => {
+        if (item.estado_admin === 'Prestado' || item.estado_admin === estado_admin) {
+          return of(item);
+        }
+        if (estado_admin === 'No prestar') {
+          return this.http.patch<ItemDTO>(url, {});
+        }
+        if (estado_admin === 'Disponible') {
+          return this.http.patch<ItemDTO>(`${url}activate/`, {});
+        }
+        return of(item);
+      }),
       catchError(error => {
         console.error('Error al actualizar componente:', error);
         return throwError(() => error);
@@ -108,6 +127,19 @@ export class InventoryService {
     );
   }
 
+  /**
+   * Consulta los contadores de items por descripción y estado.
+   * @returns Lista con disponibles, prestados y no prestar por descripción
+   */
+  getInventorySummary(): Observable<InventorySummaryDTO[]> {
+    return this.http.get<InventorySummaryDTO[]>(`${this.config.apiUrlBackend}inventario/items/reports/summary/`).pipe(
+      catchError(error => {
+        console.error('Error al obtener el resumen del inventario:', error);
+        return throwError(() => error);
+      })
+    );
+  }
+
   /**
    * Consulta items dipsonibles en el inventario.
    * @returns Lista de itemns disponibles para prestar
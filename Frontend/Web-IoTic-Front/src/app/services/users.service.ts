@@ -1,6 +1,6 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { Observable, catchError, throwError, map, of } from 'rxjs';
+import { Observable, catchError, throwError, map, of, switchMap } from 'rxjs';
 import { UserDTO } from '../models/DTO/UserDTO';
 import { AppConfigService } from './common/app-config.service';
 
@@ -58,7 +58,10 @@ export class UsersService {
   }
 
   updateUser(userId: number, userData: UpdateUserDTO): Observable<UserDTO> {
-    return this.http.put<UserDTO>(`${this.config.apiUrlBackend}usuarios/${userId}/`, userData).pipe(
+    // El rol no se edita con los datos: tiene su propio endpoint (solo admin).
+    const { rol, ...datos } = userData;
+    const actualizado = this.http.put<UserDTO>(`${this.config.apiUrlBackend}usuarios/${userId}/`, datos);
+    return (rol ? actualizado.pipe(switchMap(user => user.rol === rol ? of(user) : this.updateUserRole(userId, rol))) : actualizado).pipe(
       catchError(error => {
         console.error('Error al actualizar usuario:', error);
         return throwError(() => error);
@@ -66,6 +69,15 @@ export class UsersService {
     );
   }
 
+  updateUserRole(userId: number, rol: string): Observable<UserDTO> {
+    return this.http.patch<UserDTO>(`${this.config.apiUrlBackend}usuarios/${userId}/rol/`, { rol }).pipe(
+      catchError(error => {
+        console.error('Error al cambiar el rol del usuario:', error);
+        return throwError(() => error);
+      })
+    );
+  }
+
   toggleUserStatus(userId: number): Observable<UserDTO> {
     return this.http.patch<UserDTO>(`${this.config.apiUrlBackend}usuarios/${userId}/estado/`, {}).pipe(
       catchError(error => {